@@ -1,20 +1,42 @@
-"""Asynchronous HTTP helpers with graceful fallback for synchronous callers.
+"""Asynchronous HTTP helpers backed by a persistent, shared client.
 
 The previous implementation created an ``asyncio.Semaphore`` at import time.
 When this module was imported inside environments without a running event
 loop (e.g. Streamlit's script thread) it resulted in the notorious
-``RuntimeError: There is no current event loop``.  To avoid this we now create
-the semaphore inside the coroutine and expose a synchronous wrapper that
-manages its own event loop.
+``RuntimeError: There is no current event loop``.  It then moved to a private
+event loop and a fresh ``httpx.AsyncClient`` per call, which paid the TLS and
+HTTP/2 handshake again on every 30-second quote sweep.
+
+All requests now go through a single long-lived ``httpx.AsyncClient`` owned by
+an event loop running on a dedicated daemon thread.  The client is created
+lazily on first use with bounded connection-pool limits and keep-alive, so
+repeated sweeps reuse warm connections.  :func:`submit` schedules any
+coroutine on that loop from any thread and returns a
+``concurrent.futures.Future``; :func:`fetch_many_sync` and :func:`fetch_many`
+are thin wrappers around it.
 """
 
 from __future__ import annotations
 
 import asyncio
+import atexit
+import concurrent.futures
+import os
 import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Coroutine, Optional
 
 import httpx
-from tenacity import retry, wait_exponential_jitter, stop_after_attempt
+from tenacity import (
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from utils.rate_limiter import FALLBACK_MAX_WAIT, get_limiter
 
 # ---------------------------------------------------------------------------
 # Platform specific setup
@@ -28,18 +50,121 @@ if sys.platform.startswith("win"):
     except Exception:  # pragma: no cover - ignore if not available
         pass
 
+# ---------------------------------------------------------------------------
+# Shared client configuration
+# ---------------------------------------------------------------------------
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "120"))
+# seconds close() waits for the client and the loop thread to shut down
+CLOSE_TIMEOUT = 5.0
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="http-async-loop", daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared client; must be called on the background loop."""
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        try:
+            _client = httpx.AsyncClient(http2=True, limits=limits)
+        except ImportError:  # pragma: no cover - ``h2`` extra not installed
+            _client = httpx.AsyncClient(limits=limits)
+    return _client
+
+
+def submit(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """Schedule ``coro`` on the shared loop from any thread."""
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def _on_shared_loop() -> bool:
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+class RateLimited(Exception):
+    """No token for the provider within ``FALLBACK_MAX_WAIT``; not retried."""
+
 
-@retry(wait=wait_exponential_jitter(2, 8), stop=stop_after_attempt(3))
-async def _get(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str, **kw):
-    """Internal helper performing a single GET request under a semaphore."""
+def _retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a ``Retry-After`` header (delay or HTTP date)."""
+
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+@retry(
+    retry=retry_if_not_exception_type(RateLimited),
+    wait=wait_exponential_jitter(2, 8),
+    stop=stop_after_attempt(3),
+)
+async def _get(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    url: str,
+    rate_limit: Optional[str] = None,
+    **kw,
+):
+    """Internal helper performing a single GET request under a semaphore.
+
+    When ``rate_limit`` names a provider, a token is taken from its shared
+    bucket before each attempt and a 429 pauses the bucket.  If no token is
+    available within ``FALLBACK_MAX_WAIT`` seconds the request fails with
+    :class:`RateLimited` instead of holding the shared loop.
+    """
+    limiter = get_limiter(rate_limit) if rate_limit else None
     async with sem:
-        r = await client.get(url, timeout=5.0, headers={"Connection": "keep-alive"}, **kw)
+        if limiter is not None and not await limiter.acquire_async(timeout=FALLBACK_MAX_WAIT):
+            raise RateLimited(rate_limit)
+        r = await client.get(url, timeout=5.0, **kw)
+        if r.status_code == 429 and limiter is not None:
+            limiter.backoff(_retry_after(r.headers.get("Retry-After")))
         r.raise_for_status()
         return r.json()
 
 
+async def _fetch_many(urls: list[str], concurrency: int, **kw):
+    sem = asyncio.Semaphore(concurrency)
+    client = _get_client()
+    tasks = [_get(client, sem, u, **kw) for u in urls]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def fetch_many(urls: list[str], concurrency: int = 12, **kw):
-    """Fetch multiple URLs concurrently.
+    """Fetch multiple URLs concurrently over the shared client.
 
     Parameters
     ----------
@@ -49,28 +174,42 @@ async def fetch_many(urls: list[str], concurrency: int = 12, **kw):
         Maximum number of concurrent requests, by default 12.
     kw : dict
         Extra keyword arguments forwarded to ``httpx.AsyncClient.get``.
+        ``rate_limit="finnhub"`` paces requests with that provider's
+        shared token bucket (see :mod:`utils.rate_limiter`).
     """
-    sem = asyncio.Semaphore(concurrency)
-    async with httpx.AsyncClient(http2=True) as client:
-        tasks = [_get(client, sem, u, **kw) for u in urls]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+    if _on_shared_loop():
+        return await _fetch_many(urls, concurrency, **kw)
+    return await asyncio.wrap_future(submit(_fetch_many(urls, concurrency, **kw)))
 
 
 def fetch_many_sync(urls: list[str], concurrency: int = 12, **kw):
-    """Synchronous wrapper around :func:`fetch_many`.
+    """Blocking wrapper around :func:`fetch_many` usable from any thread."""
+    if _on_shared_loop():
+        raise RuntimeError("fetch_many_sync cannot block the shared HTTP loop")
+    return submit(_fetch_many(urls, concurrency, **kw)).result()
 
-    This is intended for environments that are not already running within an
-    asyncio event loop.  It creates a private event loop, runs the coroutine
-    and then closes the loop to avoid side effects.
-    """
-    loop = asyncio.new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(fetch_many(urls, concurrency=concurrency, **kw))
-    finally:
+
+def close() -> None:
+    """Close the shared client and stop the background loop."""
+    global _client, _loop, _thread
+    with _lock:
+        loop, thread, client = _loop, _thread, _client
+        _loop = _thread = _client = None
+    if loop is None or loop.is_closed():
+        return
+    if client is not None:
         try:
-            loop.run_until_complete(asyncio.sleep(0))
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=CLOSE_TIMEOUT)
         except Exception:  # pragma: no cover - ignore cleanup issues
             pass
-        loop.close()
-        asyncio.set_event_loop(None)
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout=CLOSE_TIMEOUT)
+    if thread is not None and thread.is_alive():
+        # closing a loop that is still running raises RuntimeError; the
+        # daemon thread is left to finish (or die with the process)
+        return
+    loop.close()
+
+
+atexit.register(close)
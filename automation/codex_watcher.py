@@ -2,11 +2,13 @@ import json
 import pickle
 import time
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from intelligence.model_registry import ModelRegistry, get_model_registry
+
 
 # --- Codex helper -----------------------------------------------------------
 
@@ -34,15 +36,23 @@ def open_codex_patch(data: Any, message: str) -> None:
 class FinRLModelHandler(FileSystemEventHandler):
     """Watch for new or updated FinRL model files."""
 
-    def __init__(self, callback: Callable[[Any, str], None] = open_codex_patch):
+    def __init__(
+        self,
+        callback: Callable[[Any, str], None] = open_codex_patch,
+        registry: Optional[ModelRegistry] = None,
+    ):
         """Initialize the handler.
 
         Args:
             callback (Callable[[Any, str], None]): Function called with the
                 loaded model data and a short description.
+            registry (Optional[ModelRegistry]): When given, ``.pkl`` files
+                are loaded through it so the new version is hot-swapped in
+                for every caller of the registry.
         """
 
         self.callback = callback
+        self.registry = registry
 
     def _process(self, path: Path) -> None:
         """Load model data and forward it through the callback.
@@ -58,8 +68,11 @@ class FinRLModelHandler(FileSystemEventHandler):
                 data = path.read_text()
         elif path.suffix == ".pkl":
             try:
-                with path.open("rb") as f:
-                    data = pickle.load(f)
+                if self.registry is not None:
+                    data = self.registry.refresh(str(path))
+                else:
+                    with path.open("rb") as f:
+                        data = pickle.load(f)
             except Exception:
                 data = path.read_bytes()
         else:
@@ -124,6 +137,9 @@ def start_watchers(
         callback (Callable[[Any, str], None]): Function invoked when new
             data is detected.
 
+    New model files are also loaded into the model registry of
+    ``models_dir``, replacing the previous version in memory.
+
     Returns:
         Observer: Active watchdog observer monitoring the folders.
     """
@@ -134,7 +150,8 @@ def start_watchers(
     logs_path.mkdir(parents=True, exist_ok=True)
 
     observer = Observer()
-    observer.schedule(FinRLModelHandler(callback), str(models_path), recursive=False)
+    registry = get_model_registry(str(models_path))
+    observer.schedule(FinRLModelHandler(callback, registry), str(models_path), recursive=False)
     observer.schedule(LogHandler(callback), str(logs_path), recursive=False)
     observer.start()
     return observer
@@ -1,6 +1,7 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Union
+from typing import Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -15,6 +16,7 @@ DEFAULT_START = "2024-01-01"
 DEFAULT_END = "2024-06-30"
 DEFAULT_MODEL = "dummy_model_v1"
 DEFAULT_REPORT = Path("reports/ai_backtest_report.csv")
+DEFAULT_WORKERS = int(os.getenv("BACKTEST_WORKERS", "8"))
 
 
 def _load_data(ticker: str, start: str, end: str) -> pd.DataFrame:
@@ -31,6 +33,26 @@ def _load_data(ticker: str, start: str, end: str) -> pd.DataFrame:
     return df.loc[mask].reset_index(drop=True)
 
 
+def _prepare_ticker(ticker: str, start: str, end: str) -> Optional[Tuple[str, list, float]]:
+    """Return ``(ticker, features, avg_return_pct)`` or ``None`` if unusable."""
+    df = _load_data(ticker, start, end)
+    if df.empty:
+        return None
+    features = analyser_ticker(ticker, return_features=True)
+    if not features:
+        return None
+    avg_return = df["close"].pct_change().mean() * 100
+    return ticker, features, avg_return
+
+
+def _predict_batch(model, matrix: List[list]) -> List[float]:
+    """Score every row of ``matrix`` in a single model call."""
+    try:
+        return [float(p[1]) for p in model.predict_proba(matrix)]
+    except Exception:
+        return [float(p) for p in model.predict(matrix)]
+
+
 def run_backtest(
     tickers: Iterable[str] = DEFAULT_TICKERS,
     start: str = DEFAULT_START,
@@ -38,29 +60,33 @@ def run_backtest(
     model_version: str = DEFAULT_MODEL,
 
     report_path: Union[str, Path] = DEFAULT_REPORT,
+    workers: int = DEFAULT_WORKERS,
 
 ) -> pd.DataFrame:
-    """Evaluate the model on historical data and save a CSV report."""
+    """Evaluate the model on historical data and save a CSV report.
+
+    Data loading and feature extraction run on ``workers`` threads; the
+    resulting feature matrix is then scored with one ``predict_proba`` call.
+    """
 
     model = load_model_by_version(model_version)
+    tickers = list(tickers)
+    if workers > 1 and len(tickers) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            prepared = list(pool.map(lambda t: _prepare_ticker(t, start, end), tickers))
+    else:
+        prepared = [_prepare_ticker(t, start, end) for t in tickers]
+    prepared = [p for p in prepared if p is not None]
+
     rows = []
-    for ticker in tickers:
-        df = _load_data(ticker, start, end)
-        if df.empty:
-            continue
-        features = analyser_ticker(ticker, return_features=True)
-        if not features:
-            continue
-        try:
-            proba = model.predict_proba([features])[0][1]
-        except Exception:
-            proba = float(model.predict([features])[0])
-        avg_return = df["close"].pct_change().mean() * 100
-        rows.append({
-            "ticker": ticker,
-            "ai_score": round(proba * 100, 2),
-            "avg_return_pct": round(avg_return, 2),
-        })
+    if prepared:
+        probas = _predict_batch(model, [features for _, features, _ in prepared])
+        for (ticker, _, avg_return), proba in zip(prepared, probas):
+            rows.append({
+                "ticker": ticker,
+                "ai_score": round(proba * 100, 2),
+                "avg_return_pct": round(avg_return, 2),
+            })
 
     report = pd.DataFrame(rows)
     report_path = Path(report_path)
@@ -78,6 +104,7 @@ if __name__ == "__main__":  # pragma: no cover - CLI entry point
     parser.add_argument("--end", default=DEFAULT_END)
     parser.add_argument("--model", default=DEFAULT_MODEL)
     parser.add_argument("--output", default=str(DEFAULT_REPORT))
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
     args = parser.parse_args()
 
     df_report = run_backtest(
@@ -86,6 +113,7 @@ if __name__ == "__main__":  # pragma: no cover - CLI entry point
         end=args.end,
         model_version=args.model,
         report_path=args.output,
+        workers=args.workers,
     )
     print(df_report)
     print(f"Report saved to {args.output}")
@@ -1,4 +1,11 @@
-def backtest_scalping_sur_ticker(ticker, start_date, end_date):
-    """Backtest minute par minute sur données historiques (stub)."""
-    # TODO: implement real backtest logic
-    return {"win_rate": 0.62, "drawdown": -12.4}
+from backtest.scalping_engine import run_scalping_backtest
+
+
+def backtest_scalping_sur_ticker(ticker, start_date, end_date, params=None):
+    """Backtest minute par minute sur les barres 1m stockées.
+
+    Retourne ``win_rate`` (fraction), ``drawdown`` (en %), ``trades`` et
+    ``total_pnl``; voir :mod:`backtest.scalping_engine`.
+    """
+    result = run_scalping_backtest([ticker], start_date, end_date, params)
+    return result.summary()
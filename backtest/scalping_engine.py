@@ -0,0 +1,329 @@
+"""Backtest of the scalping strategy over stored 1-minute bars.
+
+Replays the entry rules of :mod:`execution.strategie_scalping` on history:
+
+* the breakout / pullback candle of ``enter_breakout`` / ``enter_pullback``
+  (volume spike against the previous bar, body ratio),
+* the ``_compute_score`` points that can be derived from bars (RSI, EMA 9/21,
+  VWAP, volume, MACD) plus an optional per-ticker float and a time-indexed
+  catalyst score (only the value published by each bar counts),
+  the momentum / volume sustain check and the 15% opening gap filter,
+* the trading window (no entry 13:00-13:45 and after 20:45 UTC) and the
+  three-trades-per-day cap,
+
+then manages each position with the live exits: a stop at ``2 * ATR`` (daily
+ATR of the previous sessions, capped at 8%), a 5% take profit, the
+:class:`~execution.strategie_scalping.TrailingManager` steps and a flat exit
+at the last bar of the day.
+
+Signals are computed for a whole ticker history at once with NumPy/pandas.
+Only the bars of open positions go through the Python loop: a signal on a
+closed bar is filled at the next bar's open, the stop is checked against the
+bar low before the take profit against the high, and the trailing stop moves
+on the bar close.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from execution.strategie_scalping import TrailingManager
+
+TRADE_COLUMNS = [
+    "ticker",
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "qty",
+    "pnl",
+    "pnl_pct",
+    "score",
+    "reason",
+]
+
+
+@dataclass
+class ScalpingParams:
+    volume_spike: float = 3.0
+    min_body_ratio: float = 0.5
+    # bars alone score at most 65 of the live 100 points (the 35-point
+    # catalyst is missing); 48 = EMA trend + volume + MACD momentum, the
+    # bar-derived core of a live entry.  Use 80 with catalysts to match live.
+    min_score: int = 48
+    max_trades_per_day: int = 3
+    atr_period: int = 14
+    max_stop_pct: float = 0.08
+    take_profit_pct: float = 0.05
+    gap_limit_pct: float = 15.0
+    sustain_volume_ratio: float = 1.5
+    capital_per_trade: float = 1_000.0
+    fee_per_trade: float = 0.0
+    slippage_pct: float = 0.0
+
+
+@dataclass
+class BacktestResult:
+    trades: pd.DataFrame
+    initial_capital: float = 10_000.0
+    equity: pd.DataFrame = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.equity = self.equity_curve()
+
+    def equity_curve(self, ticker: Optional[str] = None) -> pd.DataFrame:
+        """Realised equity after each exit, for all trades or one ticker."""
+
+        trades = self.trades if ticker is None else self.trades[self.trades["ticker"] == ticker]
+        trades = trades.sort_values("exit_time", kind="stable")
+        return pd.DataFrame(
+            {
+                "timestamp": trades["exit_time"].to_numpy(),
+                "equity": self.initial_capital + trades["pnl"].cumsum().to_numpy(),
+            }
+        )
+
+    def summary(self) -> Dict[str, float]:
+        n = len(self.trades)
+        equity = np.concatenate([[self.initial_capital], self.equity["equity"].to_numpy()])
+        peaks = np.maximum.accumulate(equity)
+        drawdown = float(((equity - peaks) / peaks).min() * 100) if n else 0.0
+        return {
+            "trades": n,
+            "win_rate": round(float((self.trades["pnl"] > 0).mean()), 4) if n else 0.0,
+            "total_pnl": round(float(self.trades["pnl"].sum()), 2),
+            "drawdown": round(drawdown, 2),
+        }
+
+
+def _as_datetime(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit="s")
+    return pd.to_datetime(values)
+
+
+def _catalyst_asof(catalyst: pd.Series, ts: pd.Series) -> np.ndarray:
+    """Catalyst score known at each of ``ts`` (NaN before the first one)."""
+
+    if not isinstance(catalyst, pd.Series):
+        raise TypeError("catalyst must be a Series indexed by publication time")
+    catalyst = catalyst.dropna()
+    catalyst.index = pd.to_datetime(catalyst.index)
+    catalyst = catalyst.sort_index(kind="stable")
+    values = np.concatenate([[np.nan], catalyst.to_numpy(dtype=float)])
+    return values[catalyst.index.searchsorted(ts.to_numpy(), side="right")]
+
+
+def compute_signals(
+    bars: pd.DataFrame,
+    params: Optional[ScalpingParams] = None,
+    float_shares: Optional[float] = None,
+    catalyst: Optional[pd.Series] = None,
+) -> pd.DataFrame:
+    """Return ``bars`` sorted with the strategy columns added.
+
+    ``bars`` needs ``timestamp`` (UTC), ``o``, ``h``, ``l``, ``c`` and ``v``.
+    ``catalyst`` is a catalyst score series indexed by publication time;
+    each bar sees the last value published at or before its timestamp.
+    ``entry`` flags the bars whose open fills a new position; ``atr`` is the
+    daily ATR known at that bar's session open.
+    """
+
+    p = params or ScalpingParams()
+    df = bars.sort_values("timestamp", kind="stable").reset_index(drop=True)
+    ts = _as_datetime(df["timestamp"])
+    df["timestamp"] = ts
+    day = ts.dt.normalize()
+    o, h, l, c, v = (df[col].astype(float) for col in ("o", "h", "l", "c", "v"))
+
+    same_day = day.eq(day.shift())
+    prev_h = h.shift().where(same_day)
+    prev_c = c.shift().where(same_day)
+    prev_v = v.shift().where(same_day)
+
+    # enter_breakout / enter_pullback on the closed bar
+    vol_ratio = v / prev_v.where(prev_v > 0)
+    rng = h - l
+    body_ratio = ((c - o).abs() / rng.where(rng > 0)).fillna(0.0)
+    breakout = c > prev_h
+    pullback = (o < prev_c) & (prev_c < c)
+    pattern = (vol_ratio >= p.volume_spike) & (body_ratio >= p.min_body_ratio) & (breakout | pullback)
+
+    # check_breakout_sustain: momentum and volume against five minutes earlier
+    momentum = c / prev_c
+    v_5m = v.shift(5).where(day.eq(day.shift(5)))
+    sustain = (momentum > 1.0) & (v / v_5m.where(v_5m > 0) >= p.sustain_volume_ratio)
+
+    # _compute_score
+    delta = c.diff()
+    avg_gain = delta.clip(lower=0).rolling(14, min_periods=14).mean()
+    avg_loss = (-delta.clip(upper=0)).rolling(14, min_periods=14).mean()
+    rs = avg_gain / avg_loss.where(avg_loss > 0)
+    rsi = (100 - 100 / (1 + rs)).where(rs > 0)
+    ema9 = c.ewm(span=9, adjust=False).mean()
+    ema21 = c.ewm(span=21, adjust=False).mean()
+    vwap = (c * v).groupby(day).cumsum() / v.groupby(day).cumsum()
+    macd = c.ewm(span=12, adjust=False).mean() - c.ewm(span=26, adjust=False).mean()
+    macd_signal = macd.ewm(span=9, adjust=False).mean()
+    score = (
+        8 * rsi.between(65, 72)
+        + 20 * ((ema21 != 0) & (ema9 / ema21 > 1.001))
+        + 5 * (c < vwap * 0.998)
+        + 20 * (v > 750_000)
+        + 8 * ((macd > macd_signal) & (momentum > 1))
+    ).astype(int)
+    if float_shares is not None and float_shares < 100_000_000:
+        score += 4
+    if catalyst is not None:
+        score += 35 * (_catalyst_asof(catalyst, ts) > 0.7)
+
+    # daily ATR and opening gap, from completed sessions only
+    daily = pd.DataFrame({"day": day, "o": o, "h": h, "l": l, "c": c}).groupby("day").agg(
+        o=("o", "first"), h=("h", "max"), l=("l", "min"), c=("c", "last")
+    )
+    daily_prev_c = daily["c"].shift()
+    true_range = pd.concat(
+        [daily["h"] - daily["l"], (daily["h"] - daily_prev_c).abs(), (daily["l"] - daily_prev_c).abs()],
+        axis=1,
+    ).max(axis=1)
+    daily_atr = true_range.rolling(p.atr_period).mean().shift()
+    gap_pct = (daily["o"] - daily_prev_c) / daily_prev_c * 100
+    skip_day = gap_pct.abs() >= p.gap_limit_pct
+
+    signal = (pattern & sustain & (score >= p.min_score)).to_numpy()
+    hour, minute = ts.dt.hour.to_numpy(), ts.dt.minute.to_numpy()
+    window_ok = ~(((hour == 13) & (minute < 45)) | ((hour == 20) & (minute > 45)))
+    entry = np.zeros(len(df), dtype=bool)
+    entry[1:] = signal[:-1] & same_day.to_numpy()[1:]
+    entry &= window_ok & ~skip_day.reindex(day).to_numpy(dtype=bool)
+
+    df["score"] = score.shift().fillna(0).astype(int)
+    df["signal"] = signal
+    df["entry"] = entry
+    df["atr"] = daily_atr.reindex(day).to_numpy()
+    return df
+
+
+def simulate_ticker(
+    ticker: str,
+    bars: pd.DataFrame,
+    params: Optional[ScalpingParams] = None,
+    float_shares: Optional[float] = None,
+    catalyst: Optional[pd.Series] = None,
+) -> List[dict]:
+    """Run the strategy on one ticker's bars and return its trades."""
+
+    p = params or ScalpingParams()
+    if bars is None or bars.empty:
+        return []
+    df = compute_signals(bars, p, float_shares, catalyst)
+    o, h, l, c = (df[col].astype(float).tolist() for col in ("o", "h", "l", "c"))
+    atr = df["atr"].tolist()
+    scores = df["score"].tolist()
+    times = df["timestamp"].tolist()
+    day_codes, _ = pd.factorize(df["timestamp"].dt.normalize())
+    day_last = pd.Series(np.arange(len(df))).groupby(day_codes).transform("max").tolist()
+    day_codes = day_codes.tolist()
+
+    trades: List[dict] = []
+    per_day: Dict[int, int] = {}
+    busy_until = -1
+    for j in np.flatnonzero(df["entry"].to_numpy()).tolist():
+        if j <= busy_until:
+            continue
+        d = day_codes[j]
+        if per_day.get(d, 0) >= p.max_trades_per_day:
+            continue
+        entry_price = o[j] * (1 + p.slippage_pct)
+        if not entry_price > 0:
+            continue
+        qty = max(int(p.capital_per_trade // entry_price), 1)
+        stop_pct = p.max_stop_pct
+        if atr[j] is not None and not math.isnan(atr[j]):
+            stop_pct = min(2 * atr[j] / entry_price, p.max_stop_pct)
+        take_profit = entry_price * (1 + p.take_profit_pct)
+        trailing = TrailingManager(entry_price, entry_price * (1 - stop_pct))
+
+        k, last = j, day_last[j]
+        while True:
+            stop = trailing.stop_loss
+            if l[k] <= stop:
+                exit_price, reason = min(o[k], stop), "stop"
+                break
+            if h[k] >= take_profit:
+                exit_price, reason = max(o[k], take_profit), "take_profit"
+                break
+            if k == last:
+                exit_price, reason = c[k], "eod"
+                break
+            trailing.update(c[k])
+            k += 1
+        exit_price *= 1 - p.slippage_pct
+
+        pnl = (exit_price - entry_price) * qty - 2 * p.fee_per_trade
+        trades.append(
+            {
+                "ticker": ticker,
+                "entry_time": times[j],
+                "exit_time": times[k],
+                "entry_price": round(entry_price, 4),
+                "exit_price": round(exit_price, 4),
+                "qty": qty,
+                "pnl": round(pnl, 2),
+                "pnl_pct": round((exit_price / entry_price - 1) * 100, 2),
+                "score": scores[j],
+                "reason": reason,
+            }
+        )
+        per_day[d] = per_day.get(d, 0) + 1
+        busy_until = k
+    return trades
+
+
+def load_bars(ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
+    """1-minute bars of ``ticker`` from the bar store, ``end`` day included."""
+
+    from realtime.candle_builder import get_bar_storage
+
+    end_ts = pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return get_bar_storage().store(60).read(ticker, start=pd.Timestamp(start), end=end_ts)
+
+
+def run_scalping_backtest(
+    tickers: Iterable[str],
+    start: str,
+    end: str,
+    params: Optional[ScalpingParams] = None,
+    bars: Optional[Mapping[str, pd.DataFrame]] = None,
+    float_shares: Optional[Mapping[str, float]] = None,
+    catalysts: Optional[Mapping[str, pd.Series]] = None,
+    initial_capital: float = 10_000.0,
+) -> BacktestResult:
+    """Backtest ``tickers`` between ``start`` and ``end``.
+
+    ``bars`` maps tickers to 1-minute bar frames; tickers missing from it are
+    read from the bar store.  ``catalysts`` maps tickers to catalyst score
+    series indexed by publication time.
+    """
+
+    p = params or ScalpingParams()
+    trades: List[dict] = []
+    for ticker in tickers:
+        frame = bars.get(ticker) if bars is not None else None
+        if frame is None:
+            frame = load_bars(ticker, start, end)
+        trades.extend(
+            simulate_ticker(
+                ticker,
+                frame,
+                p,
+                (float_shares or {}).get(ticker),
+                (catalysts or {}).get(ticker),
+            )
+        )
+    return BacktestResult(pd.DataFrame(trades, columns=TRADE_COLUMNS), initial_capital)
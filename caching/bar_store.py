@@ -0,0 +1,203 @@
+"""Process-wide OHLCV bar store shared by the indicator getters.
+
+Every indicator used to download its own copy of the same bars, so a single
+scoring pass hit the network about ten times per ticker.  :class:`BarStore`
+keeps recently downloaded frames keyed by ``(ticker, period, interval)``:
+
+* entries expire after ``ttl`` seconds and the least recently used ones are
+  evicted once ``maxsize`` is reached; failed or empty downloads are never
+  cached;
+* concurrent callers asking for the same key wait for the download already in
+  flight instead of starting their own;
+* a request for ``"1d"`` or ``"2d"`` is served by slicing a fresh ``"7d"``
+  entry of the same interval, and ``fetch_periods`` lets an interval always be
+  downloaded with its widest period so every getter shares one fetch.
+
+Returned frames are shallow copies and should be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+Loader = Callable[[str, str, str], pd.DataFrame]
+_Key = Tuple[str, str, str]
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+
+
+def _period_days(period: str) -> Optional[int]:
+    """Return the approximate length of ``period`` in days or ``None``."""
+
+    match = _PERIOD_RE.match(period)
+    if not match:
+        return None
+    return int(match.group(1)) * _PERIOD_DAYS[match.group(2)]
+
+
+def _slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Return the rows of ``df`` covered by ``period``.
+
+    ``"Nd"`` keeps the last ``N`` sessions (distinct dates), matching what
+    yfinance returns for that period.  Longer periods use a calendar cutoff
+    from the last bar.
+    """
+
+    if df.empty or len(df.columns) == 0:
+        return df
+    stamps = pd.to_datetime(df.iloc[:, 0], errors="coerce")
+    if stamps.isna().all():
+        return df
+    match = _PERIOD_RE.match(period)
+    if match and match.group(2) == "d":
+        sessions = stamps.dt.normalize()
+        keep = sessions.drop_duplicates().nlargest(int(match.group(1)))
+        return df[sessions.isin(keep).to_numpy()]
+    days = _period_days(period)
+    if days is None:
+        return df
+    return df[(stamps >= stamps.max() - pd.Timedelta(days=days)).to_numpy()]
+
+
+class _Pending:
+    """Download in flight for one key; waiters block on ``event``."""
+
+    __slots__ = ("event", "result")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: pd.DataFrame = pd.DataFrame()
+
+
+class BarStore:
+    """Thread-safe TTL/LRU cache of OHLCV frames with request coalescing."""
+
+    def __init__(
+        self,
+        loader: Loader,
+        ttl: float = 30.0,
+        maxsize: int = 512,
+        fetch_periods: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._loader = loader
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.fetch_periods = dict(fetch_periods or {})
+        self._entries: "OrderedDict[_Key, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._inflight: Dict[_Key, _Pending] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _fetch_period(self, period: str, interval: str) -> str:
+        wide = self.fetch_periods.get(interval)
+        wide_days, days = _period_days(wide or ""), _period_days(period)
+        if wide_days is not None and days is not None and wide_days >= days:
+            return wide
+        return period
+
+    def _lookup(self, ticker: str, period: str, interval: str, now: float) -> Optional[pd.DataFrame]:
+        """Return a fresh cached frame covering ``period`` (lock held)."""
+
+        exact = (ticker, period, interval)
+        entry = self._entries.get(exact)
+        if entry is not None and now - entry[0] < self.ttl:
+            self._entries.move_to_end(exact)
+            return entry[1]
+        days = _period_days(period)
+        if days is None:
+            return None
+        for key, (ts, df) in self._entries.items():
+            if key[0] != ticker or key[2] != interval or now - ts >= self.ttl:
+                continue
+            cached_days = _period_days(key[1])
+            if cached_days is not None and cached_days > days:
+                self._entries.move_to_end(key)
+                return _slice_period(df, period)
+        return None
+
+    def _store(self, key: _Key, df: pd.DataFrame, now: float) -> None:
+        """Insert ``df`` and evict expired then least recently used entries."""
+
+        self._entries[key] = (now, df)
+        self._entries.move_to_end(key)
+        if len(self._entries) <= self.maxsize:
+            return
+        for old_key in [k for k, (ts, _) in self._entries.items() if now - ts >= self.ttl]:
+            del self._entries[old_key]
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, ticker: str, period: str = "1d", interval: str = "1m") -> pd.DataFrame:
+        """Return bars for ``ticker``, downloading them at most once per TTL."""
+
+        ticker = ticker.upper()
+        fetch_period = self._fetch_period(period, interval)
+        key = (ticker, fetch_period, interval)
+        with self._lock:
+            cached = self._lookup(ticker, period, interval, time.monotonic())
+            if cached is not None:
+                self.hits += 1
+                return cached.copy(deep=False)
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = _Pending()
+                self._inflight[key] = pending
+            self.misses += 1
+
+        if not owner:
+            pending.event.wait()
+            return _slice_period(pending.result, period).copy(deep=False)
+
+        df = pd.DataFrame()
+        try:
+            df = self._loader(ticker, fetch_period, interval)
+            if df is None:
+                df = pd.DataFrame()
+        except Exception:
+            df = pd.DataFrame()
+        finally:
+            # failed or empty loads are not cached so the next call retries;
+            # waiters are released even if the loader raised BaseException
+            with self._lock:
+                if not df.empty:
+                    self._store(key, df, time.monotonic())
+                self._inflight.pop(key, None)
+            pending.result = df
+            pending.event.set()
+        if fetch_period != period:
+            df = _slice_period(df, period)
+        return df.copy(deep=False)
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop every cached entry for ``ticker``."""
+
+        ticker = ticker.upper()
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == ticker]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,18 +1,197 @@
-import time
+"""Bounded, thread-safe TTL cache decorator.
+
+``ttl_cache(seconds)`` memoises a function for ``seconds``.  Entries live in
+an LRU-ordered map capped at ``maxsize``; expired entries are dropped on
+access and by a shared background sweeper so long-running processes (the
+Streamlit app) do not grow all day.  Concurrent misses on the same key are
+collapsed: one caller computes the value while the others wait for it.
+
+The wrapped function exposes ``cache_info()``, ``clear()`` and
+``invalidate(*args, **kwargs)``.
+"""
+
+from __future__ import annotations
+
 import functools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_SWEEP_INTERVAL = 30.0
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn list/dict/set arguments into hashable equivalents."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def make_key(args: tuple, kwargs: dict) -> Hashable:
+    return (_freeze(args), _freeze(kwargs))
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """LRU map whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _register(self)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or compute it exactly once."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if time.monotonic() - entry[0] < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+
+        if not owner:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
 
-def ttl_cache(seconds: int):
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            self.set(key, flight.value)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+        return flight.value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value stored under ``key`` or ``default``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def sweep(self) -> int:
+        """Drop expired entries; return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (ts, _) in self._data.items() if now - ts >= self.ttl]
+            for key in expired:
+                del self._data[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------------------------------------------------------------------------
+# Background sweeper shared by every cache
+# ---------------------------------------------------------------------------
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+_sweeper: Optional[threading.Thread] = None
+_sweeper_lock = threading.Lock()
+
+
+def _sweep_forever() -> None:
+    while True:
+        time.sleep(_SWEEP_INTERVAL)
+        for cache in list(_caches):
+            try:
+                cache.sweep()
+            except Exception:  # pragma: no cover - never kill the sweeper
+                pass
+
+
+def _register(cache: TTLCache) -> None:
+    global _sweeper
+    _caches.add(cache)
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name="ttl-cache-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def ttl_cache(seconds: int, maxsize: int = 1024):
     def deco(fn):
-        cache: dict = {}
+        cache = TTLCache(seconds, maxsize)
+
         @functools.wraps(fn)
         def wrapper(*a, **k):
-            key = (a, frozenset(k.items()))
-            ts_v = cache.get(key)
-            now = time.time()
-            if ts_v and now - ts_v[0] < seconds:
-                return ts_v[1]
-            v = fn(*a, **k)
-            cache[key] = (now, v)
-            return v
+            return cache.get_or_compute(make_key(a, k), lambda: fn(*a, **k))
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.clear = cache.clear
+        wrapper.invalidate = lambda *a, **k: cache.invalidate(make_key(a, k))
         return wrapper
+
     return deco
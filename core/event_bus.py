@@ -0,0 +1,272 @@
+"""In-process publish/subscribe bus for ticks, bars and signals.
+
+Producers (the WebSocket stream, the candle aggregator, the pump monitor)
+:meth:`~EventBus.publish` events on dotted topics::
+
+    tick.<SYMBOL>            {"price", "volume", "ts"}
+    bar.<1m|5m>.<SYMBOL>     closed bar {"timestamp", "o", "h", "l", "c", "v"}
+    signal.pump.<SYMBOL>     {"pump_pct", "price", "ts"}
+
+Consumers subscribe with a topic or a glob pattern (``"tick.*"``,
+``"signal.*.AAPL"``) and read their own bounded queue, either from a thread
+(:meth:`Subscription.get`) or from asyncio (``await sub.aget()`` /
+``async for event in sub``).  ``publish`` never blocks on a slow consumer
+unless it asked for the ``block`` policy; when a queue is full the
+subscription's policy decides:
+
+``drop_oldest`` (default)
+    discard the oldest queued event, keep the new one (latest-state feeds);
+``drop_newest``
+    discard the new event (keep history contiguous);
+``block``
+    wait up to ``block_timeout`` seconds for room, then drop the new event.
+
+Every subscription counts its delivered and dropped events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+@dataclass(frozen=True)
+class Event:
+    topic: str
+    payload: Any
+    ts: float = field(default_factory=time.time)
+
+
+class Subscription:
+    """Bounded queue of the events matching ``pattern``."""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        pattern: str,
+        maxsize: int = 1000,
+        policy: str = DROP_OLDEST,
+        block_timeout: float = 0.1,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown backpressure policy: {policy!r}")
+        self.bus = bus
+        self.pattern = pattern
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.delivered = 0
+        self.dropped = 0
+        self.closed = False
+        self._items: Deque[Event] = deque()
+        self._cond = threading.Condition()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def matches(self, topic: str) -> bool:
+        return fnmatch.fnmatchcase(topic, self.pattern)
+
+    def _offer(self, event: Event) -> bool:
+        with self._cond:
+            if self.closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    room = self.policy == BLOCK and self._cond.wait_for(
+                        lambda: len(self._items) < self.maxsize or self.closed, self.block_timeout
+                    )
+                    if not room or self.closed:
+                        self.dropped += 1
+                        return False
+            self._items.append(event)
+            self.delivered += 1
+            self._cond.notify_all()
+            loop, ready = self._loop, self._ready
+        if loop is not None and ready is not None:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:  # loop closed
+                pass
+        return True
+
+    def _take(self) -> Optional[Event]:
+        # caller holds the condition
+        if not self._items:
+            return None
+        event = self._items.popleft()
+        self._cond.notify_all()  # room for BLOCK publishers
+        return event
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, waiting up to ``timeout`` seconds (``None`` on timeout)."""
+
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self.closed, timeout)
+            return self._take()
+
+    def drain(self) -> List[Event]:
+        """Return and remove every queued event without waiting."""
+
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+        return items
+
+    async def aget(self) -> Event:
+        """Await the next event; raises :class:`asyncio.CancelledError` on close."""
+
+        if self._ready is None:
+            self._loop = asyncio.get_running_loop()
+            self._ready = asyncio.Event()
+        while True:
+            with self._cond:
+                event = self._take()
+                if event is not None:
+                    return event
+                if self.closed:
+                    raise asyncio.CancelledError("subscription closed")
+                self._ready.clear()
+            await self._ready.wait()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        try:
+            return await self.aget()
+        except asyncio.CancelledError:
+            if self.closed:
+                raise StopAsyncIteration
+            raise
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def close(self) -> None:
+        """Stop receiving events and wake the waiting consumers."""
+
+        self.bus._remove(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+            loop, ready = self._loop, self._ready
+        if loop is not None and ready is not None:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBus:
+    """Thread-safe topic router to per-subscriber bounded queues."""
+
+    def __init__(self) -> None:
+        self._subs: List[Subscription] = []
+        self._routes: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(
+        self,
+        pattern: str,
+        maxsize: int = 1000,
+        policy: str = DROP_OLDEST,
+        block_timeout: float = 0.1,
+    ) -> Subscription:
+        sub = Subscription(self, pattern, maxsize, policy, block_timeout)
+        with self._lock:
+            self._subs.append(sub)
+            self._routes = {}
+        return sub
+
+    def _remove(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+                self._routes = {}
+
+    def publish(self, topic: str, payload: Any = None) -> int:
+        """Queue ``payload`` for every matching subscription; return how many took it."""
+
+        routes = self._routes
+        subs = routes.get(topic)
+        if subs is None:
+            with self._lock:
+                subs = [s for s in self._subs if s.matches(topic)]
+                self._routes[topic] = subs
+        self.published += 1
+        if not subs:
+            return 0
+        event = Event(topic, payload)
+        return sum(1 for s in subs if s._offer(event))
+
+    def consume(
+        self,
+        pattern: str,
+        handler: Callable[[Event], None],
+        name: Optional[str] = None,
+        **options: Any,
+    ) -> Subscription:
+        """Run ``handler`` for each matching event on a daemon thread.
+
+        Close the returned subscription to stop the thread.
+        """
+
+        sub = self.subscribe(pattern, **options)
+
+        def run() -> None:
+            while not sub.closed:
+                event = sub.get(timeout=1.0)
+                if event is None:
+                    continue
+                try:
+                    handler(event)
+                except Exception as exc:
+                    print(f"[bus] handler for {pattern} failed: {exc}")
+
+        threading.Thread(target=run, name=name or f"bus-{pattern}", daemon=True).start()
+        return sub
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Queue depth and delivered/dropped counts of every subscription."""
+
+        with self._lock:
+            subs = list(self._subs)
+        return [
+            {"pattern": s.pattern, "queued": len(s), "delivered": s.delivered, "dropped": s.dropped}
+            for s in subs
+        ]
+
+
+_default_bus: Optional[EventBus] = None
+_default_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide bus."""
+
+    global _default_bus
+    with _default_lock:
+        if _default_bus is None:
+            _default_bus = EventBus()
+        return _default_bus
@@ -0,0 +1,106 @@
+"""Registry of the hot ``trades.db`` queries and the indexes serving them.
+
+Every query listed in :data:`HOT_QUERIES` runs on a refresh path (watchlist
+table, intraday loaders, trade limits) and must be answered through an index.
+``tests/test_query_plans.py`` runs ``EXPLAIN QUERY PLAN`` on each of them
+against a migrated database and fails when one degrades to a full table scan,
+so a schema change or query edit that drops index usage is caught early.
+
+The indexes themselves are created by migration ``005``.  Tables created
+lazily by the application get them from :data:`INDEX_DDL` right after their
+``CREATE TABLE IF NOT EXISTS``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+INDEX_DDL: Dict[str, str] = {
+    "intraday_smart": "CREATE INDEX IF NOT EXISTS idx_intraday_smart_ticker_timestamp ON intraday_smart (ticker, timestamp)",
+    "intraday_data": "CREATE INDEX IF NOT EXISTS idx_intraday_data_ticker_timestamp ON intraday_data (ticker, timestamp)",
+    "ticks": "CREATE INDEX IF NOT EXISTS idx_ticks_ticker_timestamp ON ticks (ticker, timestamp)",
+    "trades_reels": "CREATE INDEX IF NOT EXISTS idx_trades_reels_symbol_timestamp ON trades_reels (symbol, timestamp)",
+    "trades_auto": "CREATE INDEX IF NOT EXISTS idx_trades_auto_ticker_timestamp ON trades_auto (ticker, timestamp)",
+    "trades": "CREATE INDEX IF NOT EXISTS idx_trades_ticker_datetime ON trades (ticker, datetime)",
+}
+
+WATCHLIST_LATEST_SQL = """
+SELECT
+    w.ticker,
+    w.source,
+    w.date,
+    w.description,
+    COALESCE(w.has_fda, 0) AS has_fda,
+    w.float_shares AS float_shares,
+    COALESCE(w.score, 0) AS score,
+    COALESCE(ns.score, 0) AS score_gpt,
+    COALESCE(ns.sentiment, 'NA') AS sentiment,
+    i.price,
+    i.volume,
+    i.change_percent AS percent_gain
+FROM watchlist w
+LEFT JOIN news_score ns ON w.ticker = ns.symbol
+LEFT JOIN latest_quote i ON w.ticker = i.ticker
+"""
+
+INTRADAY_LAST_TS_SQL = "SELECT MAX(timestamp) FROM intraday_data WHERE ticker = ?"
+INTRADAY_SMART_LAST_TS_SQL = "SELECT MAX(timestamp) FROM intraday_smart WHERE ticker = ?"
+TRADES_DAY_COUNT_SQL = (
+    "SELECT COUNT(*) FROM trades_reels WHERE symbol = ? AND timestamp >= ? AND timestamp < ?"
+)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    sql: str
+    params: Tuple = ()
+    # tables (or aliases) that are meant to be read in full, e.g. the watchlist
+    allow_scan: Tuple[str, ...] = ()
+
+
+HOT_QUERIES: Dict[str, HotQuery] = {
+    "watchlist_latest": HotQuery(WATCHLIST_LATEST_SQL, allow_scan=("w",)),
+    "intraday_last_timestamp": HotQuery(INTRADAY_LAST_TS_SQL, ("AAA",)),
+    "intraday_smart_last_timestamp": HotQuery(INTRADAY_SMART_LAST_TS_SQL, ("AAA",)),
+    "intraday_since": HotQuery(
+        "SELECT * FROM intraday_data WHERE ticker = ? AND timestamp >= ? ORDER BY timestamp",
+        ("AAA", "2024-01-01"),
+    ),
+    "intraday_smart_since": HotQuery(
+        "SELECT timestamp, price, high, low, volume FROM intraday_smart WHERE ticker = ? AND timestamp >= ? ORDER BY timestamp",
+        ("AAA", "2024-01-01"),
+    ),
+    "trades_day_count": HotQuery(TRADES_DAY_COUNT_SQL, ("AAA", "2024-01-01", "2024-01-02")),
+}
+
+
+def ensure_index(conn: sqlite3.Connection, table: str) -> None:
+    """Create the hot-query index of ``table`` if it does not exist yet."""
+
+    conn.execute(INDEX_DDL[table])
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """Return the ``detail`` column of ``EXPLAIN QUERY PLAN`` for ``sql``."""
+
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params))]
+
+
+def full_scans(conn: sqlite3.Connection, query: HotQuery) -> List[str]:
+    """Return the plan steps of ``query`` that scan a table without an index."""
+
+    plan = query_plan(conn, query.sql, query.params)
+    # scans of materialized subqueries read a temporary result, not a table
+    subqueries = {
+        d.split()[1] for d in plan if d.startswith(("MATERIALIZE ", "CO-ROUTINE "))
+    }
+    offending = []
+    for detail in plan:
+        if not detail.startswith("SCAN ") or " USING " in detail:
+            continue
+        target = detail.split()[1]
+        if target not in query.allow_scan and target not in subqueries:
+            offending.append(detail)
+    return offending
@@ -0,0 +1,92 @@
+"""``latest_quote``: the newest ``intraday_smart`` row of every ticker.
+
+The watchlist used to find each ticker's latest quote with a ``MAX(timestamp)
+GROUP BY ticker`` self-join over the whole ``intraday_smart`` history, which
+grows every day.  ``latest_quote`` holds one row per ticker instead and is
+maintained on write by an ``AFTER INSERT`` trigger, so any writer (the
+``collect_intraday_smart`` script, ``to_sql`` appends, manual inserts) keeps
+it current and readers do a primary-key lookup.
+
+Rows only move forward: an insert with an older ``timestamp`` than the stored
+one (a late backfill) leaves the table untouched, matching the ``MAX`` the
+self-join used to compute.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+LATEST_QUOTE_DDL = """
+CREATE TABLE IF NOT EXISTS latest_quote (
+    ticker TEXT PRIMARY KEY,
+    price REAL,
+    change_val REAL,
+    change_percent REAL,
+    volume INTEGER,
+    high REAL,
+    low REAL,
+    source TEXT,
+    timestamp TEXT
+)
+"""
+
+LATEST_QUOTE_TRIGGER_DDL = """
+CREATE TRIGGER IF NOT EXISTS trg_intraday_smart_latest_quote
+AFTER INSERT ON intraday_smart
+BEGIN
+    INSERT INTO latest_quote (ticker, price, change_val, change_percent, volume, high, low, source, timestamp)
+    VALUES (NEW.ticker, NEW.price, NEW.change_val, NEW.change_percent, NEW.volume, NEW.high, NEW.low, NEW.source, NEW.timestamp)
+    ON CONFLICT(ticker) DO UPDATE SET
+        price = excluded.price,
+        change_val = excluded.change_val,
+        change_percent = excluded.change_percent,
+        volume = excluded.volume,
+        high = excluded.high,
+        low = excluded.low,
+        source = excluded.source,
+        timestamp = excluded.timestamp
+    WHERE latest_quote.timestamp IS NULL OR excluded.timestamp >= latest_quote.timestamp;
+END
+"""
+
+BACKFILL_SQL = """
+INSERT OR REPLACE INTO latest_quote (ticker, price, change_val, change_percent, volume, high, low, source, timestamp)
+SELECT s.ticker, s.price, s.change_val, s.change_percent, s.volume, s.high, s.low, s.source, s.timestamp
+FROM intraday_smart s
+JOIN (
+    SELECT ticker, MAX(timestamp) AS max_ts
+    FROM intraday_smart
+    GROUP BY ticker
+) m ON s.ticker = m.ticker AND s.timestamp = m.max_ts
+ORDER BY s.id
+"""
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_latest_quote(conn: sqlite3.Connection) -> None:
+    """Create ``latest_quote`` and its trigger, backfilling on first creation.
+
+    The trigger needs ``intraday_smart``; when that table does not exist yet
+    only ``latest_quote`` is created and the call should be repeated after
+    ``intraday_smart`` is.
+    """
+
+    has_smart = _has_table(conn, "intraday_smart")
+    created = not _has_table(conn, "latest_quote")
+    conn.execute(LATEST_QUOTE_DDL)
+    if has_smart:
+        has_trigger = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='trg_intraday_smart_latest_quote'"
+        ).fetchone()
+        if not has_trigger:
+            conn.execute(LATEST_QUOTE_TRIGGER_DDL)
+            created = True
+        if created:
+            conn.execute(BACKFILL_SQL)
+    conn.commit()
@@ -0,0 +1,178 @@
+"""Per-thread pooled SQLite connections with tuned PRAGMAs.
+
+Opening ``trades.db`` used to cost a ``sqlite3.connect`` per operation (per
+tick for the collector), in the default rollback-journal mode where readers
+and the writer block each other.  :func:`get_connection` instead keeps one
+connection per thread and database file, opened once and configured with:
+
+* ``journal_mode=WAL`` and ``synchronous=NORMAL`` so readers never block the
+  writer and commits do not fsync every time;
+* ``mmap_size``, ``cache_size`` and ``temp_store=MEMORY`` for faster reads;
+* ``busy_timeout`` so a locked database is retried instead of failing with
+  ``database is locked``.
+
+Pooled connections must not be closed by callers.  Use :func:`connection`
+as a context manager: it commits on success and rolls back on error, like
+``with sqlite3.connect(...)``.  Nested blocks on the same thread share the
+connection, so only the outermost block commits or rolls back; inner blocks
+run inside a ``SAVEPOINT`` and only undo their own work on error.
+
+A connection is checked against the database file when it is opened.  If the
+file is replaced or deleted afterwards, call :func:`reset` and every thread
+reconnects on its next checkout.
+
+Tuning can be overridden with ``SQLITE_BUSY_TIMEOUT_MS``, ``SQLITE_MMAP_SIZE``
+(bytes) and ``SQLITE_CACHE_KB``.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import core.db as _core_db
+
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", str(64 * 1024)))
+
+PathLike = Union[str, Path]
+
+_local = threading.local()
+_generation = 0
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Configure ``conn`` for concurrent reads and a single busy writer."""
+
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError:  # pragma: no cover - locked or read-only file
+        pass
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_KB}")
+    return conn
+
+
+def _file_id(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _pool() -> Dict[str, Tuple[sqlite3.Connection, int, Optional[Tuple[int, int]]]]:
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    return pool
+
+
+def _depths() -> Dict[sqlite3.Connection, int]:
+    depths = getattr(_local, "depths", None)
+    if depths is None:
+        depths = _local.depths = {}
+    return depths
+
+
+def get_connection(db_path: Optional[PathLike] = None) -> sqlite3.Connection:
+    """Return this thread's pooled connection to ``db_path``.
+
+    ``db_path`` defaults to :data:`core.db.DB_PATH`.  ``":memory:"`` is never
+    pooled since every connection would be a distinct database.
+    """
+
+    target = str(_core_db.DB_PATH if db_path is None else db_path)
+    if target == ":memory:":
+        return apply_pragmas(sqlite3.connect(target))
+
+    key = os.path.abspath(target)
+    pool = _pool()
+    entry = pool.get(key)
+    if entry is not None:
+        conn, generation, file_id = entry
+        # the file is only stat'ed again after reset(), not on every checkout
+        if generation == _generation or (file_id is not None and file_id == _file_id(key)):
+            pool[key] = (conn, _generation, file_id)
+            return conn
+        del pool[key]
+        try:
+            conn.close()
+        except sqlite3.Error:  # pragma: no cover - already broken
+            pass
+
+    conn = apply_pragmas(sqlite3.connect(target))
+    pool[key] = (conn, _generation, _file_id(key))
+    return conn
+
+
+@contextmanager
+def connection(db_path: Optional[PathLike] = None) -> Iterator[sqlite3.Connection]:
+    """Yield a pooled connection, committing on success and rolling back on error.
+
+    Inside another :func:`connection` block for the same database the changes
+    are wrapped in a savepoint instead and left for the outer block to commit.
+    """
+
+    conn = get_connection(db_path)
+    depths = _depths()
+    depth = depths.get(conn, 0)
+    if depth == 0:
+        depths[conn] = 1
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
+        finally:
+            depths.pop(conn, None)
+        return
+
+    savepoint = f"pool_sp{depth}"
+    if not conn.in_transaction:
+        # releasing a savepoint opened outside a transaction would commit it
+        conn.execute("BEGIN")
+    conn.execute(f"SAVEPOINT {savepoint}")
+    depths[conn] = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        raise
+    else:
+        if conn.in_transaction:
+            conn.execute(f"RELEASE {savepoint}")
+    finally:
+        depths[conn] = depth
+
+
+def reset() -> None:
+    """Drop every pooled connection.
+
+    The calling thread's connections are closed immediately; other threads
+    reopen theirs on their next checkout if the database file was replaced.
+    """
+
+    global _generation
+    _generation += 1
+    pool = _pool()
+    for conn, _, _ in pool.values():
+        try:
+            conn.close()
+        except sqlite3.Error:  # pragma: no cover - already broken
+            pass
+    pool.clear()
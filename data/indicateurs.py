@@ -1,22 +1,38 @@
 import os
-import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import yfinance as yf
 
+from caching.bar_store import BarStore
+from core.sqlite_pool import connection
+
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "trades.db")
 
 
+def _fetch_bars(ticker: str, period: str, interval: str) -> pd.DataFrame:
+    # errors propagate so BAR_STORE does not cache the failed load
+    df = yf.download(ticker, period=period, interval=interval, progress=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df.reset_index()
+
+
+# One 1m download per ticker serves every intraday getter below: 1m bars are
+# always fetched over 7 days (what EMA/MACD need) and sliced down for the
+# 1d/2d consumers.  get_atr() uses daily bars, a second and much smaller
+# download that 1m bars cannot replace.
+BAR_STORE = BarStore(
+    _fetch_bars,
+    ttl=float(os.getenv("BAR_CACHE_TTL", "30")),
+    maxsize=int(os.getenv("BAR_CACHE_SIZE", "512")),
+    fetch_periods={"1m": "7d"},
+)
+
+
 def _download(ticker: str, period: str = "1d", interval: str = "1m") -> pd.DataFrame:
-    try:
-        df = yf.download(ticker, period=period, interval=interval, progress=False)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        return df.reset_index()
-    except Exception:
-        return pd.DataFrame()
+    return BAR_STORE.get(ticker, period, interval)
 
 
 def get_rsi(ticker: str, period: int = 14) -> Optional[float]:
@@ -125,13 +141,10 @@ def get_float_shares(ticker: str) -> Optional[float]:
 
     if not os.path.exists(DB_PATH):
         return None
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         row = conn.execute(
             "SELECT float_shares FROM watchlist WHERE ticker = ?", (ticker,)
         ).fetchone()
-    finally:
-        conn.close()
     return float(row[0]) if row and row[0] is not None else None
 
 
@@ -139,14 +152,11 @@ def get_catalyseur_score(ticker: str) -> Optional[float]:
     """Return the latest catalyst score for ``ticker``."""
     if not os.path.exists(DB_PATH):
         return None
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         row = conn.execute(
             "SELECT score FROM news_score WHERE symbol = ? ORDER BY last_analyzed DESC LIMIT 1",
             (ticker,),
         ).fetchone()
-    finally:
-        conn.close()
     return float(row[0]) if row else None
 
 
@@ -0,0 +1,183 @@
+"""Latest quote and recent ticks of every streamed symbol.
+
+Written by the WebSocket thread and polled by the UI, the pump detector and
+the scoring code.  Readers never take a lock:
+
+* the latest quote of a symbol is an immutable :class:`Quote` record that
+  the writer replaces with a single list assignment, so a reader always sees
+  a whole record;
+* the last ``depth`` ticks live in preallocated NumPy rings indexed by a
+  symbol id.  Each symbol has a ``reserved`` and a ``committed`` counter
+  bumped around every write; :meth:`LatestTickStore.history` copies the
+  committed ticks and retries in the rare case the writer lapped the copied
+  slots meanwhile.
+
+Writers (ticks, annotations such as ``pump_pct_60s``) are serialised by a
+lock among themselves only.  Timestamps are epoch seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_EMPTY: Dict[str, Any] = {}
+
+
+class Quote:
+    """Immutable latest quote of one symbol."""
+
+    __slots__ = ("price", "volume", "ts", "source", "extra")
+
+    def __init__(
+        self,
+        price: Optional[float],
+        volume: float,
+        ts: float,
+        source: str = "WS",
+        extra: Dict[str, Any] = _EMPTY,
+    ) -> None:
+        self.price = price
+        self.volume = volume
+        self.ts = ts
+        self.source = source
+        self.extra = extra
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {
+            "price": self.price,
+            "volume": self.volume,
+            "timestamp": datetime.utcfromtimestamp(self.ts).isoformat(),
+            "ts": self.ts,
+            "source": self.source,
+            "status": "OK",
+        }
+        data.update(self.extra)
+        return data
+
+
+class _Rings:
+    __slots__ = ("prices", "volumes", "times", "reserved", "committed")
+
+    def __init__(self, capacity: int, depth: int) -> None:
+        self.prices = np.zeros((capacity, depth))
+        self.volumes = np.zeros((capacity, depth))
+        self.times = np.zeros((capacity, depth))
+        self.reserved = np.zeros(capacity, dtype=np.int64)
+        self.committed = np.zeros(capacity, dtype=np.int64)
+
+    def grown(self, capacity: int) -> "_Rings":
+        new = _Rings(capacity, self.prices.shape[1])
+        n = len(self.reserved)
+        for name in self.__slots__:
+            getattr(new, name)[:n] = getattr(self, name)
+        return new
+
+
+class LatestTickStore:
+    """Per-symbol latest quote plus a ring of the last ``depth`` ticks."""
+
+    def __init__(self, depth: int = 256, capacity: int = 64) -> None:
+        self.depth = depth
+        # (symbol -> id, latest quote by id), swapped as a whole by clear()
+        self._table: Tuple[Dict[str, int], List[Optional[Quote]]] = ({}, [])
+        self._rings = _Rings(capacity, depth)
+        self._write_lock = threading.Lock()
+
+    def _symbol_id(self, symbol: str) -> int:
+        # caller holds the write lock
+        ids, latest = self._table
+        sid = ids.get(symbol)
+        if sid is None:
+            sid = len(latest)
+            if sid >= len(self._rings.reserved):
+                self._rings = self._rings.grown(2 * len(self._rings.reserved))
+            latest.append(None)
+            ids[symbol] = sid
+        return sid
+
+    def update(
+        self,
+        symbol: str,
+        price: float,
+        volume: float = 0.0,
+        ts: Optional[float] = None,
+        source: str = "WS",
+    ) -> None:
+        """Record a tick at epoch ``ts`` (default now)."""
+
+        ts = time.time() if ts is None else float(ts)
+        with self._write_lock:
+            sid = self._symbol_id(symbol)
+            latest = self._table[1]
+            previous = latest[sid]
+            extra = previous.extra if previous is not None else _EMPTY
+            rings = self._rings
+            n = int(rings.committed[sid])
+            slot = n % self.depth
+            rings.reserved[sid] = n + 1
+            rings.prices[sid, slot] = price
+            rings.volumes[sid, slot] = volume
+            rings.times[sid, slot] = ts
+            rings.committed[sid] = n + 1
+            latest[sid] = Quote(price, volume, ts, source, extra)
+
+    def annotate(self, symbol: str, **fields: Any) -> None:
+        """Attach derived values (e.g. ``pump_pct_60s``) to the latest quote."""
+
+        with self._write_lock:
+            sid = self._symbol_id(symbol)
+            latest = self._table[1]
+            q = latest[sid]
+            if q is None:
+                q = Quote(None, 0.0, 0.0)
+            latest[sid] = Quote(q.price, q.volume, q.ts, q.source, {**q.extra, **fields})
+
+    def latest(self, symbol: str) -> Optional[Quote]:
+        ids, latest = self._table
+        sid = ids.get(symbol)
+        return latest[sid] if sid is not None else None
+
+    def snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return the latest quote as a ``get_latest_data`` style dict."""
+
+        q = self.latest(symbol)
+        return q.as_dict() if q is not None else None
+
+    def history(self, symbol: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(timestamps, prices, volumes)`` of the last ``n`` ticks, oldest first."""
+
+        sid = self._table[0].get(symbol)
+        if sid is None:
+            empty = np.empty(0)
+            return empty, empty.copy(), empty.copy()
+        limit = self.depth if n is None else min(n, self.depth)
+        while True:
+            rings = self._rings
+            committed = int(rings.committed[sid])
+            count = min(committed, limit)
+            idx = np.arange(committed - count, committed) % self.depth
+            times = rings.times[sid, idx]
+            prices = rings.prices[sid, idx]
+            volumes = rings.volumes[sid, idx]
+            # the copied slots are intact unless the writer reached them
+            if int(rings.reserved[sid]) - committed <= self.depth - count:
+                return times, prices, volumes
+
+    def symbols(self) -> List[str]:
+        return list(self._table[0])
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._table[0]
+
+    def __len__(self) -> int:
+        return len(self._table[0])
+
+    def clear(self) -> None:
+        with self._write_lock:
+            self._table = ({}, [])
+            self._rings = _Rings(len(self._rings.reserved), self.depth)
@@ -1,119 +1,293 @@
 import json
 import os
 import threading
-from datetime import datetime
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Set
 
-import websocket
+import pandas as pd
 import yfinance as yf
 from dotenv import load_dotenv
 
+from core.event_bus import get_event_bus
+from data.latest_ticks import LatestTickStore
+from data.streaming_indicators import IndicatorBook
+from data.ws_stream import StreamManager
+from realtime.candle_builder import get_candle_aggregator
+
 load_dotenv()
 
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
+FINNHUB_WS_URL = os.getenv("FINNHUB_WS_URL", "wss://ws.finnhub.io")
+WS_SYMBOLS_PER_CONNECTION = int(os.getenv("WS_SYMBOLS_PER_CONNECTION", "50"))
 WATCHLIST = ["TSLA", "AAPL", "NVDA"]
 
-latest_data: Dict[str, Dict] = {}
-connected = False
-ws_app: Optional[websocket.WebSocketApp] = None
-_data_lock = threading.Lock()
+# Latest quote and last TICK_RING_DEPTH ticks per symbol, read without locks
+latest_ticks = LatestTickStore(depth=int(os.getenv("TICK_RING_DEPTH", "256")))
+STALE_AFTER = 10.0
 
+# Incremental indicators fed by every WebSocket trade, persisted periodically
+# by a background thread (never on the socket thread) so a restart resumes
+# from the saved state instead of replaying the day.
+indicator_book = IndicatorBook()
+INDICATOR_STATE_PATH = os.path.join(os.path.dirname(__file__), "indicator_state_ws.json")
+INDICATOR_SAVE_INTERVAL = 60
+
+# 1m/5m bars built from the same trades (closed bars go to the bar store and
+# are published on the event bus).  The same background thread closes the bars
+# of tickers that stopped trading once their window ended, BAR_ROLL_GRACE
+# seconds late so delayed trades still land in their bar.
+candle_aggregator = get_candle_aggregator()
+BAR_ROLL_INTERVAL = 1.0
+BAR_ROLL_GRACE = 2.0
+_housekeeper_stop = threading.Event()
+_housekeeper_thread: Optional[threading.Thread] = None
+# every trade is also published as ``tick.<SYMBOL>``
+event_bus = get_event_bus()
 
-def set_watchlist(tickers: List[str]) -> None:
-    """Update the list of tickers subscribed to the WebSocket."""
-    global WATCHLIST
-    WATCHLIST = [t.upper() for t in tickers]
-    if connected and ws_app is not None:
-        for t in WATCHLIST:
-            ws_app.send(json.dumps({"type": "subscribe", "symbol": t}))
 
+def on_trades(trades: List[dict]) -> None:
+    """Feed Finnhub trades (``s``, ``p``, ``v``, ``t`` in ms) to the stores."""
 
-def on_message(ws: websocket.WebSocketApp, message: str) -> None:
-    """Handle a WebSocket price update message."""
+    for d in trades:
+        ticker = d["s"]
+        ts = d["t"] / 1000
+        latest_ticks.update(ticker, d["p"], d.get("v", 0), ts)
+        indicator_book.on_tick(ticker, d["p"], d.get("v", 0), ts)
+        candle_aggregator.on_tick(ticker, d["p"], d.get("v", 0), ts)
+        event_bus.publish(f"tick.{ticker}", {"price": d["p"], "volume": d.get("v", 0), "ts": ts})
+
+
+def on_message(ws, message: str) -> None:
+    """Handle a raw WebSocket price update message."""
 
     data = json.loads(message)
     if "data" in data:
-        for d in data["data"]:
-            ticker = d["s"]
-            with _data_lock:
-                latest_data[ticker] = {
-                    "price": d["p"],
-                    "volume": d.get("v", 0),
-                    "timestamp": datetime.utcfromtimestamp(d["t"] / 1000).isoformat(),
-                    "source": "WS",
-                    "status": "OK",
-                }
+        on_trades(data["data"])
+
 
+# Connections are only opened by start_ws(), never at import time.
+stream = StreamManager(
+    f"{FINNHUB_WS_URL}?token={FINNHUB_API_KEY}",
+    on_trades,
+    max_symbols=WS_SYMBOLS_PER_CONNECTION,
+)
+_indicators_loaded = False
 
-def on_error(ws: websocket.WebSocketApp, error: Exception) -> None:
-    """Log WebSocket errors to stdout."""
 
-    print(f"[WS ERROR] {error}")
+def set_watchlist(tickers: List[str]) -> None:
+    """Update the tickers streamed; only the changes are (un)subscribed."""
+    global WATCHLIST
+    WATCHLIST = [t.upper() for t in tickers]
+    stream.set_symbols(WATCHLIST)
 
 
-def on_close(ws: websocket.WebSocketApp, close_status_code, close_msg) -> None:
-    """Mark the connection as closed."""
+def save_indicators() -> None:
+    """Write the indicator state to :data:`INDICATOR_STATE_PATH`."""
 
-    global connected
-    connected = False
-    print("[WS CLOSED]")
+    try:
+        indicator_book.save(INDICATOR_STATE_PATH)
+    except OSError as exc:
+        print(f"[WS] indicator state not saved: {exc}")
 
 
-def on_open(ws: websocket.WebSocketApp) -> None:
-    """Subscribe to watchlist tickers once the socket is open."""
+def _housekeeping_loop() -> None:
+    """Roll quiet tickers' bars and periodically save the indicator state."""
 
-    global connected
-    connected = True
-    for ticker in WATCHLIST:
-        ws.send(json.dumps({"type": "subscribe", "symbol": ticker}))
-    print("[WS CONNECTED]")
+    last_save = time.monotonic()
+    while not _housekeeper_stop.wait(BAR_ROLL_INTERVAL):
+        try:
+            candle_aggregator.roll(time.time() - BAR_ROLL_GRACE)
+        except Exception as exc:  # pragma: no cover - defensive
+            print(f"[WS] bar roll failed: {exc}")
+        if time.monotonic() - last_save >= INDICATOR_SAVE_INTERVAL:
+            last_save = time.monotonic()
+            save_indicators()
 
 
 def start_ws() -> None:
-    """Start the Finnhub WebSocket in a background thread."""
-    global ws_app
-    url = f"wss://ws.finnhub.io?token={FINNHUB_API_KEY}"
-    ws_app = websocket.WebSocketApp(
-        url,
-        on_open=on_open,
-        on_message=on_message,
-        on_error=on_error,
-        on_close=on_close,
-    )
-    thread = threading.Thread(target=ws_app.run_forever, daemon=True)
-    thread.start()
+    """Open the Finnhub WebSocket connections for :data:`WATCHLIST`."""
+    global _indicators_loaded, _housekeeper_thread
+    if not _indicators_loaded:
+        indicator_book.load(INDICATOR_STATE_PATH)
+        _indicators_loaded = True
+    if _housekeeper_thread is None or not _housekeeper_thread.is_alive():
+        _housekeeper_stop.clear()
+        _housekeeper_thread = threading.Thread(
+            target=_housekeeping_loop, name="stream-housekeeper", daemon=True
+        )
+        _housekeeper_thread.start()
+    stream.set_symbols(WATCHLIST)
+    stream.start()
+
+
+def stop_ws() -> None:
+    stream.stop()
+    _housekeeper_stop.set()
+    if _housekeeper_thread is not None:
+        _housekeeper_thread.join(timeout=5)
+    candle_aggregator.roll()
+    save_indicators()
+
+
+def ws_stats() -> dict:
+    """Message rate, feed lag and reconnect counters of the stream."""
+    return stream.stats()
+
+
+def _fallback_row(data) -> dict:
+    """Quote dict from the last row of a Yahoo 1m frame (``{"status": "ERR"}`` if empty)."""
+
+    data = data.dropna(subset=["Close"]) if "Close" in data else data
+    if data.empty:
+        return {"status": "ERR"}
+    last = data.iloc[-1]
+    stamp = pd.Timestamp(last.name)
+    return {
+        "price": round(float(last["Close"]), 2),
+        "volume": int(last["Volume"]),
+        "timestamp": stamp.isoformat(),
+        "ts": stamp.timestamp(),
+        "source": "FALLBACK",
+        "status": "WARN",
+    }
 
 
 def fallback_data(ticker: str) -> dict:
     """Return last minute data from Yahoo Finance if WebSocket is stale."""
 
     try:
-        data = yf.download(ticker, period="1d", interval="1m")
-        if not data.empty:
-            last = data.iloc[-1]
-            return {
-                "price": round(last["Close"], 2),
-                "volume": int(last["Volume"]),
-                "timestamp": last.name.isoformat(),
-                "source": "FALLBACK",
-                "status": "WARN",
-            }
-        return {"status": "ERR"}
+        return _fallback_row(yf.download(ticker, period="1d", interval="1m"))
     except Exception as e:  # pragma: no cover - network errors
         print(f"[FALLBACK ERROR] {e}")
         return {"status": "ERR"}
 
 
-def get_latest_data(ticker: str) -> dict:
-    """Return cached data for ``ticker`` or fetch a fallback quote."""
+def fallback_batch(tickers: List[str]) -> Dict[str, dict]:
+    """Fetch the last minute of several tickers with one Yahoo request."""
+
+    try:
+        data = yf.download(
+            tickers, period="1d", interval="1m", group_by="ticker", progress=False
+        )
+    except Exception as e:  # pragma: no cover - network errors
+        print(f"[FALLBACK ERROR] {e}")
+        return {t: {"status": "ERR"} for t in tickers}
+    out: Dict[str, dict] = {}
+    for t in tickers:
+        try:
+            if isinstance(data.columns, pd.MultiIndex):
+                frame = data[t] if t in data.columns.get_level_values(0) else data.iloc[0:0]
+            else:
+                frame = data if len(tickers) == 1 else data.iloc[0:0]
+            out[t] = _fallback_row(frame)
+        except Exception as e:  # pragma: no cover - malformed frame
+            print(f"[FALLBACK ERROR] {t}: {e}")
+            out[t] = {"status": "ERR"}
+    return out
+
+
+class FallbackRefresher:
+    """Background, deduplicated and batched refresh of fallback quotes.
+
+    :meth:`request` only queues a ticker (once, and at most every
+    ``min_interval`` seconds); a daemon thread started on first use gathers
+    the queue for ``batch_window`` seconds and fetches it with a single
+    :func:`fallback_batch` call.  Results land in :attr:`quotes`.
+    """
+
+    def __init__(self, min_interval: float = 30.0, batch_window: float = 0.25) -> None:
+        self.min_interval = min_interval
+        self.batch_window = batch_window
+        self.quotes: Dict[str, dict] = {}
+        self._pending: Set[str] = set()
+        self._requested: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, ticker: str) -> None:
+        now = time.monotonic()
+        with self._cond:
+            if ticker in self._pending or now - self._requested.get(ticker, -self.min_interval) < self.min_interval:
+                return
+            self._requested[ticker] = now
+            self._pending.add(ticker)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fallback-refresher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def run_pending(self) -> int:
+        """Fetch every queued ticker now; return how many were fetched."""
+
+        with self._cond:
+            batch, self._pending = sorted(self._pending), set()
+        if batch:
+            fetched = time.time()
+            quotes = fallback_batch(batch)
+            for quote in quotes.values():
+                if quote.get("status") != "ERR":
+                    quote["fetched"] = fetched
+            self.quotes.update(quotes)
+        return len(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            time.sleep(self.batch_window)
+            try:
+                self.run_pending()
+            except Exception as e:  # pragma: no cover - defensive
+                print(f"[FALLBACK ERROR] {e}")
+
+
+fallback_refresher = FallbackRefresher()
+
+
+def get_latest_data(ticker: str, max_age: Optional[float] = None) -> dict:
+    """Return the latest quote for ``ticker``.
+
+    Fresh WebSocket data is returned as is.  Otherwise the newest of the last
+    WebSocket quote and the last fallback quote is returned at once with
+    ``stale=True`` and its ``age`` in seconds, while a background Yahoo
+    refresh is queued.  ``{"status": "ERR", "pending": True}`` means nothing
+    is known yet.
+
+    Callers that price orders pass ``max_age``: when the newest known quote
+    is older than that, a fresh Yahoo quote is fetched before returning
+    (blocking), and ``{"status": "ERR"}`` is returned if none can be had.
+    A Yahoo quote is stamped with the bar start, so for this check its
+    ``fetched`` time counts instead: a quote fetched within ``max_age`` is
+    reused even when its bar is older.
+    """
 
-    with _data_lock:
-        data = latest_data.get(ticker)
-    if data:
-        ts = datetime.fromisoformat(data["timestamp"])
-        if (datetime.utcnow() - ts).total_seconds() < 10:
-            return data
-    return fallback_data(ticker)
+    quote = latest_ticks.latest(ticker)
+    now = time.time()
+    if quote is not None and quote.price is not None and now - quote.ts < STALE_AFTER:
+        return quote.as_dict()
 
+    candidates = [fallback_refresher.quotes.get(ticker)]
+    if quote is not None and quote.price is not None:
+        candidates.append(quote.as_dict())
+    known = [c for c in candidates if c and c.get("status") != "ERR"]
+    best = max(known, key=lambda c: c.get("ts", 0.0)) if known else None
+    checked = max(best.get("ts", 0.0), best.get("fetched", 0.0)) if best else 0.0
+    if max_age is not None and now - checked > max_age:
+        best = fallback_data(ticker)
+        if best.get("status") == "ERR":
+            return {"status": "ERR"}
+        best["fetched"] = now
+        fallback_refresher.quotes[ticker] = best
+    else:
+        fallback_refresher.request(ticker)
+        if best is None:
+            return {"status": "ERR", "pending": True}
 
-start_ws()
+    data = dict(best)
+    if quote is not None:
+        data.update(quote.extra)
+    data["status"] = "WARN"
+    data["stale"] = True
+    data["age"] = round(now - data.get("ts", now), 1)
+    return data
@@ -0,0 +1,341 @@
+"""Incremental per-ticker indicators updated in O(1) per bar or tick.
+
+:func:`data.indicator_engine.compute_indicators` recomputes everything from
+the full intraday history.  For live feeds :class:`IncrementalIndicators`
+keeps the running state instead (EMA9/21, MACD/signal, Wilder RSI and ATR,
+session VWAP and a rolling volume average) and folds each new bar into it.
+
+Ticks are bucketed into ``bar_seconds`` bars: the VWAP and last price move on
+every tick while the bar-based indicators advance when a bar closes.
+:meth:`IncrementalIndicators.snapshot` / :meth:`restore` let a restarted
+process resume from saved state instead of replaying the whole day.
+
+Unlike the batch engine, RSI and ATR use Wilder smoothing (seeded with the
+simple average of the first ``period`` values), which is what makes them
+updatable without keeping a window of past bars.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections import deque
+from datetime import datetime, time as dtime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+_EMA_SPANS = (9, 12, 21, 26)
+# Sessions follow the exchange calendar day, not UTC midnight (20:00 New York
+# in summer), so after-hours ticks keep accumulating into the same VWAP.
+_EXCHANGE_TZ = ZoneInfo("America/New_York")
+
+
+class _Ema:
+    """``adjust=False`` exponential moving average seeded with the first value."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: int, value: Optional[float] = None) -> None:
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = value
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class _Wilder:
+    """Wilder moving average: simple mean for ``period`` values, then smoothed."""
+
+    __slots__ = ("period", "value", "count", "total")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.value: Optional[float] = None
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, x: float) -> Optional[float]:
+        if self.value is not None:
+            self.value = (self.value * (self.period - 1) + x) / self.period
+            return self.value
+        self.count += 1
+        self.total += x
+        if self.count == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class IncrementalIndicators:
+    """Running indicator state for a single ticker."""
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        atr_period: int = 14,
+        volume_window: int = 50,
+        bar_seconds: int = 60,
+    ) -> None:
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.volume_window = volume_window
+        self.bar_seconds = bar_seconds
+        self._emas = {span: _Ema(span) for span in _EMA_SPANS}
+        self._signal = _Ema(9)
+        self._gain = _Wilder(rsi_period)
+        self._loss = _Wilder(rsi_period)
+        self._atr = _Wilder(atr_period)
+        self._volumes: deque = deque(maxlen=volume_window)
+        self._volume_sum = 0.0
+        self._prev_close: Optional[float] = None
+        self._session: Optional[str] = None
+        self._session_span: Optional[Tuple[float, float]] = None
+        self._pv = 0.0
+        self._vol = 0.0
+        self._bar: Optional[Dict[str, float]] = None
+        self.price: Optional[float] = None
+        self.bars = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def _roll_session(self, ts: float) -> None:
+        span = self._session_span
+        if span is not None and span[0] <= ts < span[1]:
+            return
+        day = datetime.fromtimestamp(ts, tz=_EXCHANGE_TZ).date()
+        start = datetime.combine(day, dtime.min, tzinfo=_EXCHANGE_TZ)
+        end = datetime.combine(day + timedelta(days=1), dtime.min, tzinfo=_EXCHANGE_TZ)
+        self._session_span = (start.timestamp(), end.timestamp())
+        session = day.isoformat()
+        if session != self._session:
+            self._session = session
+            self._pv = 0.0
+            self._vol = 0.0
+
+    def update_bar(
+        self,
+        close: float,
+        volume: Optional[float] = 0.0,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        """Fold a closed bar into the state.
+
+        ``ts`` (epoch seconds) resets the VWAP when the New York session date
+        changes.  ``volume=None`` (a feed without volume) leaves the VWAP and
+        the volume average untouched.
+        """
+
+        if ts is not None:
+            self._roll_session(ts)
+        if volume is not None:
+            self._pv += close * volume
+            self._vol += volume
+        self._apply_bar(close, volume, high, low)
+
+    def _apply_bar(self, close: float, volume: Optional[float], high: Optional[float], low: Optional[float]) -> None:
+        high = close if high is None else high
+        low = close if low is None else low
+        for ema in self._emas.values():
+            ema.update(close)
+        self._signal.update(self._emas[12].value - self._emas[26].value)
+
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            self._gain.update(max(delta, 0.0))
+            self._loss.update(max(-delta, 0.0))
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        else:
+            true_range = high - low
+        self._atr.update(true_range)
+
+        if volume is not None:
+            if len(self._volumes) == self._volumes.maxlen:
+                self._volume_sum -= self._volumes[0]
+            self._volumes.append(volume)
+            self._volume_sum += volume
+
+        self._prev_close = close
+        self.price = close
+        self.bars += 1
+
+    def update_tick(self, price: float, volume: Optional[float] = 0.0, ts: Optional[float] = None) -> None:
+        """Apply a trade or quote tick received at epoch ``ts`` seconds.
+
+        Quote feeds without volume pass ``volume=None``: price-based
+        indicators still advance, the VWAP and volume average do not.
+        """
+
+        if ts is None:
+            ts = datetime.now(timezone.utc).timestamp()
+        self._roll_session(ts)
+        if volume is not None:
+            self._pv += price * volume
+            self._vol += volume
+
+        start = ts - ts % self.bar_seconds
+        bar = self._bar
+        if bar is not None and start > bar["start"]:
+            self._apply_bar(bar["close"], bar["volume"], bar["high"], bar["low"])
+            bar = None
+        self.price = price
+        if bar is None:
+            self._bar = {"start": start, "high": price, "low": price, "close": price, "volume": volume}
+            return
+        bar["high"] = max(bar["high"], price)
+        bar["low"] = min(bar["low"], price)
+        bar["close"] = price
+        if volume is not None:
+            bar["volume"] = (bar["volume"] or 0.0) + volume
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    @property
+    def rsi(self) -> Optional[float]:
+        gain, loss = self._gain.value, self._loss.value
+        if gain is None or loss is None:
+            return None
+        if loss == 0:
+            return 100.0 if gain > 0 else None
+        return 100 - 100 / (1 + gain / loss)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Return the latest indicators using the same keys as the batch engine."""
+
+        ema12, ema26 = self._emas[12].value, self._emas[26].value
+        return {
+            "price": self.price,
+            "volume": self._volumes[-1] if self._volumes else None,
+            "volume_avg": self._volume_sum / len(self._volumes) if self._volumes else None,
+            "rsi": self.rsi,
+            "ema9": self._emas[9].value,
+            "ema21": self._emas[21].value,
+            "macd": ema12 - ema26 if ema12 is not None else None,
+            "macd_signal": self._signal.value,
+            "vwap": self._pv / self._vol if self._vol else None,
+            "atr": self._atr.value,
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict:
+        """Return a JSON-serialisable copy of the state."""
+
+        def wilder(w: _Wilder) -> list:
+            return [w.value, w.count, w.total]
+
+        return {
+            "params": [self.rsi_period, self.atr_period, self.volume_window, self.bar_seconds],
+            "emas": {str(k): e.value for k, e in self._emas.items()},
+            "signal": self._signal.value,
+            "gain": wilder(self._gain),
+            "loss": wilder(self._loss),
+            "atr": wilder(self._atr),
+            "volumes": list(self._volumes),
+            "prev_close": self._prev_close,
+            "session": self._session,
+            "pv": self._pv,
+            "vol": self._vol,
+            "bar": self._bar,
+            "price": self.price,
+            "bars": self.bars,
+        }
+
+    @classmethod
+    def restore(cls, state: Dict) -> "IncrementalIndicators":
+        """Rebuild an instance from :meth:`snapshot` output."""
+
+        obj = cls(*state["params"])
+        for span, value in state["emas"].items():
+            obj._emas[int(span)].value = value
+        obj._signal.value = state["signal"]
+        for name in ("gain", "loss", "atr"):
+            w = getattr(obj, f"_{name}")
+            w.value, w.count, w.total = state[name]
+        obj._volumes.extend(state["volumes"])
+        obj._volume_sum = math.fsum(obj._volumes)
+        obj._prev_close = state["prev_close"]
+        obj._session = state["session"]
+        obj._pv = state["pv"]
+        obj._vol = state["vol"]
+        obj._bar = state["bar"]
+        obj.price = state["price"]
+        obj.bars = state["bars"]
+        return obj
+
+
+class IndicatorBook:
+    """Thread-safe collection of :class:`IncrementalIndicators` by ticker."""
+
+    def __init__(self, **params) -> None:
+        self._params = params
+        self._states: Dict[str, IncrementalIndicators] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, ticker: str) -> IncrementalIndicators:
+        state = self._states.get(ticker)
+        if state is None:
+            state = self._states[ticker] = IncrementalIndicators(**self._params)
+        return state
+
+    def on_tick(self, ticker: str, price: float, volume: Optional[float] = 0.0, ts: Optional[float] = None) -> None:
+        with self._lock:
+            self._state(ticker.upper()).update_tick(price, volume, ts)
+
+    def on_bar(
+        self,
+        ticker: str,
+        close: float,
+        volume: Optional[float] = 0.0,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            self._state(ticker.upper()).update_bar(close, volume, high, low, ts)
+
+    def get(self, ticker: str) -> Optional[Dict[str, Optional[float]]]:
+        """Return the latest indicators for ``ticker`` or ``None`` if unseen."""
+
+        with self._lock:
+            state = self._states.get(ticker.upper())
+            return state.values() if state is not None else None
+
+    def tickers(self) -> list:
+        with self._lock:
+            return sorted(self._states)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write every ticker's snapshot to ``path`` as JSON."""
+
+        with self._lock:
+            payload = {t: s.snapshot() for t, s in self._states.items()}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(path)
+
+    def load(self, path: Union[str, Path]) -> int:
+        """Restore snapshots from ``path``; return the number of tickers loaded."""
+
+        path = Path(path)
+        if not path.exists():
+            return 0
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        restored = {t: IncrementalIndicators.restore(s) for t, s in payload.items()}
+        with self._lock:
+            self._states.update(restored)
+        return len(restored)
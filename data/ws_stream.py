@@ -0,0 +1,339 @@
+"""Managed Finnhub-style WebSocket stream.
+
+:class:`StreamManager` replaces the single ``run_forever`` thread that was
+started when :mod:`data.stream_data_manager` was imported:
+
+* nothing touches the network until :meth:`StreamManager.start`;
+* symbols are spread over several connections (``max_symbols`` each) so a
+  large watchlist does not sit on one socket;
+* :meth:`StreamManager.set_symbols` only sends the ``subscribe`` /
+  ``unsubscribe`` messages for what changed;
+* a dropped connection is reopened after a jittered exponential backoff and
+  its symbols are subscribed again; the backoff only resets once a
+  connection has stayed up ``stable_after`` seconds, so a server that
+  accepts and drops at once is not retried in a tight loop;
+* :meth:`StreamManager.stats` reports message rate, feed lag (now minus the
+  trade timestamp) and reconnect counts.
+
+Trades are handed to ``on_trades`` as the list found in the ``data`` field of
+``{"type": "trade"}`` messages, from the connection threads.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set
+
+import websocket
+
+TradesCallback = Callable[[List[dict]], None]
+
+
+class _Shard:
+    """One WebSocket connection and the symbols it carries."""
+
+    def __init__(self, manager: "StreamManager", index: int) -> None:
+        self.manager = manager
+        self.index = index
+        self.symbols: Set[str] = set()
+        self.subscribed: Set[str] = set()
+        self.connected = False
+        self._opened_at: Optional[float] = None
+        self._sock: Optional[websocket.WebSocket] = None
+        self._app: Optional[websocket.WebSocketApp] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- subscriptions -------------------------------------------------
+    def _send(self, kind: str, symbols: Iterable[str]) -> None:
+        app = self._app
+        for symbol in sorted(symbols):
+            app.send(json.dumps({"type": kind, "symbol": symbol}))
+
+    def sync(self) -> None:
+        """Send the subscribe/unsubscribe diff between wanted and subscribed."""
+
+        with self._lock:
+            if not self.connected:
+                return
+            # the manager replaces ``symbols`` instead of mutating it
+            wanted = self.symbols
+            removed = self.subscribed - wanted
+            added = wanted - self.subscribed
+            try:
+                self._send("unsubscribe", removed)
+                self._send("subscribe", added)
+            except Exception as exc:
+                print(f"[WS {self.index}] subscription update failed: {exc}")
+                return
+            self.subscribed = set(wanted)
+
+    # -- connection ----------------------------------------------------
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"ws-shard-{self.index}", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Ask the connection thread to exit, without waiting for it."""
+
+        self._stop.set()
+        app = self._app
+        if app is None:
+            return
+        app.keep_running = False
+        ws = app.sock
+        if ws is None:
+            return
+        try:
+            ws.send_close()
+        except Exception:
+            pass
+        # closing the socket does not wake the dispatcher's select(); a
+        # shutdown makes it read EOF and tear the connection down at once
+        try:
+            ws.sock.shutdown(socket.SHUT_RDWR)
+        except (AttributeError, OSError):
+            pass
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self.close()
+        self.join(timeout)
+
+    def _on_open(self, ws) -> None:
+        with self._lock:
+            self.connected = True
+            self.subscribed = set()
+        self._opened_at = time.monotonic()
+        self._sock = self._app.sock if self._app is not None else None
+        self.sync()
+        print(f"[WS {self.index} CONNECTED]")
+
+    def _on_close(self, ws, close_status_code=None, close_msg=None) -> None:
+        with self._lock:
+            self.connected = False
+            self.subscribed = set()
+
+    def _on_error(self, ws, error) -> None:
+        print(f"[WS {self.index} ERROR] {error}")
+
+    def _on_message(self, ws, message: str) -> None:
+        self.manager._handle(message)
+
+    def _run(self) -> None:
+        m = self.manager
+        while not self._stop.is_set():
+            self._app = m.app_factory(
+                m.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self._app.run_forever()
+            except Exception as exc:
+                print(f"[WS {self.index} ERROR] {exc}")
+            self._on_close(self._app)
+            # after a server-initiated close the client leaves the TCP socket
+            # open; close it so the server is not kept waiting
+            sock, self._sock = self._sock, None
+            if sock is not None:
+                sock.shutdown()
+            if self._stop.is_set():
+                break
+            opened, self._opened_at = self._opened_at, None
+            if opened is not None and time.monotonic() - opened >= m.stable_after:
+                m._attempts[self.index] = 0
+            attempt = m._attempts.get(self.index, 0)
+            m._attempts[self.index] = attempt + 1
+            with m._lock:
+                m._reconnects += 1
+            delay = min(m.backoff_max, m.backoff_base * 2 ** attempt)
+            # equal jitter: never less than half the delay, spread the rest
+            self._stop.wait(delay / 2 + random.uniform(0, delay / 2))
+
+
+class StreamManager:
+    """Sharded, self-reconnecting WebSocket client with subscription diffing."""
+
+    def __init__(
+        self,
+        url: str,
+        on_trades: TradesCallback,
+        max_symbols: int = 50,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        app_factory: Callable[..., websocket.WebSocketApp] = websocket.WebSocketApp,
+        rate_window: float = 60.0,
+        stable_after: float = 30.0,
+    ) -> None:
+        self.url = url
+        self.on_trades = on_trades
+        self.max_symbols = max_symbols
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.app_factory = app_factory
+        self.rate_window = rate_window
+        self.stable_after = stable_after
+        self._shards: List[_Shard] = []
+        self._attempts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._next_index = 0
+        # shards of the last stop(), for alive checks
+        self._stopped: List[_Shard] = []
+        # metrics
+        self._messages = 0
+        self._trades = 0
+        self._errors = 0
+        self._reconnects = 0
+        self._recent: Deque[float] = deque()
+        self._last_lag: Optional[float] = None
+        self._max_lag = 0.0
+        self._last_message: Optional[float] = None
+
+    # -- symbols -------------------------------------------------------
+    def symbols(self) -> Set[str]:
+        with self._lock:
+            return set().union(*(s.symbols for s in self._shards)) if self._shards else set()
+
+    def set_symbols(self, symbols: Iterable[str]) -> None:
+        """Make ``symbols`` the subscribed set, sending only the differences."""
+
+        wanted = {s.upper() for s in symbols}
+        with self._lock:
+            current: Set[str] = set()
+            for shard in self._shards:
+                shard.symbols = shard.symbols & wanted
+                current |= shard.symbols
+            for symbol in sorted(wanted - current):
+                open_shards = [s for s in self._shards if len(s.symbols) < self.max_symbols]
+                if open_shards:
+                    shard = min(open_shards, key=lambda s: len(s.symbols))
+                else:
+                    shard = _Shard(self, self._next_index)
+                    self._next_index += 1
+                    self._shards.append(shard)
+                shard.symbols = shard.symbols | {symbol}
+            empty = [s for s in self._shards if not s.symbols]
+            self._shards = [s for s in self._shards if s.symbols]
+            shards = list(self._shards)
+            running = self._running
+        for shard in empty:
+            shard.stop(timeout=0)
+        for shard in shards:
+            if running:
+                shard.start()
+            shard.sync()
+
+    # -- lifecycle -----------------------------------------------------
+    def start(self) -> None:
+        with self._lock:
+            self._running = True
+            shards = list(self._shards)
+        for shard in shards:
+            shard.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Close every connection; symbols are kept for the next :meth:`start`.
+
+        All connections are closed first, then joined within one shared
+        ``timeout``.
+        """
+
+        with self._lock:
+            self._running = False
+            shards = self._shards
+            # threads cannot be restarted: keep the symbols on fresh shards
+            self._shards = []
+            for old in shards:
+                shard = _Shard(self, old.index)
+                shard.symbols = old.symbols
+                self._shards.append(shard)
+            self._stopped = shards
+        for shard in shards:
+            shard.close()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for shard in shards:
+            shard.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def alive(self) -> bool:
+        """``True`` while any connection thread, current or stopped, still runs."""
+
+        with self._lock:
+            shards = self._shards + self._stopped
+        return any(s.alive for s in shards)
+
+    @property
+    def connected(self) -> bool:
+        with self._lock:
+            return any(s.connected for s in self._shards)
+
+    # -- messages ------------------------------------------------------
+    def _handle(self, message: str) -> None:
+        now = time.time()
+        try:
+            data = json.loads(message)
+        except ValueError:
+            self._errors += 1
+            return
+        with self._lock:
+            self._messages += 1
+            self._last_message = now
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > self.rate_window:
+                self._recent.popleft()
+        if data.get("type") != "trade" or not data.get("data"):
+            return
+        trades = data["data"]
+        newest = max(d.get("t", 0) for d in trades) / 1000
+        lag = now - newest
+        with self._lock:
+            self._trades += len(trades)
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+        try:
+            self.on_trades(trades)
+        except Exception as exc:
+            self._errors += 1
+            print(f"[WS] trade handler failed: {exc}")
+
+    def stats(self) -> Dict[str, object]:
+        """Counters for monitoring: rates, lag and reconnects."""
+
+        now = time.time()
+        with self._lock:
+            recent = sum(1 for t in self._recent if now - t <= self.rate_window)
+            return {
+                "connections": len(self._shards),
+                "connected": sum(1 for s in self._shards if s.connected),
+                "symbols": sum(len(s.symbols) for s in self._shards),
+                "messages": self._messages,
+                "trades": self._trades,
+                "errors": self._errors,
+                "msg_per_sec": round(recent / self.rate_window, 3),
+                "last_lag_s": round(self._last_lag, 3) if self._last_lag is not None else None,
+                "max_lag_s": round(self._max_lag, 3),
+                "reconnects": self._reconnects,
+                "last_message_age_s": round(now - self._last_message, 3) if self._last_message else None,
+            }
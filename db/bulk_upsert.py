@@ -4,6 +4,8 @@ from pathlib import Path
 import sqlite3
 from typing import Iterable, Tuple
 
+from core.sqlite_pool import apply_pragmas
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 DB_PATH = BASE_DIR / "data" / "trades.db"
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -11,8 +13,7 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH.as_posix(), check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    return conn
+    return apply_pragmas(conn)
 
 
 def init_schema(conn: sqlite3.Connection) -> None:
@@ -1,6 +1,5 @@
-import sqlite3
-
 from core.db import DB_PATH
+from core.sqlite_pool import connection
 
 
 def update_score_watchlist(
@@ -12,8 +11,7 @@ def update_score_watchlist(
 ) -> None:
     """Met à jour les informations de scoring pour ``ticker`` dans ``watchlist``."""
 
-    conn = sqlite3.connect(str(DB_PATH))
-    try:
+    with connection(DB_PATH) as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS watchlist (
@@ -35,7 +33,3 @@ def update_score_watchlist(
             """,
             (score, pump_pct, ema_diff, rsi, ticker),
         )
-
-        conn.commit()
-    finally:
-        conn.close()
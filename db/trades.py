@@ -1,25 +1,23 @@
 import os
-import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 from core.db import DB_PATH
+from core.hot_queries import TRADES_DAY_COUNT_SQL, ensure_index
+from core.sqlite_pool import connection
 
 
-def get_nb_trades_du_jour(ticker: str, date: datetime, db_path: str = DB_PATH) -> int:
+def get_nb_trades_du_jour(ticker: str, date: datetime, db_path: Optional[str] = None) -> int:
     """Retourne le nombre de trades enregistrés pour ``ticker`` à la date donnée."""
+    db_path = db_path or DB_PATH
     if not os.path.exists(db_path):
         return 0
-    conn = sqlite3.connect(str(db_path))
-    try:
-        date_str = date.strftime("%Y-%m-%d")
-        row = conn.execute(
-            "SELECT COUNT(*) FROM trades_reels WHERE symbol = ? AND timestamp LIKE ?",
-            (ticker, f"{date_str}%"),
-        ).fetchone()
+    with connection(db_path) as conn:
+        # range on the ISO timestamp (instead of LIKE) so the index is used
+        day = date.strftime("%Y-%m-%d")
+        next_day = (date + timedelta(days=1)).strftime("%Y-%m-%d")
+        row = conn.execute(TRADES_DAY_COUNT_SQL, (ticker, day, next_day)).fetchone()
         return int(row[0]) if row else 0
-    finally:
-        conn.close()
 
 
 def enregistrer_trade_auto(
@@ -28,11 +26,10 @@ def enregistrer_trade_auto(
     prix: float,
     quantite: int,
     provenance: str = "scalping",
-    db_path: str = DB_PATH,
+    db_path: Optional[str] = None,
 ) -> None:
     """Insère un trade automatique dans la base SQLite."""
-    conn = sqlite3.connect(str(db_path))
-    try:
+    with connection(db_path or DB_PATH) as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS trades_auto (
@@ -46,13 +43,11 @@ def enregistrer_trade_auto(
             )
             """
         )
+        ensure_index(conn, "trades_auto")
         conn.execute(
             "INSERT INTO trades_auto (ticker, action, prix, quantite, provenance, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
             (ticker, action, prix, quantite, provenance, datetime.utcnow().isoformat()),
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def enregistrer_exit_partielle(
@@ -60,7 +55,7 @@ def enregistrer_exit_partielle(
     prix: float,
     niveau_pct: float,
     provenance: str = "scalping",
-    db_path: str = DB_PATH,
+    db_path: Optional[str] = None,
 ) -> None:
     """Log une sortie partielle (prise de profit)."""
 
@@ -94,8 +89,7 @@ def enregistrer_trade_ia(
 ) -> None:
     """Insère un trade IA enrichi dans la base ``trades``."""
 
-    conn = sqlite3.connect(str(DB_PATH))
-    try:
+    with connection(DB_PATH) as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS trades (
@@ -120,6 +114,7 @@ def enregistrer_trade_ia(
             )
             """,
         )
+        ensure_index(conn, "trades")
 
         conn.execute(
             """
@@ -162,7 +157,3 @@ def enregistrer_trade_ia(
                 entry_time or datetime.utcnow().isoformat(),
             ),
         )
-
-        conn.commit()
-    finally:
-        conn.close()
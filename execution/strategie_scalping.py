@@ -48,6 +48,9 @@ from utils.execution_reelle import executer_ordre_reel
 from notifications.telegram_bot import envoyer_alerte_ia
 from db.trades import get_nb_trades_du_jour, enregistrer_trade_auto
 
+# oldest quote (seconds) entry, stop and take profit may be priced from
+MAX_QUOTE_AGE = 120.0
+
 
 def enter_breakout(
     ticker: str,
@@ -110,7 +113,10 @@ def _compute_score(ticker: str) -> Optional[dict]:
     emas = get_ema(ticker, [9, 21])
     vwap = get_vwap(ticker)
     macd, macd_signal = get_macd(ticker)
-    tick_data = get_latest_data(ticker)
+    # a stale stream quote triggers a blocking fresh fetch
+    tick_data = get_latest_data(ticker, max_age=MAX_QUOTE_AGE)
+    if tick_data.get("age", 0.0) > MAX_QUOTE_AGE:
+        return None
     if tick_data.get("status") != "ERR":
         volume_now = tick_data.get("volume")
         last_price = tick_data.get("price")
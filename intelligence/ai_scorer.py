@@ -1,14 +1,17 @@
 """AI scoring utilities."""
 
-import base64
-import io
 import json
+import math
 import os
+import threading
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from intelligence.meta_ia import load_meta, save_meta
+from intelligence.meta_ia import load_meta
+from intelligence.model_registry import MODELS_DIR, get_model_registry
 
 _RULES_PATH = os.path.join(os.path.dirname(__file__), "rules_auto.json")
 _META_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "meta_ia.json")
@@ -17,27 +20,57 @@ with open(_RULES_PATH, "r", encoding="utf-8") as f:
     RULES_DEFAULT = json.load(f)
 
 
+_rules_lock = threading.Lock()
+_rules_cache: Dict[str, Any] = {"stamp": None, "base": None, "disabled": {}, "day": None, "rules": None}
+
+
+def _meta_stamp(path: str) -> Tuple[str, int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path, -1, -1
+    return path, st.st_mtime_ns, st.st_size
+
+
+def reload_rules() -> None:
+    """Drop the cached rules so the next call re-reads ``meta_ia.json``."""
+    with _rules_lock:
+        _rules_cache.update(stamp=None, base=None, disabled={}, day=None, rules=None)
+
+
 def _get_rules() -> dict:
-    """Return scoring rules merged with dynamic meta weights."""
-    rules = RULES_DEFAULT.copy()
-    meta = load_meta(_META_PATH)
-    weights = meta.get("weights")
-    if isinstance(weights, dict):
-        rules.update(weights)
-    disabled = meta.get("disabled_signals", {})
-    now = datetime.now().date()
-    changed = False
-    for sig, info in list(disabled.items()):
-        until = info.get("until")
-        if until and until > str(now):
-            rules[sig] = 0
-        elif until and until <= str(now):
-            disabled.pop(sig, None)
-            changed = True
-    if changed:
-        meta["disabled_signals"] = disabled
-        save_meta(meta, _META_PATH)
-    return rules
+    """Return scoring rules merged with dynamic meta weights.
+
+    ``meta_ia.json`` is only parsed again when its mtime or size changes (or
+    after :func:`reload_rules`); otherwise the cached snapshot is used.
+    Signals disabled until a past date are simply no longer zeroed, the file
+    itself is left to the writers of the meta configuration.
+    """
+    stamp = _meta_stamp(_META_PATH)
+    today = str(datetime.now().date())
+    with _rules_lock:
+        cache = _rules_cache
+        if cache["base"] is None or cache["stamp"] != stamp:
+            meta = load_meta(_META_PATH)
+            base = RULES_DEFAULT.copy()
+            weights = meta.get("weights")
+            if isinstance(weights, dict):
+                base.update(weights)
+            disabled = meta.get("disabled_signals")
+            cache.update(
+                stamp=stamp,
+                base=base,
+                disabled=disabled if isinstance(disabled, dict) else {},
+                rules=None,
+            )
+        if cache["rules"] is None or cache["day"] != today:
+            rules = cache["base"].copy()
+            for sig, info in cache["disabled"].items():
+                until = info.get("until") if isinstance(info, dict) else None
+                if until and until > today:
+                    rules[sig] = 0
+            cache.update(day=today, rules=rules)
+        return cache["rules"].copy()
 
 
 def score_ai(ticker_data):
@@ -120,55 +153,91 @@ def compute_global_score(
     return round(sum(metrics) / len(metrics) * 10.0, 2)
 
 
-MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
-
+def _float_column(df: pd.DataFrame, col: Optional[str], keep_nan: bool = False) -> np.ndarray:
+    """Column-wise ``_safe_float``: unparsable or missing values become 0.
 
-def load_model_by_version(version: str):
-    """Load a model from the models directory using a version name.
+    With ``keep_nan`` genuine NaN floats stay NaN, as ``float(nan)`` does in
+    :func:`compute_global_score`.
+    """
 
-    Tries ``<version>.pkl`` first. If absent, looks for ``<version>.pkl.b64``,
-    decodes the base64 string and loads the model from memory.
+    if col is None or col not in df.columns:
+        return np.zeros(len(df))
+    raw = df[col]
+    values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+    if raw.dtype == object:
+        is_nan = raw.map(lambda v: isinstance(v, float) and math.isnan(v)).to_numpy(dtype=bool)
+        failed = np.isnan(values) & ~is_nan
+        values[failed] = 0.0
+    if not keep_nan:
+        values[np.isnan(values)] = 0.0
+    return values
+
+
+def compute_global_score_batch(
+    df: pd.DataFrame,
+    score_ai_col: Optional[str] = "score",
+    gpt_col: Optional[str] = "score_gpt",
+    pct_col: Optional[str] = "percent_gain",
+    volume_col: Optional[str] = "volume",
+    float_col: Optional[str] = "float_shares",
+    sentiment_col: Optional[str] = "sentiment",
+) -> pd.Series:
+    """Vectorised :func:`compute_global_score` over the columns of ``df``.
+
+    Returns the same values as applying the scalar function row by row
+    (missing columns, or a column name of ``None``, count as ``None``), as a
+    Series aligned on ``df.index``.
     """
 
-    try:
-        import joblib
-    except Exception:  # pragma: no cover - optional dependency
-        import pickle as joblib
+    n = len(df)
+    score_ai_norm = np.clip(_float_column(df, score_ai_col) / 10.0, 0.0, 1.0)
+    gpt_norm = np.clip(_float_column(df, gpt_col) / 10.0, 0.0, 1.0)
+
+    # a NaN gain propagates to the final score, exactly like the scalar path
+    pct = _float_column(df, pct_col, keep_nan=True)
+    pct_norm = (np.clip(pct / 20.0, -1.0, 1.0) + 1.0) / 2.0
+
+    vol = _float_column(df, volume_col)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol_norm = np.where(vol > 0, np.minimum(np.log10(vol + 1) / 8.0, 1.0), 0.0)
+        flt = _float_column(df, float_col)
+        flt_norm = np.where(flt > 0, 1.0 - np.minimum(np.log10(flt + 1) / 9.0, 1.0), 0.0)
+
+    if sentiment_col is not None and sentiment_col in df.columns:
+        text = df[sentiment_col].astype(str).str.lower()
+        sent_val = np.where(
+            text.str.contains("pos", regex=False),
+            1.0,
+            np.where(text.str.contains("neg", regex=False), -1.0, 0.0),
+        )
+    else:
+        sent_val = np.zeros(n)
+    sent_norm = (sent_val + 1.0) / 2.0
 
-    pkl_path = os.path.join(MODELS_DIR, f"{version}.pkl")
-    if os.path.exists(pkl_path):
-        try:
-            return joblib.load(pkl_path)
-        except Exception:
-            if version == "dummy_model_v1":
-                class DummyModel:
-                    def predict(self, X):
-                        return [int(x[0]) for x in X]
-
-                return DummyModel()
-            raise
-
-    b64_path = pkl_path + ".b64"
-    if os.path.exists(b64_path):
-        with open(b64_path, "rb") as f:
-            encoded = f.read()
-        decoded = base64.b64decode(encoded)
-        try:
-            return joblib.load(io.BytesIO(decoded))
-        except Exception:
-            if version == "dummy_model_v1":
-                class DummyModel:
-                    def predict(self, X):
-                        return [int(x[0]) for x in X]
+    total = score_ai_norm + gpt_norm + pct_norm + vol_norm + flt_norm + sent_norm
+    raw = total / 6 * 10.0
+    # Python's round() (correctly rounded) rather than np.round so that the
+    # results match compute_global_score to the last digit.
+    return pd.Series([round(v, 2) for v in raw.tolist()], index=df.index, dtype=float)
 
-                return DummyModel()
-            raise
 
-    if version == "dummy_model_v1":
-        class DummyModel:
-            def predict(self, X):
-                return [int(x[0]) for x in X]
+class _DummyModel:
+    def predict(self, X):
+        return [int(x[0]) for x in X]
 
-        return DummyModel()
 
-    raise FileNotFoundError(f"Model file for version '{version}' not found")
+def load_model_by_version(version: str):
+    """Load a model from the models directory using a version name.
+
+    Tries ``<version>.pkl`` first. If absent, looks for ``<version>.pkl.b64``,
+    decodes the base64 string and loads the model from memory. Models are
+    cached by :mod:`intelligence.model_registry`, so repeated calls only
+    deserialize again when the file changes.
+    """
+
+    try:
+        return get_model_registry(MODELS_DIR).get(version)
+    except Exception:
+        if version == "dummy_model_v1":
+            return _DummyModel()
+        raise
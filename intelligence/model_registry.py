@@ -0,0 +1,185 @@
+"""In-process registry of the AI models, keyed by version and content hash.
+
+``load_model_by_version`` used to base64-decode and unpickle the model file on
+every call.  :class:`ModelRegistry` deserializes each version once and then
+only ``stat``s its file: the cached instance is returned as long as the file
+is unchanged.  When it changes (retraining, a new FinRL export picked up by
+``automation.codex_watcher``) the bytes are hashed again and the model is
+reloaded, unless an already loaded version has the same content hash, in
+which case that instance is shared.
+
+:meth:`ModelRegistry.warm_up` loads the models at startup so the trading
+loop never pays the deserialization cost, and :meth:`ModelRegistry.refresh`
+hot-swaps a version from a given file.  With ``mmap_mode`` (``"r"``, or the
+``MODEL_MMAP_MODE`` environment variable) plain ``.pkl`` files are loaded by
+joblib with their numpy arrays memory-mapped instead of copied.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import joblib
+except ImportError:  # pragma: no cover - optional dependency
+    joblib = None
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
+
+_SUFFIXES = (".pkl.b64", ".pkl")
+
+
+@dataclass
+class _Entry:
+    path: str
+    stamp: Tuple[int, int]
+    digest: str
+    model: Any
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def version_from_path(path: str) -> Optional[str]:
+    """Return the model version of ``path`` (``x.pkl`` / ``x.pkl.b64``) or ``None``."""
+
+    name = os.path.basename(str(path))
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+class ModelRegistry:
+    """Thread-safe cache of deserialized models for one models directory."""
+
+    def __init__(self, models_dir: str = MODELS_DIR, mmap_mode: Optional[str] = None) -> None:
+        self.models_dir = str(models_dir)
+        self.mmap_mode = mmap_mode if mmap_mode is not None else (os.getenv("MODEL_MMAP_MODE") or None)
+        self._entries: Dict[str, _Entry] = {}
+        self._paths: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def _resolve(self, version: str) -> Optional[str]:
+        path = self._paths.get(version)
+        if path is not None and os.path.exists(path):
+            return path
+        pkl_path = os.path.join(self.models_dir, f"{version}.pkl")
+        for candidate in (pkl_path, pkl_path + ".b64"):
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _deserialize(self, path: str, data: bytes) -> Any:
+        if path.endswith(".b64"):
+            data = base64.b64decode(data)
+        elif self.mmap_mode and joblib is not None:
+            return joblib.load(path, mmap_mode=self.mmap_mode)
+        if joblib is None:
+            return pickle.loads(data)
+        return joblib.load(io.BytesIO(data))
+
+    def _load(self, version: str, path: str) -> Any:
+        stamp = _stamp(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        shared = next((e.model for e in self._entries.values() if e.digest == digest), None)
+        if shared is not None:
+            model = shared
+        else:
+            model = self._deserialize(path, data)
+            self.loads += 1
+        self._entries[version] = _Entry(path, stamp, digest, model)
+        return model
+
+    def get(self, version: str) -> Any:
+        """Return the model of ``version``, loading it if needed or changed."""
+
+        with self._lock:
+            path = self._resolve(version)
+            if path is None:
+                self._entries.pop(version, None)
+                raise FileNotFoundError(f"Model file for version '{version}' not found")
+            entry = self._entries.get(version)
+            if entry is not None and entry.path == path and entry.stamp == _stamp(path):
+                return entry.model
+            return self._load(version, path)
+
+    def refresh(self, path: str, version: Optional[str] = None) -> Any:
+        """Load ``path`` now and serve it as ``version`` (default: from the name)."""
+
+        path = str(path)
+        version = version or version_from_path(path)
+        if version is None:
+            raise ValueError(f"not a model file: {path}")
+        with self._lock:
+            self._paths[version] = path
+            return self._load(version, path)
+
+    def warm_up(self, versions: Iterable[str]) -> List[str]:
+        """Load ``versions`` ahead of use; return the ones that could be loaded."""
+
+        loaded = []
+        for version in versions:
+            try:
+                self.get(version)
+            except FileNotFoundError:
+                continue
+            except Exception as exc:
+                print(f"[models] warm-up failed for {version}: {exc}")
+                continue
+            loaded.append(version)
+        return loaded
+
+    def evict(self, version: str) -> None:
+        with self._lock:
+            self._entries.pop(version, None)
+            self._paths.pop(version, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+
+    def digests(self) -> Dict[str, str]:
+        """Return the content hash of every loaded version."""
+
+        with self._lock:
+            return {version: e.digest for version, e in self._entries.items()}
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(models_dir: str = MODELS_DIR) -> ModelRegistry:
+    """Return the process-wide registry of ``models_dir``."""
+
+    key = os.path.abspath(models_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ModelRegistry(models_dir)
+        return registry
+
+
+def warm_up_models(versions: Optional[Iterable[str]] = None) -> List[str]:
+    """Preload ``versions`` (default: ``MODEL_WARMUP``, comma separated)."""
+
+    if versions is None:
+        versions = [v.strip() for v in os.getenv("MODEL_WARMUP", "modele_ia").split(",") if v.strip()]
+    return get_model_registry().warm_up(versions)
@@ -1,16 +1,14 @@
-import os
-import joblib
 from intelligence.features.check_tickers import analyser_ticker
+from intelligence.model_registry import get_model_registry
 
-MODEL_PATH = os.path.join('models', 'modele_ia.pkl')
-_model = None
+MODEL_VERSION = 'modele_ia'
 
 
 def _load_model():
-    global _model
-    if _model is None and os.path.exists(MODEL_PATH):
-        _model = joblib.load(MODEL_PATH)
-    return _model
+    try:
+        return get_model_registry().get(MODEL_VERSION)
+    except FileNotFoundError:
+        return None
 
 
 def score_ticker(ticker: str) -> float:
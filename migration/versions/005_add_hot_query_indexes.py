@@ -0,0 +1,39 @@
+"""add (ticker, timestamp) indexes for hot queries"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) - see core/hot_queries.py for the queries served
+INDEXES = [
+    ('idx_intraday_smart_ticker_timestamp', 'intraday_smart', ['ticker', 'timestamp']),
+    ('idx_intraday_data_ticker_timestamp', 'intraday_data', ['ticker', 'timestamp']),
+    ('idx_ticks_ticker_timestamp', 'ticks', ['ticker', 'timestamp']),
+    ('idx_trades_reels_symbol_timestamp', 'trades_reels', ['symbol', 'timestamp']),
+    ('idx_trades_auto_ticker_timestamp', 'trades_auto', ['ticker', 'timestamp']),
+    ('idx_trades_ticker_datetime', 'trades', ['ticker', 'datetime']),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    # Several of these tables are created lazily by the application, so only
+    # index the ones present; the app creates the rest from
+    # core.hot_queries.INDEX_DDL when it creates the table.
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    tables = _existing_tables()
+    for name, table, _ in INDEXES:
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
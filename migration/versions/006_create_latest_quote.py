@@ -0,0 +1,67 @@
+"""create latest_quote maintained by a trigger on intraday_smart"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the SQL in core/latest_quote.py as of this revision; later
+# changes to the application DDL need their own revision.
+LATEST_QUOTE_DDL = """
+CREATE TABLE IF NOT EXISTS latest_quote (
+    ticker TEXT PRIMARY KEY,
+    price REAL,
+    change_val REAL,
+    change_percent REAL,
+    volume INTEGER,
+    high REAL,
+    low REAL,
+    source TEXT,
+    timestamp TEXT
+)
+"""
+
+LATEST_QUOTE_TRIGGER_DDL = """
+CREATE TRIGGER IF NOT EXISTS trg_intraday_smart_latest_quote
+AFTER INSERT ON intraday_smart
+BEGIN
+    INSERT INTO latest_quote (ticker, price, change_val, change_percent, volume, high, low, source, timestamp)
+    VALUES (NEW.ticker, NEW.price, NEW.change_val, NEW.change_percent, NEW.volume, NEW.high, NEW.low, NEW.source, NEW.timestamp)
+    ON CONFLICT(ticker) DO UPDATE SET
+        price = excluded.price,
+        change_val = excluded.change_val,
+        change_percent = excluded.change_percent,
+        volume = excluded.volume,
+        high = excluded.high,
+        low = excluded.low,
+        source = excluded.source,
+        timestamp = excluded.timestamp
+    WHERE latest_quote.timestamp IS NULL OR excluded.timestamp >= latest_quote.timestamp;
+END
+"""
+
+BACKFILL_SQL = """
+INSERT OR REPLACE INTO latest_quote (ticker, price, change_val, change_percent, volume, high, low, source, timestamp)
+SELECT s.ticker, s.price, s.change_val, s.change_percent, s.volume, s.high, s.low, s.source, s.timestamp
+FROM intraday_smart s
+JOIN (
+    SELECT ticker, MAX(timestamp) AS max_ts
+    FROM intraday_smart
+    GROUP BY ticker
+) m ON s.ticker = m.ticker AND s.timestamp = m.max_ts
+ORDER BY s.id
+"""
+
+
+def upgrade():
+    op.execute(LATEST_QUOTE_DDL)
+    if 'intraday_smart' in sa.inspect(op.get_bind()).get_table_names():
+        op.execute(LATEST_QUOTE_TRIGGER_DDL)
+        op.execute(BACKFILL_SQL)
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS trg_intraday_smart_latest_quote')
+    op.drop_table('latest_quote')
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import json
 import os
-import sqlite3
 import threading
 import time
 from typing import Dict, Any, Optional
 
+from core.event_bus import get_event_bus
+from core.sqlite_pool import connection
 from intelligence.ai_scorer import score_ai
 from utils.utils_graph import charger_intraday_intelligent
 from ui.utils_affichage_ticker import calculer_indicateurs
@@ -60,7 +61,7 @@ def verifier_conditions_achat(ticker: str, thresholds: Optional[Dict[str, Any]]
     price = indicateurs.get("price")
     volume_ratio = volume / vol_avg if vol_avg else 1.0
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with connection(DB_PATH) as conn:
         row = conn.execute(
             "SELECT float_shares, change_percent, score, has_fda FROM watchlist WHERE ticker = ?",
             (ticker,),
@@ -98,7 +99,7 @@ def verifier_conditions_achat(ticker: str, thresholds: Optional[Dict[str, Any]]
 
     fda_ok = bool(has_fda)
     if thresholds.get("check_fda", True) and not fda_ok:
-        with sqlite3.connect(DB_PATH) as conn:
+        with connection(DB_PATH) as conn:
             fda_ok = check_fda_match(conn, ticker)
     if fda_ok:
         details.append("FDA")
@@ -128,23 +129,41 @@ def _telegram_message(res: Dict[str, Any]) -> str:
     )
 
 
+def _verifier_et_alerter(tickers, thresholds: Dict[str, Any]) -> None:
+    for tic in tickers:
+        res = verifier_conditions_achat(tic, thresholds)
+        if res.get("ok"):
+            send_telegram_message(_telegram_message(res))
+            st.session_state["watchdog_alert"] = res
+
+
 def surveiller_tickers(interval: Optional[int] = None) -> None:
-    """Background loop checking all tickers."""
+    """Background loop checking all tickers.
+
+    The whole watchlist is checked every ``watch_interval`` seconds; in
+    between, a ``signal.pump.<TICKER>`` event on the bus triggers an
+    immediate check of that ticker instead of waiting for the next sweep.
+    """
     thresholds = load_thresholds()
     wait = interval or thresholds.get("watch_interval", 60)
+    signals = get_event_bus().subscribe("signal.pump.*", maxsize=100)
     while True:
         try:
-            with sqlite3.connect(DB_PATH) as conn:
+            with connection(DB_PATH) as conn:
                 rows = conn.execute("SELECT ticker FROM watchlist").fetchall()
-            tickers = [r[0] for r in rows]
-            for tic in tickers:
-                res = verifier_conditions_achat(tic, thresholds)
-                if res.get("ok"):
-                    send_telegram_message(_telegram_message(res))
-                    st.session_state["watchdog_alert"] = res
+            _verifier_et_alerter([r[0] for r in rows], thresholds)
         except Exception as exc:
             print(f"[watchdog] Error: {exc}")
-        time.sleep(wait)
+        deadline = time.monotonic() + wait
+        while True:
+            remaining = deadline - time.monotonic()
+            event = signals.get(timeout=remaining) if remaining > 0 else None
+            if event is None:
+                break
+            try:
+                _verifier_et_alerter([event.topic.split(".", 2)[2]], thresholds)
+            except Exception as exc:
+                print(f"[watchdog] Error: {exc}")
 
 
 def start_watchdog_thread() -> None:
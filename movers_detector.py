@@ -7,11 +7,13 @@ import time
 from collections import deque
 from typing import Deque, Dict, List, Optional, Tuple
 
-from data.stream_data_manager import get_latest_data, WATCHLIST, latest_data
+from core.event_bus import Event, EventBus, Subscription, get_event_bus
+from data.stream_data_manager import get_latest_data, WATCHLIST, latest_ticks
 from prescreen import screen_ticker
 
 _WINDOW = 60.0  # seconds
 _PUMP_THRESHOLD = 1.5  # percent
+_SIGNAL_COOLDOWN = 60.0  # seconds between two pump signals of a ticker
 
 _price_history: Dict[str, Deque[Tuple[float, float]]] = {}
 _lock = threading.Lock()
@@ -24,11 +26,25 @@ def _trim(history: Deque[Tuple[float, float]]) -> None:
 
 
 def update_price(ticker: str, price: float, ts: Optional[float] = None) -> None:
-    """Record ``price`` for ``ticker`` at timestamp ``ts`` (default ``time.time()``)."""
+    """Record ``price`` for ``ticker`` at epoch ``ts`` (default ``time.time()``).
+
+    Both writers use trade timestamps (the pump monitor from ``tick.*``
+    events, :func:`get_top_movers` from fresh stream quotes) and may deliver
+    them slightly out of order: the history is kept sorted by timestamp and
+    a tick already recorded by the other path is not added twice.
+    """
     ts = ts or time.time()
+    entry = (ts, price)
     with _lock:
         hist = _price_history.setdefault(ticker, deque())
-        hist.append((ts, price))
+        if not hist or ts > hist[-1][0]:
+            hist.append(entry)
+        else:
+            i = len(hist)
+            while i and hist[i - 1][0] > ts:
+                i -= 1
+            if not (i and hist[i - 1] == entry):
+                hist.insert(i, entry)
         _trim(hist)
 
 
@@ -66,16 +82,17 @@ def get_top_movers(tickers: Optional[List[str]] = None) -> List[dict]:
         if not screen_ticker(tic):
             continue
         data = get_latest_data(tic)
-        if data.get("status") == "ERR":
+        # a stale quote is not a price of the last minute
+        if data.get("status") == "ERR" or data.get("stale"):
             continue
         price = data.get("price")
         if price is None:
             continue
         volume = data.get("volume", 0)
-        update_price(tic, float(price))
+        update_price(tic, float(price), data.get("ts"))
         pct = get_pump_pct(tic)
         data["pump_pct_60s"] = round(pct, 2)
-        latest_data.setdefault(tic, {}).update({"pump_pct_60s": round(pct, 2)})
+        latest_ticks.annotate(tic, pump_pct_60s=round(pct, 2))
         if pct >= _PUMP_THRESHOLD:
             movers.append(
                 {
@@ -87,3 +104,71 @@ def get_top_movers(tickers: Optional[List[str]] = None) -> List[dict]:
             )
     movers.sort(key=lambda x: x["pump_pct_60s"], reverse=True)
     return movers[:10]
+
+
+class PumpMonitor:
+    """Push-based pump detection on the ``tick.*`` events of the bus.
+
+    Every tick updates the 60s price history; when the gain crosses
+    ``threshold`` a ``signal.pump.<TICKER>`` event is published (at most once
+    per ``cooldown`` seconds per ticker), so alerting does not wait for the
+    next :func:`get_top_movers` poll.
+    """
+
+    def __init__(
+        self,
+        bus: Optional[EventBus] = None,
+        threshold: float = _PUMP_THRESHOLD,
+        cooldown: float = _SIGNAL_COOLDOWN,
+    ) -> None:
+        self.bus = bus or get_event_bus()
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._last_signal: Dict[str, float] = {}
+        # last signal payload per ticker, for pages polling the monitor
+        self._signals: Dict[str, dict] = {}
+        self.subscription: Optional[Subscription] = None
+
+    def on_tick(self, event: Event) -> None:
+        ticker = event.topic.split(".", 1)[1]
+        tick = event.payload
+        update_price(ticker, float(tick["price"]), tick.get("ts"))
+        pct = round(get_pump_pct(ticker), 2)
+        latest_ticks.annotate(ticker, pump_pct_60s=pct)
+        now = time.time()
+        if pct < self.threshold or now - self._last_signal.get(ticker, 0.0) < self.cooldown:
+            return
+        self._last_signal[ticker] = now
+        payload = {"pump_pct": pct, "price": tick["price"], "ts": tick.get("ts", now)}
+        self._signals[ticker] = payload
+        self.bus.publish(f"signal.pump.{ticker}", payload)
+
+    def recent_signals(self, max_age: float = 300.0) -> Dict[str, dict]:
+        """Last signal of each ticker signalled within ``max_age`` seconds."""
+
+        now = time.time()
+        return {
+            t: p for t, p in list(self._signals.items()) if now - self._last_signal.get(t, 0.0) < max_age
+        }
+
+    def start(self) -> "PumpMonitor":
+        if self.subscription is None:
+            self.subscription = self.bus.consume("tick.*", self.on_tick, name="pump-monitor", maxsize=10_000)
+        return self
+
+    def stop(self) -> None:
+        if self.subscription is not None:
+            self.subscription.close()
+            self.subscription = None
+
+
+_monitor: Optional[PumpMonitor] = None
+
+
+def start_pump_monitor() -> PumpMonitor:
+    """Start (once) the process-wide :class:`PumpMonitor`."""
+    global _monitor
+    with _lock:
+        if _monitor is None:
+            _monitor = PumpMonitor()
+    return _monitor.start()
@@ -1,7 +1,9 @@
 import pandas as pd
 import yfinance as yf
 from functools import lru_cache
-from typing import Optional
+from typing import List, Optional, Sequence
+
+_BATCH_SIZE = 200
 
 
 def _download(*args, **kwargs) -> pd.DataFrame:
@@ -46,6 +48,72 @@ def get_gap_pct(ticker: str) -> Optional[float]:
     return None
 
 
+def _download_many(tickers: Sequence[str], **kwargs) -> pd.DataFrame:
+    """Download ``tickers`` in chunks of ``_BATCH_SIZE`` multi-symbol calls."""
+
+    frames = []
+    for i in range(0, len(tickers), _BATCH_SIZE):
+        chunk = list(tickers[i : i + _BATCH_SIZE])
+        df = _download(chunk, group_by="ticker", threads=True, **kwargs)
+        if df.empty:
+            continue
+        if not isinstance(df.columns, pd.MultiIndex):
+            df.columns = pd.MultiIndex.from_product([chunk[:1], df.columns])
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1)
+
+
+def _field(df: pd.DataFrame, field: str, tickers: List[str]) -> pd.DataFrame:
+    """Return a ``(dates, tickers)`` frame of ``field`` from a grouped download."""
+
+    if df.empty:
+        return pd.DataFrame(columns=tickers, dtype=float)
+    level = 1 if field in df.columns.get_level_values(1) else 0
+    if field not in df.columns.get_level_values(level):
+        return pd.DataFrame(index=df.index, columns=tickers, dtype=float)
+    out = df.xs(field, axis=1, level=level)
+    out = out.loc[:, ~out.columns.duplicated()]
+    return out.reindex(columns=tickers).astype(float)
+
+
+def screen_tickers(tickers: Sequence[str], days: int = 10) -> pd.Series:
+    """Vectorized :func:`screen_ticker` over a whole universe.
+
+    Daily bars (average volume and gap) and pre-market minute bars are pulled
+    with a handful of multi-symbol downloads instead of three calls per
+    ticker.  Returns a boolean Series indexed by ticker.
+    """
+
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if not tickers:
+        return pd.Series(dtype=bool)
+
+    daily = _download_many(tickers, period=f"{days}d", interval="1d")
+    volume = _field(daily, "Volume", tickers)
+    avg = volume.tail(days).mean()
+
+    opens = _field(daily, "Open", tickers)
+    closes = _field(daily, "Close", tickers)
+    gap = pd.Series(float("nan"), index=tickers)
+    if len(daily) >= 2:
+        prev_close = closes.iloc[-2]
+        gap = (opens.iloc[-1] - prev_close) / prev_close.where(prev_close != 0) * 100
+
+    minute = _download_many(tickers, period="1d", interval="1m", prepost=True)
+    pre_vol = pd.Series(0.0, index=tickers)
+    if not minute.empty:
+        if not minute.index.tzinfo:
+            minute.index = minute.index.tz_localize("UTC")
+        minute = minute.between_time("04:00", "09:30")
+        pre_vol = _field(minute, "Volume", tickers).sum().reindex(tickers, fill_value=0.0)
+
+    ratio = pre_vol / avg.where(avg > 0)
+    mask = (ratio > 2) & (gap.abs() > 5) & (gap.abs() < 15)
+    return mask.reindex(tickers, fill_value=False).fillna(False).astype(bool)
+
+
 def prefilter_quotes(df: pd.DataFrame) -> pd.DataFrame:
     """Lightweight price/volume filter before expensive calls."""
     if df.empty:
@@ -58,12 +126,4 @@ def prefilter_quotes(df: pd.DataFrame) -> pd.DataFrame:
 def screen_ticker(ticker: str) -> bool:
     """Return ``True`` if ``ticker`` meets premarket screening criteria."""
 
-    avg = get_average_volume(ticker) or 0
-    if avg == 0:
-        return False
-    pre_vol = get_premarket_volume(ticker)
-    ratio = pre_vol / avg
-    gap = get_gap_pct(ticker)
-    if gap is None:
-        return False
-    return ratio > 2 and 5 < abs(gap) < 15
+    return bool(screen_tickers([ticker]).get(ticker.upper(), False))
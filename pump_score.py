@@ -16,13 +16,17 @@ from movers_detector import get_pump_pct, get_momentum
 
 
 _DEF_SCORE = 0
+# quotes older than this (seconds) are not scored
+MAX_QUOTE_AGE = 120.0
 
 
 def score_pump_ia(ticker: str) -> dict:
     """Return a pump score between 0 and 100 for ``ticker``."""
-    tick = get_latest_data(ticker)
+    tick = get_latest_data(ticker, max_age=MAX_QUOTE_AGE)
     if tick.get("status") == "ERR" or tick.get("price") is None:
         return {"ticker": ticker, "status": "NO_DATA", "score": 0}
+    if tick.get("age", 0.0) > MAX_QUOTE_AGE:
+        return {"ticker": ticker, "status": "STALE", "score": 0}
 
     price = tick.get("price")
     volume = tick.get("volume")
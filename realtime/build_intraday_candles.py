@@ -2,21 +2,57 @@ import os
 import pandas as pd
 from datetime import datetime
 
+from realtime.candle_builder import get_bar_storage, get_candle_aggregator, interval_seconds
+from realtime.tick_store import get_tick_store
+
 SAVE_DIR = "data/ticks"
 
-def build_candles(ticker, interval="1min"):
+
+def _streamed_candles(ticker, interval, today):
+    """Bars already built by the streaming aggregator (stored + in memory)."""
+    seconds = interval_seconds(interval)
+    stored = get_bar_storage().store(seconds).read(ticker, start=today)
+    live = get_candle_aggregator().candles(ticker, seconds)
+    live = live[live["timestamp"] >= today]
+    frames = [f for f in (stored, live) if f is not None and not f.empty]
+    if not frames:
+        return None
+    candles = pd.concat(frames, ignore_index=True)
+    candles = candles.drop_duplicates("timestamp", keep="last").sort_values("timestamp")
+    return candles.reset_index(drop=True)
+
+
+def _load_today_ticks(ticker, today):
+    """Today's ticks from the Parquet store, else from the legacy CSV."""
+    df = get_tick_store().read(ticker, start=today)
+    if df is not None:
+        return df
+
     path = os.path.join(SAVE_DIR, f"{ticker}.csv")
     if not os.path.exists(path):
-        print(f"No tick data available for {ticker}.")
-        return pd.DataFrame()
-
+        return None
     df = pd.read_csv(path)
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-    df.set_index("timestamp", inplace=True)
+    return df[df["timestamp"] >= today]
+
 
+def build_candles(ticker, interval="1min"):
     # Only today's data
     today = pd.Timestamp.now().normalize()
-    df = df[df.index >= today]
+    candles = _streamed_candles(ticker, "1min" if interval == "1min" else "5min", today)
+    if candles is not None:
+        return candles
+
+    df = _load_today_ticks(ticker, today)
+    if df is None:
+        print(f"No tick data available for {ticker}.")
+        return pd.DataFrame()
+
+    df = df.set_index("timestamp")
+    # Ticks from the store only carry the trade price
+    for col in ("o", "h", "l"):
+        if col not in df.columns or df[col].isna().all():
+            df[col] = df["c"]
 
     rule = "1min" if interval == "1min" else "5min"
     candles = df.resample(rule).agg({
@@ -27,4 +63,4 @@ def build_candles(ticker, interval="1min"):
         "v": "sum" if "v" in df.columns else "count"
     }).dropna()
     candles.reset_index(inplace=True)
-    return candles
\ No newline at end of file
+    return candles
@@ -0,0 +1,279 @@
+"""Streaming OHLCV bars built tick by tick.
+
+``build_candles`` used to resample the whole day of ticks on every chart or
+detector refresh.  :class:`CandleAggregator` keeps the open bar for each
+ticker and interval instead: :meth:`~CandleAggregator.on_tick` updates it in
+O(1), closes it when a tick falls into the next window and hands every
+closed bar to the subscribers (e.g. :class:`BarStorage`, which persists them
+to the Parquet bar store).  :meth:`~CandleAggregator.current` returns the
+partial bar and :meth:`~CandleAggregator.candles` the recent bars as a frame
+shaped like ``build_candles`` output.
+
+Bars are aligned on UTC epoch multiples of the interval and carry the keys
+``timestamp`` (bar start, epoch seconds), ``o``, ``h``, ``l``, ``c`` and ``v``.
+Ticks older than the open bar are ignored.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from core.event_bus import get_event_bus
+from realtime.tick_store import TickStore
+
+BAR_STORE_DIR = os.path.join("data", "bar_store")
+DEFAULT_INTERVALS = (60, 300)
+
+Bar = Dict[str, float]
+Subscriber = Callable[[str, int, Bar], None]
+
+_INTERVAL_ALIASES = {"1min": 60, "1m": 60, "5min": 300, "5m": 300}
+
+
+def interval_seconds(interval: Union[int, str]) -> int:
+    """Return ``interval`` ("1min", "5m", 300...) in seconds."""
+
+    if isinstance(interval, int):
+        return interval
+    try:
+        return _INTERVAL_ALIASES[interval]
+    except KeyError:
+        raise ValueError(f"unsupported interval: {interval!r}") from None
+
+
+def interval_label(seconds: int) -> str:
+    return f"{seconds // 60}m" if seconds % 60 == 0 else f"{seconds}s"
+
+
+def bars_to_frame(bars: Iterable[Bar]) -> pd.DataFrame:
+    df = pd.DataFrame(list(bars), columns=["timestamp", "o", "h", "l", "c", "v"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    return df
+
+
+class CandleAggregator:
+    """Thread-safe tick-to-bar aggregator for several intervals."""
+
+    def __init__(self, intervals: Iterable[int] = DEFAULT_INTERVALS, history: int = 1000) -> None:
+        self.intervals = tuple(sorted(set(intervals)))
+        self.history = history
+        self._open: Dict[Tuple[str, int], Bar] = {}
+        self._closed: Dict[Tuple[str, int], Deque[Bar]] = {}
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback(ticker, interval, bar)`` for every closed bar.
+
+        Returns a function removing the subscription.
+        """
+
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _close(self, key: Tuple[str, int], bar: Bar, closed: List[Tuple[str, int, Bar]]) -> None:
+        history = self._closed.get(key)
+        if history is None:
+            history = self._closed[key] = deque(maxlen=self.history)
+        history.append(bar)
+        closed.append((key[0], key[1], dict(bar)))
+
+    def _emit(self, closed: List[Tuple[str, int, Bar]]) -> None:
+        if not closed:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for ticker, interval, bar in closed:
+            for callback in subscribers:
+                try:
+                    callback(ticker, interval, bar)
+                except Exception as exc:
+                    print(f"[candles] subscriber failed for {ticker}: {exc}")
+
+    def on_tick(
+        self,
+        ticker: str,
+        price: float,
+        volume: float = 0.0,
+        ts: Optional[float] = None,
+    ) -> List[Tuple[str, int, Bar]]:
+        """Fold a tick at epoch ``ts`` into every interval; return the bars it closed."""
+
+        if price is None:
+            return []
+        ticker = ticker.upper()
+        ts = time.time() if ts is None else float(ts)
+        volume = float(volume or 0.0)
+        closed: List[Tuple[str, int, Bar]] = []
+        with self._lock:
+            for interval in self.intervals:
+                start = int(ts - ts % interval)
+                key = (ticker, interval)
+                bar = self._open.get(key)
+                if bar is not None and start < bar["timestamp"]:
+                    continue
+                if bar is not None and start > bar["timestamp"]:
+                    self._close(key, bar, closed)
+                    bar = None
+                if bar is None:
+                    self._open[key] = {"timestamp": start, "o": price, "h": price, "l": price, "c": price, "v": volume}
+                    continue
+                if price > bar["h"]:
+                    bar["h"] = price
+                if price < bar["l"]:
+                    bar["l"] = price
+                bar["c"] = price
+                bar["v"] += volume
+        self._emit(closed)
+        return closed
+
+    def roll(self, now: Optional[float] = None) -> List[Tuple[str, int, Bar]]:
+        """Close open bars whose window ended before ``now`` (quiet tickers)."""
+
+        now = time.time() if now is None else now
+        closed: List[Tuple[str, int, Bar]] = []
+        with self._lock:
+            for key, bar in list(self._open.items()):
+                if now >= bar["timestamp"] + key[1]:
+                    del self._open[key]
+                    self._close(key, bar, closed)
+        self._emit(closed)
+        return closed
+
+    def current(self, ticker: str, interval: Union[int, str] = 60) -> Optional[Bar]:
+        """Return a copy of the open (partial) bar or ``None``."""
+
+        with self._lock:
+            bar = self._open.get((ticker.upper(), interval_seconds(interval)))
+            return dict(bar) if bar is not None else None
+
+    def bars(self, ticker: str, interval: Union[int, str] = 60, include_partial: bool = True) -> List[Bar]:
+        """Return the retained closed bars, oldest first, plus the partial one."""
+
+        key = (ticker.upper(), interval_seconds(interval))
+        with self._lock:
+            out = [dict(b) for b in self._closed.get(key, ())]
+            if include_partial and key in self._open:
+                out.append(dict(self._open[key]))
+        return out
+
+    def candles(self, ticker: str, interval: Union[int, str] = 60, include_partial: bool = True) -> pd.DataFrame:
+        return bars_to_frame(self.bars(ticker, interval, include_partial))
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return sorted({t for t, _ in self._open} | {t for t, _ in self._closed})
+
+
+class BarStorage:
+    """Subscriber persisting closed bars to one :class:`TickStore` per interval.
+
+    Bars are buffered and written once ``flush_size`` are pending or
+    ``flush_interval`` seconds after the first one, to avoid a Parquet file
+    per bar.  The writes happen on a background thread (started with the
+    first bar), so the WebSocket thread that closes a bar never waits on the
+    disk; :meth:`flush` writes whatever is pending on the caller's thread.
+    """
+
+    def __init__(self, root: str = BAR_STORE_DIR, flush_size: int = 100, flush_interval: float = 30.0) -> None:
+        self.root = root
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._stores: Dict[int, TickStore] = {}
+        self._pending: List[Tuple[str, int, Bar]] = []
+        self._first: Optional[float] = None
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def store(self, interval: int) -> TickStore:
+        store = self._stores.get(interval)
+        if store is None:
+            store = self._stores[interval] = TickStore(os.path.join(self.root, interval_label(interval)))
+        return store
+
+    def __call__(self, ticker: str, interval: int, bar: Bar) -> None:
+        with self._cond:
+            self._pending.append((ticker, interval, bar))
+            if self._first is None:
+                self._first = time.monotonic()
+                self._cond.notify()
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bar-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    wait = None
+                    if self._pending:
+                        wait = self._first + self.flush_interval - time.monotonic()
+                        if len(self._pending) >= self.flush_size or wait <= 0:
+                            break
+                    self._cond.wait(wait)
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"[candles] bar flush failed: {exc}")
+
+    def flush(self) -> None:
+        """Write the pending bars now (after any write in progress)."""
+
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending, self._first = self._pending, [], None
+            grouped: Dict[Tuple[str, int], List[Bar]] = {}
+            for ticker, interval, bar in pending:
+                grouped.setdefault((ticker, interval), []).append(bar)
+            for (ticker, interval), bars in grouped.items():
+                self.store(interval).append(ticker, bars)
+
+
+_default_aggregator: Optional[CandleAggregator] = None
+_default_storage: Optional[BarStorage] = None
+_default_lock = threading.Lock()
+
+
+def publish_bar(ticker: str, interval: int, bar: Bar) -> None:
+    """Subscriber publishing closed bars as ``bar.<1m|5m>.<TICKER>`` events."""
+
+    get_event_bus().publish(f"bar.{interval_label(interval)}.{ticker}", bar)
+
+
+def get_candle_aggregator() -> CandleAggregator:
+    """Return the process-wide aggregator.
+
+    Closed bars are persisted to ``BAR_STORE_DIR`` and published on the
+    event bus.
+    """
+
+    global _default_aggregator, _default_storage
+    with _default_lock:
+        if _default_aggregator is None:
+            _default_aggregator = CandleAggregator()
+            _default_storage = BarStorage()
+            _default_aggregator.subscribe(_default_storage)
+            _default_aggregator.subscribe(publish_bar)
+        return _default_aggregator
+
+
+def get_bar_storage() -> BarStorage:
+    get_candle_aggregator()
+    return _default_storage
@@ -13,6 +13,7 @@ from intelligence.ai_scorer import compute_global_score
 from notifications.telegram_bot import envoyer_alerte_ia
 from ui.trade_popup import show_trade_popup_streamlit
 from simulation.simulate_trade_result import executer_trade_simule
+from realtime.tick_store import get_tick_store
 
 RULES_PATH = os.path.join("config", "rules_auto.json")
 TICKS_DIR = os.path.join("data", "ticks")
@@ -31,7 +32,22 @@ def load_rules(path: str = RULES_PATH) -> dict:
     }
 
 
-def load_ticks(ticker: str) -> Optional[pd.DataFrame]:
+def load_ticks(ticker: str, minutes: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """Charge les ticks de ``ticker`` depuis le store Parquet (ou le CSV historique).
+
+    Avec ``minutes``, seuls les ticks des ``minutes`` dernières minutes avant
+    le dernier tick connu sont lus.
+    """
+    store = get_tick_store()
+    start = None
+    if minutes is not None:
+        last = store.last_timestamp(ticker)
+        if last is not None:
+            start = last - minutes * 60
+    df = store.read(ticker, start=start)
+    if df is not None:
+        return df
+
     path = os.path.join(TICKS_DIR, f"{ticker}.csv")
     if not os.path.exists(path):
         return None
@@ -39,6 +55,8 @@ def load_ticks(ticker: str) -> Optional[pd.DataFrame]:
     if "timestamp" not in df.columns or "c" not in df.columns:
         return None
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    if minutes is not None and not df.empty:
+        df = df[df["timestamp"] >= df["timestamp"].max() - pd.Timedelta(minutes=minutes)]
     return df
 
 
@@ -68,7 +86,8 @@ def compute_metrics(df: pd.DataFrame, minutes: int = 3) -> Optional[dict]:
 
 
 def detect_pump(ticker: str, rules: Optional[dict] = None) -> Optional[dict]:
-    df = load_ticks(ticker)
+    # compute_metrics compare la fenêtre récente (3 min) à la précédente
+    df = load_ticks(ticker, minutes=6)
     if df is None:
         return None
     metrics = compute_metrics(df)
@@ -1,18 +1,42 @@
+"""Pump scan of the watchlist over Finnhub 1-minute candles.
+
+Each symbol is rescanned on its own cadence: a heap keyed by the next due
+time, derived from the recent volatility of its candles (mean absolute
+1-minute move), so a ticker moving :data:`HOT_VOLATILITY` % a minute is
+fetched again every :data:`MIN_INTERVAL` seconds and a flat one every
+:data:`MAX_INTERVAL` seconds.  Candle fetches run concurrently, bounded by a
+semaphore and the shared Finnhub rate limiter; ``score_pump_ia`` and the
+Telegram alert run in a worker thread so they never block the event loop.
+"""
+
 from __future__ import annotations
 
 import asyncio
+import heapq
 import os
 import time
-from typing import Dict, Any, Iterable, List
+from typing import Awaitable, Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
 
 import aiohttp
 
+from core.event_bus import EventBus, get_event_bus
+from utils.async_utils import async_to_thread
 from utils.market_scheduler import is_market_open
+from utils.rate_limiter import get_limiter
 from pump_score import score_pump_ia
 from utils.telegram_utils import send_telegram_message
 
 _API_KEY = os.getenv("FINNHUB_API_KEY", "")
+# last full analysis per symbol
 _CACHE: Dict[str, float] = {}
+_ANALYSIS_COOLDOWN = 60
+
+CONCURRENCY = int(os.getenv("PUMP_SCAN_CONCURRENCY", "8"))
+MIN_INTERVAL = float(os.getenv("PUMP_SCAN_MIN_INTERVAL", "5"))
+MAX_INTERVAL = float(os.getenv("PUMP_SCAN_MAX_INTERVAL", "300"))
+HOT_VOLATILITY = 1.0
+
+CandleFetcher = Callable[[aiohttp.ClientSession, str], Awaitable[Dict[str, Any]]]
 
 
 def _dedup(symbols: Iterable[str]) -> List[str]:
@@ -36,10 +60,12 @@ async def _get_stock_candles(session: aiohttp.ClientSession, symbol: str) -> Dic
         "token": _API_KEY,
     }
     url = "https://finnhub.io/api/v1/stock/candle"
+    limiter = get_limiter("finnhub")
     for attempt in range(3):
+        await limiter.acquire_async()
         async with session.get(url, params=params) as resp:
             if resp.status == 429:
-                await asyncio.sleep(2 ** attempt)
+                limiter.backoff(2 ** attempt)
                 continue
             resp.raise_for_status()
             return await resp.json()
@@ -57,30 +83,176 @@ def detect_pump(candles: Dict[str, Any]) -> bool:
     return price_change >= 3.0 and volume_ratio >= 1.5
 
 
+def volatility(candles: Dict[str, Any]) -> float:
+    """Mean absolute 1-minute close-to-close move of ``candles``, in %."""
+
+    closes = [c for c in candles.get("c") or [] if c]
+    if len(closes) < 2:
+        return 0.0
+    moves = [abs(b - a) / a * 100 for a, b in zip(closes, closes[1:])]
+    return sum(moves) / len(moves)
+
+
+def scan_interval(
+    vol: float,
+    min_interval: float = MIN_INTERVAL,
+    max_interval: float = MAX_INTERVAL,
+) -> float:
+    """Seconds until the next scan of a symbol with volatility ``vol``.
+
+    Geometric between ``max_interval`` (flat) and ``min_interval`` (at or
+    above :data:`HOT_VOLATILITY`).
+    """
+
+    heat = min(max(vol / HOT_VOLATILITY, 0.0), 1.0)
+    return max_interval * (min_interval / max_interval) ** heat
+
+
 async def run_full_analysis(symbol: str) -> None:
-    res = score_pump_ia(symbol)
+    now = time.time()
+    if now - _CACHE.get(symbol, 0.0) < _ANALYSIS_COOLDOWN:
+        return
+    _CACHE[symbol] = now
+    res = await async_to_thread(score_pump_ia, symbol)
     if res.get("score", 0) >= 80:
-        send_telegram_message(
-            f"Pump détecté sur {symbol} (score IA {res['score']})"
+        await async_to_thread(
+            send_telegram_message,
+            f"Pump détecté sur {symbol} (score IA {res['score']})",
         )
 
 
-async def scan_watchlist(watchlist: Iterable[str]) -> None:
-    tickers = _dedup(watchlist)
-    async with aiohttp.ClientSession() as session:
-        while True:
-            if not is_market_open():
-                await asyncio.sleep(60)
+class ScanScheduler:
+    """Per-symbol scan cadence with bounded concurrent candle fetches."""
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        concurrency: int = CONCURRENCY,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        fetch: Optional[CandleFetcher] = None,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.fetch = fetch or _get_stock_candles
+        self.concurrency = concurrency
+        self.volatility: Dict[str, float] = {}
+        self.scans: Dict[str, int] = {}
+        # (due, -volatility, symbol): the most volatile first among due symbols
+        self._heap: List[Tuple[float, float, str]] = []
+        self._inflight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.symbols = _dedup(symbols)
+        now = time.monotonic()
+        for symbol in self.symbols:
+            heapq.heappush(self._heap, (now, 0.0, symbol))
+
+    def due(self, now: float) -> List[str]:
+        """Pop the symbols whose scan is due at monotonic time ``now``."""
+
+        symbols = []
+        while self._heap and self._heap[0][0] <= now:
+            symbols.append(heapq.heappop(self._heap)[2])
+        return symbols
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def reschedule(self, symbol: str, vol: float, now: Optional[float] = None) -> float:
+        """Queue the next scan of ``symbol`` from its volatility; return the interval."""
+
+        now = time.monotonic() if now is None else now
+        interval = scan_interval(vol, self.min_interval, self.max_interval)
+        self.volatility[symbol] = vol
+        heapq.heappush(self._heap, (now + interval, -vol, symbol))
+        if self._wake is not None:
+            self._wake.set()
+        return interval
+
+    async def scan(self, session: aiohttp.ClientSession, symbol: str) -> None:
+        """Fetch ``symbol``'s candles, reschedule it and analyse a pump."""
+
+        candles: Dict[str, Any] = {}
+        try:
+            async with self._sem:
+                candles = await self.fetch(session, symbol)
+        except Exception as exc:
+            print(f"[scan] {symbol}: {exc}")
+        finally:
+            self.scans[symbol] = self.scans.get(symbol, 0) + 1
+            self.reschedule(symbol, volatility(candles or {}))
+            self._inflight.discard(symbol)
+        if candles and detect_pump(candles):
+            await run_full_analysis(symbol)
+
+    def dispatch(self, session: aiohttp.ClientSession, now: Optional[float] = None) -> int:
+        """Start a scan task for every due symbol; return how many started."""
+
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+            self._wake = asyncio.Event()
+        started = 0
+        for symbol in self.due(time.monotonic() if now is None else now):
+            if symbol in self._inflight:
                 continue
-            for symbol in tickers:
-                last = _CACHE.get(symbol, 0.0)
-                if time.time() - last < 60:
+            self._inflight.add(symbol)
+            task = asyncio.ensure_future(self.scan(session, symbol))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started += 1
+        return started
+
+    async def run(self, session: aiohttp.ClientSession) -> None:
+        """Scan forever while the market is open."""
+
+        try:
+            while True:
+                if not is_market_open():
+                    await asyncio.sleep(60)
+                    continue
+                self.dispatch(session)
+                nxt = self.next_due()
+                delay = self.max_interval if nxt is None else nxt - time.monotonic()
+                if delay <= 0:
                     continue
-                candles = await _get_stock_candles(session, symbol)
-                _CACHE[symbol] = time.time()
-                if detect_pump(candles):
-                    await run_full_analysis(symbol)
-            await asyncio.sleep(15)
+                self._wake.clear()
+                try:
+                    # a finished scan may queue an earlier due time
+                    await asyncio.wait_for(self._wake.wait(), min(delay, 60))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self.symbols),
+            "inflight": len(self._inflight),
+            "scans": sum(self.scans.values()),
+            "next_due_s": round(self.next_due() - time.monotonic(), 3) if self._heap else None,
+        }
+
+
+async def watch_pump_signals(bus: Optional[EventBus] = None) -> None:
+    """Run the full analysis as soon as a ``signal.pump.*`` event arrives.
+
+    Complements the candle scans of :func:`scan_watchlist` for streamed
+    tickers, which no longer wait for their next scan.
+    """
+    bus = bus or get_event_bus()
+    with bus.subscribe("signal.pump.*", maxsize=100) as signals:
+        async for event in signals:
+            symbol = event.topic.split(".", 2)[2]
+            await run_full_analysis(symbol)
+
+
+async def scan_watchlist(watchlist: Iterable[str], concurrency: int = CONCURRENCY) -> None:
+    scheduler = ScanScheduler(watchlist, concurrency=concurrency)
+    async with aiohttp.ClientSession() as session:
+        await scheduler.run(session)
 
 
 if __name__ == "__main__":  # pragma: no cover - manual run
@@ -90,4 +262,15 @@ if __name__ == "__main__":  # pragma: no cover - manual run
             wl = [l.strip() for l in f if l.strip()]
     else:
         wl = []
-    asyncio.run(scan_watchlist(wl))
+    # stream the watchlist so pump signals reach watch_pump_signals
+    from data.stream_data_manager import set_watchlist, start_ws
+    from movers_detector import start_pump_monitor
+
+    set_watchlist(_dedup(wl))
+    start_ws()
+    start_pump_monitor()
+
+    async def _main() -> None:
+        await asyncio.gather(scan_watchlist(wl), watch_pump_signals())
+
+    asyncio.run(_main())
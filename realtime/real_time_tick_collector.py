@@ -1,8 +1,8 @@
+import atexit
 import os
 import time
 import json
 import requests
-import sqlite3
 import sys
 
 # Ensure UTF-8 console output for emoji support
@@ -13,6 +13,10 @@ from datetime import datetime
 FINNHUB_TOKEN = os.getenv("FINNHUB_API_KEY")
 BASE_URL = "https://finnhub.io/api/v1/quote"
 from core.db import DB_PATH
+from realtime.candle_builder import get_bar_storage, get_candle_aggregator
+from realtime.tick_store import get_tick_store
+from realtime.tick_writer import TickWriter
+from data.streaming_indicators import IndicatorBook
 SAVE_DIR = "data/ticks"
 # Interval between API requests in seconds (reduced for finer granularity)
 INTERVAL = 5
@@ -21,6 +25,17 @@ TICKERS = ["AAPL", "TSLA", "NVDA", "SPPL", "SONN"]  # You can customize
 
 os.makedirs(SAVE_DIR, exist_ok=True)
 
+# Incremental indicators updated with every collected quote.  Finnhub /quote
+# has no volume field, so quotes are fed with volume=None: the price-based
+# indicators advance while the VWAP and volume average are left to the
+# WebSocket path (data.stream_data_manager), which sees trade sizes.
+indicator_book = IndicatorBook()
+INDICATOR_STATE_PATH = os.path.join("data", "indicator_state_rest.json")
+
+# Ticks are persisted in batches by a background thread (SQLite + Parquet store)
+tick_writer = TickWriter(DB_PATH, store=get_tick_store())
+candle_aggregator = get_candle_aggregator()
+
 def get_quote(ticker):
     url = f"{BASE_URL}?symbol={ticker}&token={FINNHUB_TOKEN}"
     try:
@@ -33,33 +48,29 @@ def get_quote(ticker):
         return None
 
 def append_tick(ticker, data):
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS ticks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ticker TEXT,
-            price REAL,
-            volume REAL,
-            timestamp INTEGER
-        )
-        """
-    )
-    conn.execute(
-        "INSERT INTO ticks (ticker, price, volume, timestamp) VALUES (?, ?, ?, ?)",
-        (ticker, data.get("c"), data.get("v", 0), data.get("timestamp")),
-    )
-    conn.commit()
-    conn.close()
+    """Queue a quote for the background writer (batched inserts)."""
+    tick_writer.put(ticker, data.get("c"), data.get("v", 0), data.get("timestamp"))
 
 if __name__ == "__main__":
     print("🚀 Starting real-time tick collector...")
+    indicator_book.load(INDICATOR_STATE_PATH)
+    atexit.register(tick_writer.close)
+    atexit.register(get_bar_storage().flush)
     while True:
         for ticker in TICKERS:
             quote = get_quote(ticker)
             if quote and "c" in quote:
                 append_tick(ticker, quote)
+                indicator_book.on_tick(ticker, quote["c"], None, quote["timestamp"])
+                candle_aggregator.on_tick(ticker, quote["c"], quote.get("v", 0), quote["timestamp"])
                 print(f"✅ {ticker} at {quote['c']} saved.")
             else:
                 print(f"❌ No data for {ticker}.")
+        indicator_book.save(INDICATOR_STATE_PATH)
+        candle_aggregator.roll()
+        stats = tick_writer.stats()
+        print(
+            f"📝 queue={stats['queue_depth']} written={stats['written']} "
+            f"dropped={stats['dropped']} flush={stats['last_flush_ms']:.1f}ms"
+        )
         time.sleep(INTERVAL)
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""Columnar tick store partitioned by ticker and trading day.
+
+Ticks used to live in one CSV per ticker under ``data/ticks`` which had to be
+re-read and re-parsed in full for every pump check or candle refresh.  The
+store keeps them as Parquet files laid out as::
+
+    data/tick_store/ticker=AAPL/date=2024-05-01/part-<ns>.parquet
+
+Each :meth:`TickStore.append` writes a small part file; once a day holds
+``compact_after`` parts they are merged into one ``compact-<ns>.parquet``
+file sorted by timestamp, where ``<ns>`` is the sequence number of the newest
+part it merged.  The compacted file is moved into place before the merged
+parts are deleted, and readers ignore every file it supersedes, so a crash or
+a reader in another process never sees the day twice or not at all.
+:meth:`TickStore.read` only opens the day partitions overlapping the
+requested range and pushes the timestamp filter down to Parquet row-group
+statistics, reading the files through memory maps.  :meth:`TickStore.last_timestamp`
+answers from the file footers alone.
+
+Timestamps are stored as epoch seconds (``int64``) like the old CSVs and are
+returned as naive UTC ``datetime64`` values.  ``pyarrow`` is optional: without
+it the store reports ``available == False`` and callers fall back to CSV.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = ds = pafs = pq = None
+
+TICK_STORE_DIR = os.path.join("data", "tick_store")
+TICK_COLUMNS = ["timestamp", "o", "h", "l", "c", "v"]
+
+TimeLike = Union[int, float, str, datetime, pd.Timestamp, None]
+
+
+def _epoch(value: TimeLike) -> Optional[int]:
+    """Convert ``value`` to epoch seconds; naive datetimes are taken as UTC."""
+
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.value // 10**9)
+
+
+def _day(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).date().isoformat()
+
+
+class TickStore:
+    """Append-only Parquet store of ticks for many tickers."""
+
+    def __init__(self, root: Union[str, Path] = TICK_STORE_DIR, compact_after: int = 64) -> None:
+        self.root = Path(root)
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return pa is not None
+
+    # ------------------------------------------------------------------
+    # Layout helpers
+    # ------------------------------------------------------------------
+    def _ticker_dir(self, ticker: str) -> Path:
+        return self.root / f"ticker={ticker.upper()}"
+
+    def _days(self, ticker: str) -> List[str]:
+        base = self._ticker_dir(ticker)
+        if not base.is_dir():
+            return []
+        return sorted(p.name[5:] for p in base.iterdir() if p.is_dir() and p.name.startswith("date="))
+
+    @staticmethod
+    def _seq(path: Path) -> int:
+        return int(path.stem.rsplit("-", 1)[1])
+
+    def _split_parts(self, ticker: str, day: str) -> Tuple[List[Path], List[Path]]:
+        """Return the live files of a day and the ones a compaction superseded."""
+
+        files = sorted(
+            (self._ticker_dir(ticker) / f"date={day}").glob("*.parquet"), key=self._seq
+        )
+        covered = max((self._seq(f) for f in files if f.name.startswith("compact-")), default=-1)
+        live, stale = [], []
+        for f in files:
+            seq = self._seq(f)
+            keep = seq > covered or (seq == covered and f.name.startswith("compact-"))
+            (live if keep else stale).append(f)
+        return live, stale
+
+    def _parts(self, ticker: str, day: str) -> List[Path]:
+        return self._split_parts(ticker, day)[0]
+
+    def tickers(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name[7:] for p in self.root.iterdir() if p.name.startswith("ticker="))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def append(self, ticker: str, ticks: Union[pd.DataFrame, Iterable[dict]]) -> int:
+        """Append ticks (``timestamp`` in epoch seconds plus ``o/h/l/c/v``).
+
+        Returns the number of rows written.
+        """
+
+        if not self.available:
+            return 0
+        df = ticks if isinstance(ticks, pd.DataFrame) else pd.DataFrame(list(ticks))
+        if df.empty or "timestamp" not in df.columns:
+            return 0
+        df = df.reindex(columns=TICK_COLUMNS)
+        df["timestamp"] = pd.to_numeric(df["timestamp"], errors="coerce")
+        df = df.dropna(subset=["timestamp"])
+        df["timestamp"] = df["timestamp"].astype("int64")
+        for col in TICK_COLUMNS[1:]:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+        days = df["timestamp"].map(_day)
+        with self._lock:
+            for day, chunk in df.groupby(days, sort=False):
+                folder = self._ticker_dir(ticker) / f"date={day}"
+                folder.mkdir(parents=True, exist_ok=True)
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                target = folder / f"part-{time.time_ns()}.parquet"
+                tmp = target.with_suffix(".tmp")
+                pq.write_table(table, tmp)
+                os.replace(tmp, target)
+                if len(self._parts(ticker, day)) >= self.compact_after:
+                    self._compact(ticker, day)
+        return len(df)
+
+    def compact(self, ticker: str, day: str) -> None:
+        """Merge the part files of ``ticker`` for ``day`` into one sorted file."""
+
+        if self.available:
+            with self._lock:
+                self._compact(ticker, day)
+
+    def _compact(self, ticker: str, day: str) -> None:
+        parts, stale = self._split_parts(ticker, day)
+        if len(parts) >= 2:
+            table = pq.read_table(parts, memory_map=True).sort_by("timestamp")
+            target = parts[-1].with_name(f"compact-{self._seq(parts[-1])}.parquet")
+            tmp = target.with_suffix(".tmp")
+            pq.write_table(table, tmp, row_group_size=16_384)
+            # publish the merged file first: from here readers skip the parts
+            os.replace(tmp, target)
+            stale.extend(parts)
+        for part in stale:
+            try:
+                part.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _files(self, ticker: str, start: Optional[int], end: Optional[int]) -> List[Path]:
+        lo = _day(start) if start is not None else None
+        hi = _day(end) if end is not None else None
+        files: List[Path] = []
+        for day in self._days(ticker):
+            if (lo is None or day >= lo) and (hi is None or day <= hi):
+                files.extend(self._parts(ticker, day))
+        return files
+
+    def read(
+        self,
+        ticker: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Return ticks of ``ticker`` with ``start <= timestamp <= end``.
+
+        ``None`` means the store holds nothing for the ticker (or ``pyarrow``
+        is missing); an empty frame means nothing matched the range.
+        """
+
+        if not self.available:
+            return None
+        start_s, end_s = _epoch(start), _epoch(end)
+        files = self._files(ticker, start_s, end_s)
+        if not files:
+            return None if not self._days(ticker) else pd.DataFrame(columns=list(columns or TICK_COLUMNS))
+
+        cols = list(columns) if columns else list(TICK_COLUMNS)
+        if "timestamp" not in cols:
+            cols.insert(0, "timestamp")
+        expr = None
+        if start_s is not None:
+            expr = ds.field("timestamp") >= start_s
+        if end_s is not None:
+            cond = ds.field("timestamp") <= end_s
+            expr = cond if expr is None else expr & cond
+
+        fs = pafs.LocalFileSystem(use_mmap=True)
+        for attempt in range(2):
+            try:
+                dataset = ds.dataset([str(f) for f in files], format="parquet", filesystem=fs)
+                table = dataset.to_table(columns=cols, filter=expr)
+                break
+            except (FileNotFoundError, OSError):
+                # a concurrent compaction replaced the parts; list them again
+                if attempt:
+                    raise
+                files = self._files(ticker, start_s, end_s)
+        df = table.to_pandas().sort_values("timestamp", kind="stable").reset_index(drop=True)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+        return df
+
+    def last_timestamp(self, ticker: str) -> Optional[int]:
+        """Latest stored epoch second for ``ticker``, read from Parquet footers."""
+
+        if not self.available:
+            return None
+        days = self._days(ticker)
+        for day in reversed(days):
+            latest = None
+            for part in self._parts(ticker, day):
+                try:
+                    meta = pq.ParquetFile(part, memory_map=True).metadata
+                except (FileNotFoundError, OSError):  # compacted meanwhile
+                    continue
+                idx = meta.schema.names.index("timestamp")
+                for rg in range(meta.num_row_groups):
+                    stats = meta.row_group(rg).column(idx).statistics
+                    if stats is not None and stats.has_min_max:
+                        latest = stats.max if latest is None else max(latest, stats.max)
+            if latest is not None:
+                return int(latest)
+        return None
+
+
+_default_store: Optional[TickStore] = None
+
+
+def get_tick_store() -> TickStore:
+    """Return the process-wide store rooted at :data:`TICK_STORE_DIR`."""
+
+    global _default_store
+    if _default_store is None or _default_store.root != Path(TICK_STORE_DIR):
+        _default_store = TickStore(TICK_STORE_DIR)
+    return _default_store
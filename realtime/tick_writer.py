@@ -0,0 +1,190 @@
+"""Background writer batching ticks into SQLite transactions.
+
+Writing each quote in its own transaction costs one commit (and WAL sync)
+per tick.  :class:`TickWriter` instead accepts ticks on a bounded queue and a
+daemon thread inserts them with ``executemany`` once ``batch_size`` rows are
+pending or ``flush_interval`` seconds have passed since the first one, so a
+sweep over hundreds of symbols lands in a handful of commits.
+
+When the queue is full :meth:`TickWriter.put` waits up to ``put_timeout``
+seconds and then drops the tick (counted in :meth:`TickWriter.stats`) rather
+than blocking the collector indefinitely.  :meth:`TickWriter.close` drains
+the queue before returning.  When a :class:`~realtime.tick_store.TickStore`
+is given, each batch is also appended to it per ticker.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from core.hot_queries import ensure_index
+from core.sqlite_pool import connection
+from realtime.tick_store import TickStore
+
+Tick = Tuple[str, Optional[float], Optional[float], Optional[int]]
+
+CREATE_TICKS_SQL = """
+CREATE TABLE IF NOT EXISTS ticks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT,
+    price REAL,
+    volume REAL,
+    timestamp INTEGER
+)
+"""
+INSERT_TICK_SQL = "INSERT INTO ticks (ticker, price, volume, timestamp) VALUES (?, ?, ?, ?)"
+
+_STOP = object()
+
+
+class TickWriter:
+    """Queue ticks and persist them in batches from a background thread."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path, None] = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        put_timeout: float = 1.0,
+        store: Optional[TickStore] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._flushes = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def start(self) -> "TickWriter":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tick-writer", daemon=True)
+                self._thread.start()
+        return self
+
+    def put(
+        self,
+        ticker: str,
+        price: Optional[float],
+        volume: Optional[float] = 0,
+        timestamp: Optional[int] = None,
+    ) -> bool:
+        """Queue one tick; return ``False`` if it was dropped because the queue is full."""
+
+        self.start()
+        try:
+            self._queue.put((ticker, price, volume, timestamp), timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Block until every tick queued so far has been written."""
+
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Write the remaining ticks and stop the writer thread."""
+
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "written": self._written,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "flushes": self._flushes,
+                "last_flush_ms": self._last_flush_ms,
+                "max_flush_ms": self._max_flush_ms,
+                "avg_flush_ms": self._total_flush_ms / self._flushes if self._flushes else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        with connection(self.db_path) as conn:
+            conn.execute(CREATE_TICKS_SQL)
+            ensure_index(conn, "ticks")
+
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch: List[Tick] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: List[Tick]) -> None:
+        start = time.perf_counter()
+        try:
+            with connection(self.db_path) as conn:
+                conn.executemany(INSERT_TICK_SQL, batch)
+        except Exception as exc:
+            with self._lock:
+                self._errors += 1
+            print(f"[tick-writer] failed to write {len(batch)} ticks: {exc}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._written += len(batch)
+            self._flushes += 1
+            self._last_flush_ms = elapsed
+            self._max_flush_ms = max(self._max_flush_ms, elapsed)
+            self._total_flush_ms += elapsed
+        if self.store is not None:
+            self._append_to_store(batch)
+
+    def _append_to_store(self, batch: List[Tick]) -> None:
+        by_ticker: Dict[str, List[dict]] = defaultdict(list)
+        for ticker, price, volume, ts in batch:
+            by_ticker[ticker].append({"timestamp": ts, "c": price, "v": volume})
+        for ticker, rows in by_ticker.items():
+            try:
+                self.store.append(ticker, rows)
+            except Exception as exc:
+                print(f"[tick-writer] failed to store ticks for {ticker}: {exc}")
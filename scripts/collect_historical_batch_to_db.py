@@ -186,8 +186,7 @@ def main() -> None:
             (ticker,),
         ).fetchone()[0]
         update_completeness(conn, ticker, hist_rows, intra_rows)
-
-        time.sleep(1.5)  # Évite le rate limiting Yahoo
+        # Provider pacing is handled by utils.rate_limiter inside the fetchers
 
     conn.commit()
     conn.close()
@@ -7,6 +7,7 @@ import os
 import sys
 
 from core.db import DB_PATH
+from core.latest_quote import ensure_latest_quote
 
 # Ensure UTF-8 console output for emoji support
 sys.stdout.reconfigure(encoding="utf-8")
@@ -51,6 +52,7 @@ def ensure_db_exists():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        ensure_latest_quote(conn)
         conn.commit()
 
 def get_watchlist_tickers():
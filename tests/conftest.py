@@ -1,10 +1,17 @@
 import os
 import shutil
+import sys
 from pathlib import Path
 
 import pytest
 
 
+def _close_pooled_connections():
+    sqlite_pool = sys.modules.get("core.sqlite_pool")
+    if sqlite_pool is not None:
+        sqlite_pool.reset()
+
+
 @pytest.fixture
 def tmp_trades_db(tmp_path):
     orig = Path('data/trades.db')
@@ -14,5 +21,22 @@ def tmp_trades_db(tmp_path):
         shutil.copy(orig, backup)
     db_file = tmp_path / 'trades.db'
     yield db_file
+    _close_pooled_connections()
     if backup and orig.exists():
         shutil.copy(backup, orig)
+
+
+@pytest.fixture(autouse=True)
+def _reset_bar_store():
+    """Keep cached bars from leaking between tests that mock yfinance."""
+    yield
+    indicateurs = sys.modules.get("data.indicateurs")
+    if indicateurs is not None:
+        indicateurs.BAR_STORE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_sqlite_pool():
+    """Do not reuse a pooled connection opened on another test's database."""
+    yield
+    _close_pooled_connections()
@@ -31,3 +31,37 @@ def test_run_backtest(monkeypatch, tmp_path):
     assert not df.empty
     assert output.exists()
 
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        return [[1 - x[0] / 10, x[0] / 10] for x in X]
+
+
+def test_run_backtest_scores_all_tickers_in_one_call(monkeypatch, tmp_path):
+    df_sample = pd.DataFrame({
+        "timestamp": [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')],
+        "close": [1.0, 1.1],
+    })
+    model = CountingModel()
+    tickers = [f"T{i}" for i in range(20)]
+    monkeypatch.setattr(
+        'backtest.ai_backtest_runner._load_data',
+        lambda t, *a, **k: pd.DataFrame() if t == "T3" else df_sample,
+    )
+    monkeypatch.setattr(
+        'backtest.ai_backtest_runner.load_model_by_version',
+        lambda v: model,
+    )
+    monkeypatch.setattr(
+        'backtest.ai_backtest_runner.analyser_ticker',
+        lambda t, return_features=False: [int(t[1:]) % 10, 1],
+    )
+    df = run_backtest(tickers, '2024-01-01', '2024-01-02', 'dummy', tmp_path / 'r.csv', workers=4)
+    assert model.calls == [19]
+    assert df["ticker"].tolist() == [t for t in tickers if t != "T3"]
+    assert df.set_index("ticker").loc["T17", "ai_score"] == 70.0
@@ -29,3 +29,119 @@ def test_load_model_by_version_predictions():
     pred1 = model.predict([[1]])[0]
     assert pred0 == 0
     assert pred1 == 1
+
+
+def test_compute_global_score_batch_matches_scalar():
+    import math
+
+    import numpy as np
+    import pandas as pd
+
+    from intelligence.ai_scorer import compute_global_score_batch
+
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame(
+        {
+            "score": rng.uniform(-5, 15, n),
+            "score_gpt": rng.uniform(-5, 15, n),
+            "percent_gain": rng.uniform(-40, 40, n),
+            "volume": rng.choice([0, 10, 5e5, 3e9], n) * rng.uniform(0, 2, n),
+            "float_shares": rng.choice([0, 1e6, 2e9], n) * rng.uniform(0, 2, n),
+            "sentiment": rng.choice(["positif", "NEGATIF", "NA", "neutre"], n),
+        }
+    )
+    # values coming out of LEFT JOINs and dirty columns
+    df.loc[0, "percent_gain"] = np.nan
+    df.loc[1, "volume"] = np.nan
+    df["score_gpt"] = df["score_gpt"].astype(object)
+    df.loc[2, "score_gpt"] = None
+    df.loc[3, "score_gpt"] = "n/a"
+    df.loc[4, "sentiment"] = None
+
+    expected = [
+        compute_global_score(
+            r.get("score"),
+            r.get("score_gpt"),
+            r.get("percent_gain"),
+            r.get("volume"),
+            r.get("float_shares"),
+            r.get("sentiment"),
+        )
+        for _, r in df.iterrows()
+    ]
+    result = compute_global_score_batch(df)
+
+    assert list(result.index) == list(df.index)
+    assert math.isnan(result.iloc[0]) and math.isnan(expected[0])
+    assert result.iloc[1:].tolist() == expected[1:]
+
+
+def test_compute_global_score_batch_missing_columns():
+    import pandas as pd
+
+    from intelligence.ai_scorer import compute_global_score_batch
+
+    df = pd.DataFrame({"score_ai": [5.0, 8.0], "sentiment": ["positif", "negatif"]})
+    result = compute_global_score_batch(df, score_ai_col="score_ai", pct_col=None)
+    assert result.tolist() == [
+        compute_global_score(5.0, None, 0, 0, None, "positif"),
+        compute_global_score(8.0, None, 0, 0, None, "negatif"),
+    ]
+
+
+def test_get_rules_cached_until_meta_changes(tmp_path, monkeypatch):
+    import json
+    import os
+
+    from intelligence import ai_scorer
+
+    meta_path = tmp_path / "meta_ia.json"
+    meta_path.write_text(json.dumps({"weights": {"volume": 2.0}}))
+    monkeypatch.setattr(ai_scorer, "_META_PATH", str(meta_path))
+    loads = []
+    real_load = ai_scorer.load_meta
+    monkeypatch.setattr(ai_scorer, "load_meta", lambda p: loads.append(p) or real_load(p))
+    ai_scorer.reload_rules()
+
+    assert ai_scorer._get_rules()["volume"] == 2.0
+    for _ in range(50):
+        score_ai({"volume": 1})
+    assert len(loads) == 1
+
+    meta_path.write_text(json.dumps({"weights": {"volume": 3.0}}))
+    st = os.stat(meta_path)
+    os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert ai_scorer._get_rules()["volume"] == 3.0
+    assert len(loads) == 2
+
+    ai_scorer.reload_rules()
+    ai_scorer._get_rules()
+    assert len(loads) == 3
+    ai_scorer.reload_rules()
+
+
+def test_get_rules_disabled_signals_without_writes(tmp_path, monkeypatch):
+    import json
+
+    from intelligence import ai_scorer
+
+    meta_path = tmp_path / "meta_ia.json"
+    meta = {
+        "weights": {"volume": 2.0, "float_shares": 1.0},
+        "disabled_signals": {"volume": {"until": "2999-01-01"}, "float_shares": {"until": "2000-01-01"}},
+    }
+    meta_path.write_text(json.dumps(meta))
+    monkeypatch.setattr(ai_scorer, "_META_PATH", str(meta_path))
+    ai_scorer.reload_rules()
+    before = meta_path.stat().st_mtime_ns
+
+    rules = ai_scorer._get_rules()
+    assert rules["volume"] == 0
+    assert rules["float_shares"] == 1.0
+    # the returned dict is a copy of the snapshot
+    rules["volume"] = 42
+    assert ai_scorer._get_rules()["volume"] == 0
+    assert meta_path.stat().st_mtime_ns == before
+    assert json.loads(meta_path.read_text()) == meta
+    ai_scorer.reload_rules()
@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+pd = pytest.importorskip("pandas")
+
+from caching.bar_store import BarStore
+
+
+def _frame(days=3, per_day=5):
+    stamps = [
+        pd.Timestamp("2024-01-01 14:30") + pd.Timedelta(days=d, minutes=m)
+        for d in range(days)
+        for m in range(per_day)
+    ]
+    return pd.DataFrame({"Datetime": stamps, "Close": range(len(stamps))})
+
+
+def test_widened_fetch_serves_shorter_periods():
+    calls = []
+
+    def loader(ticker, period, interval):
+        calls.append((ticker, period, interval))
+        return _frame()
+
+    store = BarStore(loader, ttl=60, fetch_periods={"1m": "7d"})
+    assert len(store.get("aaa", "1d", "1m")) == 5
+    assert len(store.get("AAA", "2d", "1m")) == 10
+    assert len(store.get("AAA", "7d", "1m")) == 15
+    assert calls == [("AAA", "7d", "1m")]
+    assert store.hits == 2
+
+
+def test_ttl_expiry_and_lru_eviction():
+    calls = []
+
+    def loader(ticker, period, interval):
+        calls.append(ticker)
+        return _frame(days=1)
+
+    store = BarStore(loader, ttl=0.05, maxsize=2)
+    store.get("AAA")
+    store.get("BBB")
+    store.get("AAA")
+    store.get("CCC")
+    assert len(store) == 2
+    store.get("BBB")
+    assert calls == ["AAA", "BBB", "CCC", "BBB"]
+    time.sleep(0.06)
+    store.get("BBB")
+    assert calls[-1] == "BBB" and len(calls) == 5
+
+
+def test_concurrent_callers_share_one_download():
+    calls = []
+    release = threading.Event()
+
+    def loader(ticker, period, interval):
+        calls.append(ticker)
+        release.wait(1)
+        return _frame(days=1)
+
+    store = BarStore(loader, ttl=60)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.get("AAA")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+    assert calls == ["AAA"]
+    assert len(results) == 8 and all(len(r) == 5 for r in results)
+
+
+def test_failed_loads_are_not_cached():
+    results = [RuntimeError("network"), pd.DataFrame(), _frame(days=1)]
+
+    def loader(ticker, period, interval):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    store = BarStore(loader, ttl=60)
+    assert store.get("AAA").empty
+    assert store.get("AAA").empty
+    assert len(store.get("AAA")) == 5
+    assert len(store) == 1
+
+
+def test_waiters_released_when_loader_raises_base_exception():
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader(ticker, period, interval):
+        started.set()
+        release.wait(1)
+        raise KeyboardInterrupt
+
+    store = BarStore(loader, ttl=60)
+    owner_error = []
+
+    def owner():
+        try:
+            store.get("AAA")
+        except KeyboardInterrupt as exc:
+            owner_error.append(exc)
+
+    results = []
+    t_owner = threading.Thread(target=owner)
+    t_owner.start()
+    started.wait(1)
+    waiter = threading.Thread(target=lambda: results.append(store.get("AAA")))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    t_owner.join(2)
+    waiter.join(2)
+    assert not waiter.is_alive()
+    assert owner_error and results[0].empty
+    assert len(store) == 0
+
+
+def test_indicator_getters_share_one_intraday_download(monkeypatch):
+    indicateurs = pytest.importorskip("data.indicateurs")
+    calls = []
+    frame = _frame(days=3, per_day=40).rename(columns={"Datetime": "Date"})
+    frame = frame.assign(Volume=1000, High=frame["Close"] + 1, Low=frame["Close"] - 1)
+
+    def download(ticker, period, interval, progress=False):
+        calls.append((period, interval))
+        return frame.set_index("Date")
+
+    monkeypatch.setattr(indicateurs.yf, "download", download)
+    indicateurs.get_rsi("AAA")
+    indicateurs.get_ema("AAA")
+    indicateurs.get_vwap("AAA")
+    indicateurs.get_macd("AAA")
+    indicateurs.get_last_price("AAA")
+    indicateurs.get_atr("AAA")
+    assert calls == [("7d", "1m"), ("2mo", "1d")]
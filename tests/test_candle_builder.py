@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import realtime.build_intraday_candles as candles_mod
+from realtime.candle_builder import BarStorage, CandleAggregator
+
+BASE = 1_714_564_800  # 2024-05-01 12:00:00 UTC, a 5-minute boundary
+
+
+def test_bars_close_on_next_window():
+    agg = CandleAggregator(intervals=(60, 300))
+    closed = []
+    agg.subscribe(lambda t, i, b: closed.append((t, i, b)))
+
+    agg.on_tick("abc", 1.0, 10, BASE)
+    agg.on_tick("ABC", 1.5, 5, BASE + 20)
+    agg.on_tick("ABC", 0.9, 5, BASE + 40)
+    assert agg.current("ABC", "1min") == {"timestamp": BASE, "o": 1.0, "h": 1.5, "l": 0.9, "c": 0.9, "v": 20.0}
+    assert closed == []
+
+    agg.on_tick("ABC", 2.0, 1, BASE + 61)
+    assert closed == [("ABC", 60, {"timestamp": BASE, "o": 1.0, "h": 1.5, "l": 0.9, "c": 0.9, "v": 20.0})]
+    five = agg.current("ABC", "5min")
+    assert (five["o"], five["h"], five["c"], five["v"]) == (1.0, 2.0, 2.0, 21.0)
+
+    frame = agg.candles("ABC", 60)
+    assert list(frame["c"]) == [0.9, 2.0]
+    assert frame["timestamp"].iloc[0] == pd.Timestamp(BASE, unit="s")
+
+
+def test_late_ticks_ignored_and_roll_closes_quiet_bars():
+    agg = CandleAggregator(intervals=(60,))
+    agg.on_tick("ABC", 1.0, 1, BASE + 70)
+    agg.on_tick("ABC", 5.0, 1, BASE + 10)
+    assert agg.current("ABC")["h"] == 1.0
+
+    assert agg.roll(now=BASE + 100) == []
+    closed = agg.roll(now=BASE + 120)
+    assert [b["timestamp"] for _, _, b in closed] == [BASE + 60]
+    assert agg.current("ABC") is None
+    assert len(agg.bars("ABC")) == 1
+
+
+def test_failing_subscriber_does_not_break_others():
+    agg = CandleAggregator(intervals=(60,))
+    seen = []
+    agg.subscribe(lambda *a: 1 / 0)
+    unsubscribe = agg.subscribe(lambda *a: seen.append(a))
+    agg.on_tick("ABC", 1.0, 1, BASE)
+    agg.on_tick("ABC", 1.0, 1, BASE + 60)
+    assert len(seen) == 1
+    unsubscribe()
+    agg.on_tick("ABC", 1.0, 1, BASE + 120)
+    assert len(seen) == 1
+
+
+def test_build_candles_uses_streamed_bars(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    agg = CandleAggregator(intervals=(60, 300))
+    storage = BarStorage(str(tmp_path), flush_size=1)
+    agg.subscribe(storage)
+    monkeypatch.setattr(candles_mod, "get_candle_aggregator", lambda: agg)
+    monkeypatch.setattr(candles_mod, "get_bar_storage", lambda: storage)
+
+    now = int(pd.Timestamp.now().floor("min").value // 10**9)
+    agg.on_tick("ABC", 1.0, 10, now - 60)
+    agg.on_tick("ABC", 2.0, 5, now)  # closes and stores the previous bar
+    storage.flush()
+
+    assert len(storage.store(60).read("ABC")) == 1
+    candles = candles_mod.build_candles("ABC")
+    assert list(candles["c"]) == [1.0, 2.0]
+    assert list(candles["v"]) == [10.0, 5.0]
+
+
+def test_bar_storage_writes_off_the_tick_thread(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    storage = BarStorage(str(tmp_path), flush_size=1)
+    written = []
+    release = threading.Event()
+
+    def slow_append(ticker, bars):
+        release.wait(5)
+        written.append((ticker, len(bars)))
+
+    monkeypatch.setattr(storage.store(60), "append", slow_append)
+    start = time.monotonic()
+    storage("ABC", 60, {"timestamp": 0, "o": 1.0, "h": 1.0, "l": 1.0, "c": 1.0, "v": 1.0})
+    assert time.monotonic() - start < 0.5
+    release.set()
+    storage.flush()
+    assert written == [("ABC", 1)]
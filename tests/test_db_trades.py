@@ -6,15 +6,6 @@ from db import trades
 def test_enregistrer_trade_ia(tmp_trades_db, monkeypatch):
     db_file = tmp_trades_db
 
-    real_connect = sqlite3.connect
-
-    class DummySqlite:
-        def connect(self, path):
-            path_str = str(path)
-            assert path_str.endswith("trades.db")
-            return real_connect(db_file)
-
-    monkeypatch.setattr(trades, "sqlite3", DummySqlite())
     monkeypatch.setattr(trades, "DB_PATH", str(db_file), raising=False)
     monkeypatch.setattr("core.db.DB_PATH", str(db_file), raising=False)
 
@@ -40,15 +31,6 @@ def test_enregistrer_trade_ia(tmp_trades_db, monkeypatch):
 def test_enregistrer_exit_partielle(tmp_trades_db, monkeypatch):
     db_file = tmp_trades_db
 
-    real_connect = sqlite3.connect
-
-    class DummySqlite:
-        def connect(self, path):
-            path_str = str(path)
-            assert path_str.endswith("trades.db")
-            return real_connect(db_file)
-
-    monkeypatch.setattr(trades, "sqlite3", DummySqlite())
     monkeypatch.setattr(trades, "DB_PATH", str(db_file), raising=False)
     monkeypatch.setattr("core.db.DB_PATH", str(db_file), raising=False)
 
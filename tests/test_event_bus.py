@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.event_bus import BLOCK, DROP_NEWEST, DROP_OLDEST, EventBus
+
+
+def test_topic_patterns_route_events():
+    bus = EventBus()
+    ticks = bus.subscribe("tick.*")
+    aapl = bus.subscribe("*.AAPL")
+    bars = bus.subscribe("bar.1m.*")
+
+    assert bus.publish("tick.AAPL", {"price": 1}) == 2
+    assert bus.publish("tick.TSLA", {"price": 2}) == 1
+    assert bus.publish("bar.1m.AAPL", {"c": 3}) == 2
+    assert bus.publish("signal.pump.NVDA", {}) == 0
+
+    assert [e.topic for e in ticks.drain()] == ["tick.AAPL", "tick.TSLA"]
+    assert [e.topic for e in aapl.drain()] == ["tick.AAPL", "bar.1m.AAPL"]
+    assert bars.get(timeout=0).payload == {"c": 3}
+    assert bars.get(timeout=0) is None
+
+    ticks.close()
+    assert bus.publish("tick.AAPL", {}) == 1
+
+
+@pytest.mark.parametrize(
+    "policy, kept, delivered",
+    [(DROP_OLDEST, [2, 3, 4], 5), (DROP_NEWEST, [0, 1, 2], 3), (BLOCK, [0, 1, 2], 3)],
+)
+def test_backpressure_policies(policy, kept, delivered):
+    bus = EventBus()
+    sub = bus.subscribe("tick.*", maxsize=3, policy=policy, block_timeout=0.01)
+    for i in range(5):
+        bus.publish("tick.X", i)
+    assert [e.payload for e in sub.drain()] == kept
+    assert bus.stats() == [{"pattern": "tick.*", "queued": 0, "delivered": delivered, "dropped": 2}]
+
+
+def test_block_policy_waits_for_consumer():
+    bus = EventBus()
+    sub = bus.subscribe("t", maxsize=1, policy=BLOCK, block_timeout=5)
+    bus.publish("t", 1)
+    threading.Timer(0.05, sub.get).start()
+    start = time.monotonic()
+    assert bus.publish("t", 2) == 1
+    assert time.monotonic() - start < 4
+    assert sub.get(timeout=1).payload == 2
+    assert sub.dropped == 0
+
+
+def test_async_consumer_is_woken_by_thread_publisher():
+    bus = EventBus()
+    sub = bus.subscribe("tick.*")
+
+    async def consume():
+        received = []
+        threading.Timer(0.02, lambda: [bus.publish("tick.A", i) for i in range(3)]).start()
+        threading.Timer(0.2, sub.close).start()
+        async for event in sub:
+            received.append(event.payload)
+        return received
+
+    assert asyncio.run(asyncio.wait_for(consume(), 5)) == [0, 1, 2]
+
+
+def test_consume_runs_handler_on_thread():
+    bus = EventBus()
+    seen = []
+    done = threading.Event()
+
+    def handler(event):
+        seen.append(event.payload)
+        if len(seen) == 2:
+            done.set()
+
+    sub = bus.consume("bar.*", handler)
+    bus.publish("bar.1m.A", 1)
+    bus.publish("bar.5m.A", 2)
+    assert done.wait(2)
+    sub.close()
+    assert seen == [1, 2]
+
+
+def test_pump_monitor_publishes_signal():
+    movers = pytest.importorskip("movers_detector")
+    bus = EventBus()
+    signals = bus.subscribe("signal.pump.*")
+    monitor = movers.PumpMonitor(bus, threshold=1.5, cooldown=60)
+    now = time.time()
+
+    from core.event_bus import Event
+
+    monitor.on_tick(Event("tick.PMP", {"price": 10.0, "ts": now - 30}))
+    assert signals.get(timeout=0) is None
+    monitor.on_tick(Event("tick.PMP", {"price": 10.2, "ts": now}))
+    event = signals.get(timeout=0)
+    assert event.topic == "signal.pump.PMP"
+    assert event.payload["pump_pct"] == 2.0
+    # cooldown: no second signal right away
+    monitor.on_tick(Event("tick.PMP", {"price": 10.3, "ts": now}))
+    assert signals.get(timeout=0) is None
+    assert movers.latest_ticks.latest("PMP").extra["pump_pct_60s"] == 3.0
+
+
+def test_pump_monitor_keeps_recent_signals():
+    movers = pytest.importorskip("movers_detector")
+    from core.event_bus import Event
+
+    bus = EventBus()
+    monitor = movers.PumpMonitor(bus, threshold=1.5, cooldown=60)
+    now = time.time()
+    monitor.on_tick(Event("tick.RCT", {"price": 10.0, "ts": now - 30}))
+    monitor.on_tick(Event("tick.RCT", {"price": 10.5, "ts": now}))
+    assert monitor.recent_signals(300)["RCT"]["pump_pct"] == 5.0
+    assert monitor.recent_signals(0) == {}
+    assert bus.stats() == []  # no subscription is left behind
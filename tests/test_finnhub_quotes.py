@@ -0,0 +1,50 @@
+import pytest
+pd = pytest.importorskip("pandas")
+
+from utils import utils_finnhub as mod
+
+
+@pytest.fixture
+def fake_sweep(monkeypatch):
+    requested = []
+
+    def fetch(urls, **kw):
+        requested.append([u.split("symbol=")[1].split("&")[0] for u in urls])
+        out = []
+        for u in urls:
+            sym = u.split("symbol=")[1].split("&")[0]
+            out.append(RuntimeError("boom") if sym == "BAD" else {"c": float(len(sym)), "pc": 1.0})
+        return out
+
+    monkeypatch.setattr(mod, "FINNHUB_API_KEY", "test-key")
+    monkeypatch.setattr(mod, "fetch_many_sync", fetch)
+    mod._quote_cache.clear()
+    yield requested
+    mod._quote_cache.clear()
+
+
+def test_partial_cache_hits_only_fetch_new_symbols(fake_sweep):
+    first = mod.fetch_quotes_batch(["AA", "BBB"])
+    second = mod.fetch_quotes_batch(["aa", "BBB", "CCCC"])
+    assert fake_sweep == [["AA", "BBB"], ["CCCC"]]
+    df = pd.DataFrame(second)
+    assert list(df["symbol"]) == ["AA", "BBB", "CCCC"]
+    assert list(df["c"]) == [2.0, 3.0, 4.0]
+    assert first["symbol"] == ["AA", "BBB"]
+
+
+def test_failed_symbols_are_retried_and_padded(fake_sweep):
+    res = mod.fetch_quotes_batch(["BAD", "OK"])
+    assert list(res) == ["symbol", *mod.QUOTE_FIELDS]
+    df = pd.DataFrame(res)
+    assert df["c"].isna().tolist() == [True, False]
+    assert df.loc[1, ["c", "pc"]].tolist() == [2.0, 1.0]
+    mod.fetch_quotes_batch(["BAD", "OK"])
+    assert fake_sweep == [["BAD", "OK"], ["BAD"]]
+
+
+def test_all_failed_batch_keeps_quote_columns(fake_sweep):
+    df = pd.DataFrame(mod.fetch_quotes_batch(["BAD"]))
+    assert list(df.columns) == ["symbol", *mod.QUOTE_FIELDS]
+    assert df["c"].isna().all()
+    assert df[df["c"].astype(float) > 1.0].empty
@@ -0,0 +1,94 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api import http_async
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = set()
+
+    def do_GET(self):
+        type(self).peers.add(self.client_address)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.peers = set()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    http_async.close()
+
+
+def test_sync_sweeps_reuse_warm_connection(server):
+    first = http_async.fetch_many_sync([f"{server}/a"], concurrency=1)
+    client = http_async._client
+    second = http_async.fetch_many_sync([f"{server}/b"], concurrency=1)
+    assert first == [{"path": "/a"}]
+    assert second == [{"path": "/b"}]
+    assert http_async._client is client
+    assert len(_Handler.peers) == 1
+
+
+def test_fetch_many_from_foreign_loop(server):
+    import asyncio
+
+    res = asyncio.run(http_async.fetch_many([f"{server}/x", f"{server}/y"]))
+    assert res == [{"path": "/x"}, {"path": "/y"}]
+
+
+def test_close_leaves_a_stuck_loop_open(monkeypatch):
+    import time
+
+    monkeypatch.setattr(http_async, "CLOSE_TIMEOUT", 0.05)
+    loop = http_async._ensure_loop()
+    release = threading.Event()
+    loop.call_soon_threadsafe(lambda: release.wait(2))
+    time.sleep(0.02)
+
+    http_async.close()  # must not raise "Cannot close a running event loop"
+    assert not loop.is_closed()
+    release.set()
+    time.sleep(0.1)
+    assert not loop.is_running()
+
+
+def test_drained_bucket_fails_fast_instead_of_blocking(server, monkeypatch):
+    import time
+
+    from utils import rate_limiter
+
+    monkeypatch.setattr(http_async, "FALLBACK_MAX_WAIT", 0.05)
+    monkeypatch.setitem(rate_limiter._limiters, "drained", rate_limiter.TokenBucket(1 / 3600, 1))
+    rate_limiter.get_limiter("drained").backoff(3600)
+    start = time.perf_counter()
+    res = http_async.fetch_many_sync([f"{server}/a"], rate_limit="drained")
+    assert isinstance(res[0], http_async.RateLimited)
+    assert time.perf_counter() - start < 1.0
+    assert _Handler.peers == set()
+
+
+def test_retry_after_accepts_delay_and_http_date():
+    from email.utils import format_datetime
+    from datetime import datetime, timedelta, timezone
+
+    assert http_async._retry_after("7") == 7.0
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= http_async._retry_after(when) <= 30
+    assert http_async._retry_after("soon") == 1.0
+    assert http_async._retry_after(None) == 1.0
@@ -0,0 +1,62 @@
+import pytest
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+from data.indicator_engine import compute_indicators, indicators_for
+
+
+def _bars(ticker, n, seed):
+    rng = np.random.default_rng(seed)
+    close = 10 + np.cumsum(rng.normal(0, 0.1, n))
+    return pd.DataFrame({
+        "ticker": ticker,
+        "timestamp": pd.date_range("2024-01-02 09:30", periods=n, freq="min"),
+        "open": close,
+        "high": close + 0.05,
+        "low": close - 0.05,
+        "close": close,
+        "volume": rng.integers(1, 10_000, n),
+    })
+
+
+def _reference(df):
+    close = df["close"].astype(float)
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14, min_periods=14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14, min_periods=14).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    prev = close.shift(1)
+    tr = pd.concat(
+        [df["high"] - df["low"], (df["high"] - prev).abs(), (df["low"] - prev).abs()], axis=1
+    ).max(axis=1)
+    return {
+        "rsi": (100 - 100 / (1 + gain / loss)).iloc[-1],
+        "ema9": close.ewm(span=9, adjust=False).mean().iloc[-1],
+        "ema21": close.ewm(span=21, adjust=False).mean().iloc[-1],
+        "macd": macd.iloc[-1],
+        "macd_signal": macd.ewm(span=9, adjust=False).mean().iloc[-1],
+        "vwap": ((df["close"] * df["volume"]).cumsum() / df["volume"].cumsum()).iloc[-1],
+        "volume_avg": df["volume"].rolling(50, min_periods=1).mean().iloc[-1],
+        "atr": tr.rolling(14).mean().iloc[-1],
+        "price": close.iloc[-1],
+    }
+
+
+def test_matches_per_ticker_pandas():
+    frames = [_bars("AAA", 120, 1), _bars("BBB", 30, 2), _bars("CCC", 8, 3)]
+    long = pd.concat(frames).sample(frac=1, random_state=0)
+    result = compute_indicators(long)
+    assert list(result.index) == ["AAA", "BBB", "CCC"]
+    for frame in frames:
+        row = result.loc[frame["ticker"].iloc[0]]
+        for key, expected in _reference(frame).items():
+            assert row[key] == pytest.approx(expected, nan_ok=True), key
+
+
+def test_short_history_and_single_ticker_helper():
+    result = compute_indicators(_bars("AAA", 8, 3))
+    assert np.isnan(result.loc["AAA", "rsi"])
+    assert np.isnan(result.loc["AAA", "atr"])
+    single = indicators_for(_bars("AAA", 40, 4).rename(columns=str.capitalize))
+    assert single["price"] == pytest.approx(_reference(_bars("AAA", 40, 4))["price"])
+    assert indicators_for(pd.DataFrame()) is None
@@ -34,7 +34,7 @@ def test_intraday_concurrent(monkeypatch):
         ("c", slow("c")),
     ])
     start = time.perf_counter()
-    asyncio.run(mod.fetch_intraday_data_async("TSLA"))
+    asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=0))
     elapsed = time.perf_counter() - start
     assert elapsed < 0.15
     assert set(calls) == {"a", "b", "c"}
@@ -49,3 +49,107 @@ def test_sync_wrapper(monkeypatch):
     monkeypatch.setattr(mod, "ASYNC_SOURCES", [("x", good)])
     df = mod.fetch_intraday_data("TSLA")
     assert isinstance(df, pd.DataFrame)
+
+
+def _timed(name, delay, result, calls):
+    async def _f(t, s):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return result
+    return _f
+
+
+def test_hedged_fetch_skips_backup_when_primary_is_fast(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+    calls = []
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [
+        ("fast", _timed("fast", 0.01, sample, calls)),
+        ("backup", _timed("backup", 0.01, sample, calls)),
+    ])
+    df = asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=0.2))
+    assert df is sample
+    assert calls == ["fast"]
+
+
+def test_hedged_fetch_fires_backup_after_delay(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+    calls = []
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [
+        ("slow", _timed("slow", 1.0, sample, calls)),
+        ("backup", _timed("backup", 0.01, sample, calls)),
+    ])
+    start = time.perf_counter()
+    df = asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=0.05))
+    assert df is sample
+    assert calls == ["slow", "backup"]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_provider_stats_reorder_sources(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+    calls = []
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [
+        ("broken", _timed("broken", 0.0, None, calls)),
+        ("good", _timed("good", 0.01, sample, calls)),
+    ])
+    for _ in range(mod.STATS_MIN_SAMPLES):
+        asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=1.0))
+    assert [name for name, _ in mod._ordered_sources()] == ["good", "broken"]
+    assert mod.provider_stats()["broken"]["error_rate"] == 1.0
+
+
+def test_sync_wrapper_does_not_wait_for_losing_providers(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+
+    async def fast(t, s):
+        return await mod._run_blocking(lambda: sample)
+
+    async def slow(t, s):
+        return await mod._run_blocking(time.sleep, 1.0)
+
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [("slow", slow), ("fast", fast)])
+    start = time.perf_counter()
+    df = mod.fetch_intraday_data("TSLA", hedge_delay=0)
+    assert df is sample
+    assert time.perf_counter() - start < 0.5
+
+
+def test_providers_without_key_are_skipped(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+    calls = []
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "PROVIDER_KEYS", {"paid": None, "keyed": "k"})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [
+        ("paid", _timed("paid", 0.0, sample, calls)),
+        ("keyed", _timed("keyed", 0.0, None, calls)),
+        ("free", _timed("free", 0.0, sample, calls)),
+    ])
+    assert asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=0)) is sample
+    assert calls == ["keyed", "free"]
+
+
+def test_untried_providers_rank_after_healthy_ones(monkeypatch):
+    sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
+    calls = []
+    monkeypatch.setattr(mod, "_provider_stats", {})
+    monkeypatch.setattr(mod, "ASYNC_SOURCES", [
+        ("quota", _timed("quota", 0.5, sample, calls)),
+        ("primary", _timed("primary", 0.01, sample, calls)),
+    ])
+    primary = mod._provider_stats["primary"] = mod.ProviderStats()
+    for _ in range(mod.STATS_MIN_SAMPLES):
+        primary.record(0.01, True)
+    # the cancelled hedge loser never gets a sample but must stay behind
+    for _ in range(3):
+        asyncio.run(mod.fetch_intraday_data_async("TSLA", hedge_delay=0.2))
+    assert calls == ["primary"] * 3
+    assert [name for name, _ in mod._ordered_sources()] == ["primary", "quota"]
+
+    # a primary that keeps failing lets the untried backup go first
+    for _ in range(5):
+        primary.record(0.01, False)
+    assert [name for name, _ in mod._ordered_sources()] == ["quota", "primary"]
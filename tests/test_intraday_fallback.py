@@ -12,6 +12,8 @@ def test_intraday_fallback(monkeypatch):
     sample = pd.DataFrame({"timestamp": [pd.Timestamp("2024-01-01")], "close": [1.0]})
     monkeypatch.setattr(mod, "fetch_from_polygon", lambda t: sample)
     monkeypatch.setattr(mod, "SOURCES", [("Polygon", mod.fetch_from_polygon)])
+    # providers without an API key are skipped
+    monkeypatch.setitem(mod.PROVIDER_KEYS, "Polygon", "key")
     df = mod.fetch_intraday_data("TSLA")
     assert df is not None
     assert not df.empty
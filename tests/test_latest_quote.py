@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from core.latest_quote import ensure_latest_quote
+
+SMART_DDL = """
+CREATE TABLE intraday_smart (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, ticker TEXT NOT NULL, price REAL, change_val REAL,
+    change_percent REAL, volume INTEGER, high REAL, low REAL, source TEXT, timestamp TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _insert(conn, ticker, price, ts):
+    conn.execute(
+        "INSERT INTO intraday_smart (ticker, price, change_percent, volume, timestamp) VALUES (?, ?, ?, ?, ?)",
+        (ticker, price, price / 10, int(price * 100), ts),
+    )
+
+
+def _latest(conn):
+    return dict(conn.execute("SELECT ticker, price FROM latest_quote").fetchall())
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(SMART_DDL)
+    yield conn
+    conn.close()
+
+
+def test_backfill_then_trigger(conn):
+    _insert(conn, "AAA", 1.0, "2024-01-01 10:00:00")
+    _insert(conn, "AAA", 2.0, "2024-01-01 10:05:00")
+    _insert(conn, "BBB", 5.0, "2024-01-01 09:00:00")
+    ensure_latest_quote(conn)
+    assert _latest(conn) == {"AAA": 2.0, "BBB": 5.0}
+
+    _insert(conn, "AAA", 3.0, "2024-01-01 10:06:00")
+    _insert(conn, "CCC", 7.0, "2024-01-01 10:06:00")
+    assert _latest(conn) == {"AAA": 3.0, "BBB": 5.0, "CCC": 7.0}
+
+
+def test_older_rows_do_not_overwrite(conn):
+    ensure_latest_quote(conn)
+    _insert(conn, "AAA", 3.0, "2024-01-01 10:06:00")
+    _insert(conn, "AAA", 1.0, "2024-01-01 09:00:00")
+    row = conn.execute("SELECT price, volume, timestamp FROM latest_quote WHERE ticker='AAA'").fetchone()
+    assert row == (3.0, 300, "2024-01-01 10:06:00")
+
+
+def test_trigger_added_once_intraday_smart_exists():
+    conn = sqlite3.connect(":memory:")
+    ensure_latest_quote(conn)
+    conn.execute(SMART_DDL)
+    _insert(conn, "AAA", 1.0, "2024-01-01 10:00:00")
+    assert _latest(conn) == {}
+    ensure_latest_quote(conn)
+    assert _latest(conn) == {"AAA": 1.0}
+    ensure_latest_quote(conn)
+    _insert(conn, "AAA", 2.0, "2024-01-01 10:01:00")
+    assert _latest(conn) == {"AAA": 2.0}
+    conn.close()
+
+
+def test_fetch_watchlist_reads_latest_quote(tmp_path):
+    orchestrator = pytest.importorskip("backend.orchestrator")
+    db_file = tmp_path / "trades.db"
+    conn = sqlite3.connect(db_file)
+    conn.execute(SMART_DDL)
+    conn.execute(
+        "CREATE TABLE watchlist (ticker TEXT, source TEXT, date TEXT, description TEXT, has_fda INTEGER, float_shares REAL, score REAL)"
+    )
+    conn.execute("CREATE TABLE news_score (symbol TEXT PRIMARY KEY, score INTEGER, sentiment TEXT)")
+    conn.execute("INSERT INTO watchlist (ticker, score) VALUES ('AAA', 50)")
+    _insert(conn, "AAA", 1.0, "2024-01-01 10:00:00")
+    _insert(conn, "AAA", 2.0, "2024-01-01 10:05:00")
+    conn.commit()
+    conn.close()
+
+    rows = orchestrator._fetch_watchlist(db_file)
+    assert rows[0]["price"] == 2.0
+    assert rows[0]["percent_gain"] == pytest.approx(0.2)
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from data.latest_ticks import LatestTickStore
+
+
+def test_latest_quote_and_annotations():
+    store = LatestTickStore(depth=4)
+    assert store.latest("AAA") is None
+    store.update("AAA", 1.0, 100, ts=1000.0)
+    store.annotate("AAA", pump_pct_60s=2.5)
+    store.update("AAA", 1.1, 50, ts=1001.0)
+
+    data = store.snapshot("AAA")
+    assert data["price"] == 1.1
+    assert data["ts"] == 1001.0
+    assert data["timestamp"] == "1970-01-01T00:16:41"
+    assert data["pump_pct_60s"] == 2.5
+    assert "AAA" in store and len(store) == 1
+
+
+def test_history_keeps_last_depth_ticks_and_grows():
+    store = LatestTickStore(depth=4, capacity=2)
+    for i in range(10):
+        store.update("AAA", float(i), i, ts=float(i))
+    for sym in ("B", "C", "D", "E"):
+        store.update(sym, 5.0)
+
+    ts, prices, volumes = store.history("AAA")
+    assert prices.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert store.history("AAA", 2)[1].tolist() == [8.0, 9.0]
+    assert store.history("B")[1].tolist() == [5.0]
+    assert store.history("ZZZ")[0].size == 0
+    assert store.symbols() == ["AAA", "B", "C", "D", "E"]
+
+
+def test_history_snapshots_are_consistent_under_writes():
+    store = LatestTickStore(depth=64)
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            # price, volume and timestamp always agree for a given tick
+            store.update("AAA", float(i), float(i), ts=float(i))
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            ts, prices, volumes = store.history("AAA")
+            assert (prices == ts).all() and (volumes == ts).all()
+            assert (np.diff(ts) == 1).all()
+    finally:
+        stop.set()
+        thread.join()
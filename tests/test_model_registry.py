@@ -0,0 +1,91 @@
+import base64
+import os
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from intelligence.model_registry import ModelRegistry, version_from_path
+
+np = pytest.importorskip("numpy")
+joblib = pytest.importorskip("joblib")
+
+
+class ThresholdModel:
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.coef = np.arange(1000, dtype=float)
+
+    def predict(self, X):
+        return [int(x[0] > self.threshold) for x in X]
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_get_caches_until_file_changes(tmp_path):
+    path = tmp_path / "m_v1.pkl"
+    joblib.dump(ThresholdModel(1), path)
+    registry = ModelRegistry(str(tmp_path))
+
+    first = registry.get("m_v1")
+    assert registry.get("m_v1") is first
+    assert registry.loads == 1
+
+    joblib.dump(ThresholdModel(5), path)
+    _bump_mtime(path)
+    second = registry.get("m_v1")
+    assert second is not first
+    assert second.threshold == 5
+    assert registry.loads == 2
+
+
+def test_b64_and_shared_content_hash(tmp_path):
+    payload = pickle.dumps(ThresholdModel(2))
+    (tmp_path / "a.pkl").write_bytes(payload)
+    (tmp_path / "b.pkl.b64").write_bytes(base64.b64encode(payload))
+    (tmp_path / "c.pkl").write_bytes(payload)
+    registry = ModelRegistry(str(tmp_path))
+
+    assert registry.get("b").threshold == 2
+    a = registry.get("a")
+    assert registry.get("c") is a
+    assert registry.loads == 2
+    assert registry.digests()["a"] == registry.digests()["c"]
+
+
+def test_missing_version_and_warm_up(tmp_path):
+    joblib.dump(ThresholdModel(1), tmp_path / "ok.pkl")
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+    registry = ModelRegistry(str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        registry.get("absent")
+    assert registry.warm_up(["ok", "absent", "broken"]) == ["ok"]
+    assert registry.loads == 1
+
+
+def test_mmap_mode_maps_arrays(tmp_path):
+    joblib.dump(ThresholdModel(1), tmp_path / "big.pkl")
+    registry = ModelRegistry(str(tmp_path), mmap_mode="r")
+    model = registry.get("big")
+    assert isinstance(model.coef, np.memmap)
+    assert model.coef[999] == 999
+
+
+def test_refresh_and_codex_handler_hot_swap(tmp_path):
+    cw = pytest.importorskip("automation.codex_watcher")
+    registry = ModelRegistry(str(tmp_path / "models"))
+    new_file = tmp_path / "finrl_v2.pkl"
+    joblib.dump(ThresholdModel(7), new_file)
+    calls = []
+    handler = cw.FinRLModelHandler(lambda data, msg: calls.append((data, msg)), registry)
+
+    handler.on_created(SimpleNamespace(src_path=str(new_file), is_directory=False))
+
+    assert version_from_path(str(new_file)) == "finrl_v2"
+    model = registry.get("finrl_v2")
+    assert calls[0][0] is model
+    assert model.threshold == 7
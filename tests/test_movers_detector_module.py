@@ -1,7 +1,7 @@
 import time
 from movers_detector import update_price, get_pump_pct, get_top_movers
 import prescreen
-from data.stream_data_manager import latest_data
+from data.stream_data_manager import latest_ticks
 
 
 def test_get_top_movers(monkeypatch):
@@ -20,7 +20,7 @@ def test_get_top_movers(monkeypatch):
     assert res
     assert res[0]["ticker"] == "ABC"
     assert res[0]["pump_pct_60s"] >= 1.5
-    assert latest_data["ABC"]["pump_pct_60s"] >= 1.5
+    assert latest_ticks.latest("ABC").extra["pump_pct_60s"] >= 1.5
 
 
 def test_get_top_movers_filtered(monkeypatch):
@@ -37,3 +37,28 @@ def test_get_top_movers_filtered(monkeypatch):
 
     res = get_top_movers(["XYZ"])
     assert res == []
+
+
+def test_get_top_movers_skips_stale_quotes(monkeypatch):
+    now = time.time()
+    update_price("OLD", 100, now - 30)
+    monkeypatch.setattr(
+        "movers_detector.get_latest_data",
+        lambda t: {"price": 150, "volume": 1000, "status": "WARN", "stale": True, "ts": now - 3600},
+    )
+    monkeypatch.setattr("movers_detector.screen_ticker", lambda t: True)
+
+    assert get_top_movers(["OLD"]) == []
+    assert get_pump_pct("OLD") == 0.0
+
+
+def test_price_history_stays_ordered_across_writers():
+    import movers_detector
+
+    now = time.time()
+    update_price("ORD", 100.0, now - 10)
+    update_price("ORD", 103.0, now)  # poll path saw the newest quote first
+    update_price("ORD", 101.0, now - 5)  # monitor delivers an older tick
+    update_price("ORD", 103.0, now)  # same tick from the monitor
+    assert [p for _, p in movers_detector._price_history["ORD"]] == [100.0, 101.0, 103.0]
+    assert round(get_pump_pct("ORD"), 2) == 3.0
@@ -0,0 +1,53 @@
+import pytest
+pd = pytest.importorskip("pandas")
+
+import prescreen
+
+
+def _grouped(frames):
+    return pd.concat(frames, axis=1, keys=list(frames))
+
+
+def _fake_download(calls):
+    daily_idx = pd.date_range("2024-01-02", periods=3, freq="D")
+    minute_idx = pd.DatetimeIndex(
+        ["2024-01-04 08:00", "2024-01-04 09:00", "2024-01-04 10:00"], tz="America/New_York"
+    )
+    daily = {
+        # 10% gap, strong premarket volume -> passes
+        "AAA": pd.DataFrame({"Open": [1, 1, 1.1], "Close": [1, 1, 1.2], "Volume": [100, 100, 100]}, index=daily_idx),
+        # 20% gap -> rejected
+        "BBB": pd.DataFrame({"Open": [1, 1, 1.2], "Close": [1, 1, 1.2], "Volume": [100, 100, 100]}, index=daily_idx),
+        # good gap but weak premarket volume -> rejected
+        "CCC": pd.DataFrame({"Open": [1, 1, 1.1], "Close": [1, 1, 1.2], "Volume": [100, 100, 100]}, index=daily_idx),
+    }
+    minute = {
+        "AAA": pd.DataFrame({"Volume": [150, 100, 9999]}, index=minute_idx),
+        "BBB": pd.DataFrame({"Volume": [500, 500, 0]}, index=minute_idx),
+        "CCC": pd.DataFrame({"Volume": [10, 10, 9999]}, index=minute_idx),
+    }
+
+    def download(tickers, **kwargs):
+        calls.append((tuple(tickers), kwargs["interval"]))
+        source = daily if kwargs["interval"] == "1d" else minute
+        return _grouped({t: source[t] for t in tickers if t in source})
+
+    return download
+
+
+def test_screen_tickers_batches_downloads(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prescreen, "_download", _fake_download(calls))
+    mask = prescreen.screen_tickers(["AAA", "BBB", "CCC", "ZZZ"])
+    assert mask.to_dict() == {"AAA": True, "BBB": False, "CCC": False, "ZZZ": False}
+    assert [c[1] for c in calls] == ["1d", "1m"]
+
+
+def test_screen_ticker_wraps_batch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prescreen, "_download", _fake_download(calls))
+    prescreen.screen_ticker.cache_clear()
+    assert prescreen.screen_ticker("AAA") is True
+    assert prescreen.screen_ticker("AAA") is True
+    assert len(calls) == 2
+    prescreen.screen_ticker.cache_clear()
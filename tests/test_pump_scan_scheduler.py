@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+
+pss = pytest.importorskip("realtime.pump_scan_scheduler")
+
+FLAT = {"c": [10.0] * 15, "v": [1000] * 15}
+HOT = {"c": [10.0, 10.2, 10.0, 10.3, 10.1, 10.4], "v": [1000] * 6}
+
+
+def test_scan_interval_follows_volatility():
+    assert pss.volatility(FLAT) == 0.0
+    assert pss.volatility(HOT) > pss.HOT_VOLATILITY
+    assert pss.volatility({}) == 0.0
+    assert pss.scan_interval(0.0, 5, 300) == 300
+    assert pss.scan_interval(5.0, 5, 300) == 5
+    assert 5 < pss.scan_interval(0.5, 5, 300) < 300
+
+
+def test_due_symbols_most_volatile_first():
+    sched = pss.ScanScheduler(["AAA", "BBB.US", "aaa"], min_interval=1, max_interval=100)
+    assert sched.symbols == ["AAA", "BBB"]
+    assert sched.due(0) == []
+    sched.due(float("inf"))
+    sched.reschedule("AAA", 0.0, now=0)
+    sched.reschedule("BBB", 2.0, now=0)
+    sched.reschedule("CCC", 2.0, now=0)
+    assert sched.due(1) == ["BBB", "CCC"]
+    assert sched.next_due() == 100
+
+
+def test_scheduler_bounds_concurrency_and_rescans_hot_tickers(monkeypatch):
+    monkeypatch.setattr(pss, "is_market_open", lambda: True)
+    running = {"now": 0, "max": 0}
+
+    async def fetch(session, symbol):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return HOT if symbol == "HOT" else FLAT
+
+    symbols = ["HOT"] + [f"Q{i}" for i in range(9)]
+    sched = pss.ScanScheduler(symbols, concurrency=3, min_interval=0.05, max_interval=10, fetch=fetch)
+
+    async def main():
+        task = asyncio.ensure_future(sched.run(None))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert running["max"] == 3
+    assert sched.scans["HOT"] >= 4
+    assert all(sched.scans[f"Q{i}"] == 1 for i in range(9))
+    assert sched.stats()["symbols"] == 10
+
+
+def test_full_analysis_scores_off_the_event_loop(monkeypatch):
+    threads = []
+    sent = []
+
+    def score(symbol):
+        threads.append(threading.get_ident())
+        return {"score": 90}
+
+    monkeypatch.setattr(pss, "score_pump_ia", score)
+    monkeypatch.setattr(pss, "send_telegram_message", sent.append)
+    monkeypatch.setattr(pss, "_CACHE", {})
+
+    async def main():
+        await pss.run_full_analysis("PMP")
+        await pss.run_full_analysis("PMP")  # cooldown
+
+    asyncio.run(main())
+    assert threads and threads[0] != threading.get_ident()
+    assert sent == ["Pump détecté sur PMP (score IA 90)"]
@@ -4,7 +4,7 @@ from pump_score import score_pump_ia
 def test_score_pump_ia(monkeypatch):
     monkeypatch.setattr(
         "pump_score.get_latest_data",
-        lambda t: {"price": 10, "volume": 1_000_000, "status": "OK"},
+        lambda t, max_age=None: {"price": 10, "volume": 1_000_000, "status": "OK"},
     )
     monkeypatch.setattr("pump_score.get_rsi", lambda t: 70)
     monkeypatch.setattr("pump_score.get_ema", lambda t, p: {9: 10, 21: 9})
@@ -18,3 +18,13 @@ def test_score_pump_ia(monkeypatch):
     assert res["score"] == 90
     assert res["pump_pct_60s"] == 2.0
     assert res["status"] == "OK"
+
+
+def test_score_pump_ia_rejects_old_quote(monkeypatch):
+    monkeypatch.setattr(
+        "pump_score.get_latest_data",
+        lambda t, max_age=None: {"price": 10, "volume": 1_000_000, "status": "WARN", "stale": True, "age": 7200.0},
+    )
+    res = score_pump_ia("ABC")
+    assert res["status"] == "STALE"
+    assert res["score"] == 0
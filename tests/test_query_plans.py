@@ -0,0 +1,52 @@
+import os
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from core.hot_queries import HOT_QUERIES, full_scans, query_plan
+
+# Tables the application creates on demand rather than through migrations.
+LAZY_TABLES = [
+    "CREATE TABLE news_score (symbol TEXT PRIMARY KEY, summary TEXT, score INTEGER, timestamp DATETIME, sentiment TEXT, last_analyzed DATETIME)",
+    "CREATE TABLE intraday_data (ticker TEXT, timestamp TEXT, open REAL, high REAL, low REAL, close REAL, volume REAL)",
+    "CREATE TABLE ticks (id INTEGER PRIMARY KEY AUTOINCREMENT, ticker TEXT, price REAL, volume REAL, timestamp INTEGER)",
+    "CREATE TABLE trades_reels (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, price REAL, qty INTEGER, side TEXT, timestamp TEXT, source TEXT)",
+    "CREATE TABLE trades_auto (id INTEGER PRIMARY KEY AUTOINCREMENT, ticker TEXT, action TEXT, prix REAL, quantite INTEGER, provenance TEXT, timestamp TEXT)",
+    "CREATE TABLE trades (id INTEGER PRIMARY KEY AUTOINCREMENT, datetime TEXT, ticker TEXT, action TEXT, prix REAL)",
+]
+
+
+@pytest.fixture(scope="module")
+def migrated_db(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("plans") / "trades.db"
+    conn = sqlite3.connect(db_path)
+    for ddl in LAZY_TABLES:
+        conn.execute(ddl)
+    conn.commit()
+    conn.close()
+
+    cfg = Config(os.path.join("migration", "alembic.ini"))
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    command.upgrade(cfg, "head")
+
+    conn = sqlite3.connect(db_path)
+    # the watchlist query also reads columns added outside the migrations
+    conn.execute("ALTER TABLE watchlist ADD COLUMN has_fda INTEGER")
+    conn.execute("ANALYZE")
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_indexes(migrated_db, name):
+    query = HOT_QUERIES[name]
+    assert full_scans(migrated_db, query) == [], query_plan(migrated_db, query.sql, query.params)
+
+
+def test_full_scan_is_detected(migrated_db):
+    from core.hot_queries import HotQuery
+
+    query = HotQuery("SELECT * FROM ticks WHERE price > ?", (1.0,))
+    assert full_scans(migrated_db, query) == ["SCAN ticks"]
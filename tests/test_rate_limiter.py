@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import TokenBucket
+
+
+def test_burst_then_paced():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.perf_counter()
+    for _ in range(4):
+        assert bucket.acquire()
+    elapsed = time.perf_counter() - start
+    assert 0.08 <= elapsed < 0.3
+
+
+def test_timeout_does_not_consume_tokens():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire()
+    assert bucket.acquire(timeout=0.01) is False
+    assert bucket.available == pytest.approx(0.0, abs=0.05)
+
+
+def test_async_acquire_and_backoff():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def run():
+        await bucket.acquire_async()
+        bucket.backoff(0.1)
+        start = time.perf_counter()
+        await bucket.acquire_async()
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.1
+
+
+def test_registry_reads_env(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_FINNHUB", "120/60")
+    monkeypatch.setenv("RATE_BURST_FINNHUB", "7")
+    rate_limiter.reset()
+    try:
+        bucket = rate_limiter.get_limiter("Finnhub")
+        assert bucket is rate_limiter.get_limiter("finnhub")
+        assert bucket.rate == 2 and bucket.capacity == 7
+    finally:
+        rate_limiter.reset()
+
+
+def test_exhausted_provider_is_skipped_not_waited_for(monkeypatch):
+    from utils import utils_intraday
+
+    monkeypatch.setenv("RATE_LIMIT_FMP", "250/86400")
+    monkeypatch.setenv("RATE_BURST_FMP", "1")
+    rate_limiter.reset()
+    try:
+        assert rate_limiter.acquire("fmp", timeout=0.1)
+        start = time.monotonic()
+        assert rate_limiter.acquire("fmp", timeout=0.1) is False
+        assert asyncio.run(rate_limiter.acquire_async("fmp", timeout=0.1)) is False
+
+        def no_request(*a, **k):
+            raise AssertionError("request sent without a token")
+
+        monkeypatch.setattr(utils_intraday.requests, "get", no_request)
+        assert utils_intraday.fetch_from_fmp("AAA") is None
+        assert time.monotonic() - start < 1
+    finally:
+        rate_limiter.reset()
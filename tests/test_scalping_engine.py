@@ -0,0 +1,133 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from backtest.scalping_engine import (
+    ScalpingParams,
+    compute_signals,
+    run_scalping_backtest,
+    simulate_ticker,
+)
+
+# the score depends on catalysts and indicators covered elsewhere
+PARAMS = ScalpingParams(min_score=0)
+
+
+def _session(day, closes, volumes=None, start="14:30"):
+    """Flat 1m bars whose closes follow ``closes``; a spike bar where volume jumps."""
+    n = len(closes)
+    ts = pd.date_range(f"{day} {start}", periods=n, freq="1min")
+    closes = np.asarray(closes, dtype=float)
+    opens = np.concatenate([[closes[0]], closes[:-1]])
+    volumes = np.full(n, 1000.0) if volumes is None else np.asarray(volumes, dtype=float)
+    return pd.DataFrame({
+        "timestamp": ts,
+        "o": opens,
+        "h": np.maximum(opens, closes) + 0.001,
+        "l": np.minimum(opens, closes) - 0.001,
+        "c": closes,
+        "v": volumes,
+    })
+
+
+def _breakout_day(day, after, start="14:30"):
+    """Ten quiet bars, a volume breakout on bar 10, then ``after`` closes."""
+    closes = [1.0] * 10 + [1.05] + list(after)
+    volumes = [1000.0] * 10 + [10_000.0] + [1000.0] * len(after)
+    return _session(day, closes, volumes, start)
+
+
+def test_compute_signals_flags_bar_after_breakout():
+    bars = _breakout_day("2024-01-02", [1.05] * 5)
+    df = compute_signals(bars, PARAMS)
+    assert df["signal"].tolist().index(True) == 10
+    assert np.flatnonzero(df["entry"]).tolist() == [11]
+
+
+def test_trading_window_blocks_entries():
+    bars = _breakout_day("2024-01-02", [1.05] * 5, start="13:00")
+    assert not compute_signals(bars, PARAMS)["entry"].any()
+
+
+def test_take_profit_stop_and_eod_exits():
+    tp = _breakout_day("2024-01-02", [1.05, 1.07, 1.11, 1.12])
+    trades = simulate_ticker("TP", tp, PARAMS)
+    assert [t["reason"] for t in trades] == ["take_profit"]
+    assert trades[0]["exit_price"] == pytest.approx(1.05 * 1.05, rel=1e-3)
+
+    stop = _breakout_day("2024-01-02", [1.05, 1.0, 0.9, 0.8])
+    trades = simulate_ticker("SL", stop, PARAMS)
+    assert [t["reason"] for t in trades] == ["stop"]
+    # no ATR history: the capped 8% stop applies
+    assert trades[0]["exit_price"] == pytest.approx(1.05 * 0.92, rel=1e-3)
+    assert trades[0]["pnl"] < 0
+
+    flat = _breakout_day("2024-01-02", [1.05, 1.06, 1.055])
+    trades = simulate_ticker("EOD", flat, PARAMS)
+    assert [t["reason"] for t in trades] == ["eod"]
+
+
+def test_trailing_stop_moves_to_break_even():
+    # +2.9% then back below entry: the trailing stop exits at break even
+    bars = _breakout_day("2024-01-02", [1.05, 1.08, 1.06, 1.0, 1.0])
+    (trade,) = simulate_ticker("TR", bars, PARAMS)
+    assert trade["reason"] == "stop"
+    assert trade["exit_price"] == pytest.approx(trade["entry_price"])
+
+
+def test_three_trades_per_day_cap():
+    closes, volumes = [], []
+    level = 1.0
+    for _ in range(5):
+        closes += [level] * 10 + [level * 1.05] + [level * 1.05 * 1.06]
+        volumes += [1000.0] * 10 + [10_000.0] + [1000.0]
+        level = closes[-1]
+    bars = _session("2024-01-02", closes, volumes)
+    trades = simulate_ticker("CAP", bars, PARAMS)
+    assert len(trades) == 3
+
+
+def test_run_backtest_trades_and_equity():
+    frames = {
+        "AAA": pd.concat([
+            _breakout_day("2024-01-02", [1.05, 1.07, 1.11]),
+            _breakout_day("2024-01-03", [1.05, 1.0, 0.9]),
+        ], ignore_index=True),
+        "BBB": _session("2024-01-02", [1.0] * 30),
+    }
+    result = run_scalping_backtest(["AAA", "BBB"], "2024-01-01", "2024-01-31", PARAMS, bars=frames)
+    assert result.trades["ticker"].tolist() == ["AAA", "AAA"]
+    assert len(result.equity) == 2
+    assert result.equity["equity"].iloc[-1] == pytest.approx(10_000 + result.trades["pnl"].sum())
+    summary = result.summary()
+    assert summary["trades"] == 2
+    assert summary["win_rate"] == 0.5
+    assert summary["drawdown"] < 0
+
+    strict = run_scalping_backtest(["AAA"], "2024-01-01", "2024-01-31", bars=frames)
+    assert strict.trades.empty
+
+
+def _volume_breakout(day):
+    bars = _breakout_day(day, [1.06, 1.07, 1.12])
+    bars["v"] *= 100  # 1M shares on the breakout bar
+    return bars
+
+
+def test_default_params_can_enter():
+    trades = simulate_ticker("VOL", _volume_breakout("2024-01-02"))
+    assert [t["reason"] for t in trades] == ["take_profit"]
+    assert trades[0]["score"] >= ScalpingParams().min_score
+
+
+def test_catalyst_only_counts_once_published():
+    bars = _volume_breakout("2024-01-02")
+    strict = ScalpingParams(min_score=80)
+    early = pd.Series([0.9], index=[pd.Timestamp("2024-01-02 09:00")])
+    late = pd.Series([0.9], index=[pd.Timestamp("2024-01-02 16:00")])
+    assert simulate_ticker("CAT", bars, strict) == []
+    assert len(simulate_ticker("CAT", bars, strict, catalyst=early)) == 1
+    assert simulate_ticker("CAT", bars, strict, catalyst=late) == []
+    with pytest.raises(TypeError):
+        compute_signals(bars, strict, catalyst=0.9)
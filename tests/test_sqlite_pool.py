@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+
+import pytest
+
+from core import sqlite_pool
+
+
+def test_connection_is_pooled_per_thread(tmp_path):
+    db_file = tmp_path / "pool.db"
+    conn = sqlite_pool.get_connection(db_file)
+    assert sqlite_pool.get_connection(str(db_file)) is conn
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(sqlite_pool.get_connection(db_file)))
+    t.start()
+    t.join()
+    assert other[0] is not conn
+
+
+def test_pragmas_applied(tmp_path):
+    conn = sqlite_pool.get_connection(tmp_path / "pragmas.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == sqlite_pool.BUSY_TIMEOUT_MS
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -sqlite_pool.CACHE_KB
+
+
+def test_connection_commits_and_rolls_back(tmp_path):
+    db_file = tmp_path / "tx.db"
+    with sqlite_pool.connection(db_file) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with pytest.raises(RuntimeError):
+        with sqlite_pool.connection(db_file) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            raise RuntimeError("boom")
+
+    check = sqlite3.connect(db_file)
+    assert check.execute("SELECT x FROM t").fetchall() == [(1,)]
+    check.close()
+
+
+def test_reconnects_when_file_recreated(tmp_path):
+    db_file = tmp_path / "swap.db"
+    conn = sqlite_pool.get_connection(db_file)
+    conn.execute("CREATE TABLE old (x INTEGER)")
+    conn.commit()
+
+    for path in tmp_path.glob("swap.db*"):
+        path.unlink()
+    fresh = sqlite3.connect(db_file)
+    fresh.execute("CREATE TABLE new (x INTEGER)")
+    fresh.commit()
+    fresh.close()
+
+    # replacement is only detected at open time or after reset()
+    assert sqlite_pool.get_connection(db_file) is conn
+    sqlite_pool.reset()
+    conn2 = sqlite_pool.get_connection(db_file)
+    assert conn2 is not conn
+    tables = {r[0] for r in conn2.execute("SELECT name FROM sqlite_master")}
+    assert tables == {"new"}
+
+
+def test_reset_keeps_other_threads_connection_when_file_unchanged(tmp_path):
+    db_file = tmp_path / "keep.db"
+    conns = []
+    ready, go = threading.Event(), threading.Event()
+
+    def worker():
+        conns.append(sqlite_pool.get_connection(db_file))
+        ready.set()
+        go.wait(5)
+        conns.append(sqlite_pool.get_connection(db_file))
+
+    t = threading.Thread(target=worker)
+    t.start()
+    ready.wait(5)
+    sqlite_pool.reset()
+    go.set()
+    t.join()
+    assert conns[0] is conns[1]
+
+
+def test_nested_connection_uses_savepoint(tmp_path):
+    db_file = tmp_path / "nested.db"
+    with sqlite_pool.connection(db_file) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+
+    with pytest.raises(RuntimeError):
+        with sqlite_pool.connection(db_file) as outer:
+            outer.execute("INSERT INTO t VALUES (1)")
+            with sqlite_pool.connection(db_file) as inner:
+                inner.execute("INSERT INTO t VALUES (2)")
+            # the inner block must not have committed the outer transaction
+            assert outer.in_transaction
+            raise RuntimeError("boom")
+
+    with sqlite_pool.connection(db_file) as outer:
+        outer.execute("INSERT INTO t VALUES (3)")
+        with pytest.raises(ValueError):
+            with sqlite_pool.connection(db_file) as inner:
+                inner.execute("INSERT INTO t VALUES (4)")
+                raise ValueError("inner only")
+        with sqlite_pool.connection(db_file) as inner:
+            inner.execute("INSERT INTO t VALUES (5)")
+
+    check = sqlite3.connect(db_file)
+    assert check.execute("SELECT x FROM t ORDER BY x").fetchall() == [(3,), (5,)]
+    check.close()
+
+
+def test_reset_drops_pool(tmp_path):
+    db_file = tmp_path / "reset.db"
+    conn = sqlite_pool.get_connection(db_file)
+    sqlite_pool.reset()
+    assert sqlite_pool.get_connection(db_file) is not conn
@@ -1,4 +1,5 @@
 import importlib
+import time
 from datetime import datetime
 import pytest
 pd = pytest.importorskip("pandas")
@@ -26,7 +27,7 @@ def _setup_indicators(monkeypatch):
         'Volume': [100000, 400000],
     }, index=pd.date_range('2024-01-01', periods=2))
     monkeypatch.setattr('yfinance.download', lambda *a, **k: df_gap)
-    monkeypatch.setattr(f'{STRAT_PATH}.get_latest_data', lambda t: {
+    monkeypatch.setattr(f'{STRAT_PATH}.get_latest_data', lambda t, max_age=None: {
         'price': 3.12,
         'volume': 900000,
         'timestamp': '2024-01-01T00:00:00',
@@ -45,6 +46,36 @@ def test_compute_score(monkeypatch):
     assert res['gap_pct'] == pytest.approx(10.0)
 
 
+def test_compute_score_refreshes_stale_quote(monkeypatch):
+    strat = importlib.import_module(STRAT_PATH)
+    _setup_indicators(monkeypatch)
+    sdm = importlib.import_module('data.stream_data_manager')
+    monkeypatch.setattr(sdm, 'latest_ticks', sdm.LatestTickStore())
+    monkeypatch.setattr(sdm, 'fallback_refresher', sdm.FallbackRefresher())
+    monkeypatch.setattr(strat, 'get_latest_data', sdm.get_latest_data)
+    # hours-old stream quote: a fresh fallback quote prices the entry
+    sdm.latest_ticks.update('AAA', 1.0, 900000, time.time() - 3 * 3600)
+    fetched = []
+    monkeypatch.setattr(sdm, 'fallback_data', lambda t: fetched.append(t) or {
+        'price': 3.12, 'volume': 900000, 'ts': time.time() - 30, 'source': 'FALLBACK', 'status': 'WARN',
+    })
+    res = strat._compute_score('AAA')
+    assert fetched == ['AAA']
+    assert res['price'] == 3.12
+    assert res['source'] == 'FALLBACK'
+    assert res['stop_loss'] < 3.12 < res['take_profit']
+    # the quote just fetched is reused: no blocking download on every call
+    assert strat._compute_score('AAA')['price'] == 3.12
+    assert fetched == ['AAA']
+
+    # no fresh quote to be had: no trade is priced
+    monkeypatch.setattr(sdm, 'fallback_data', lambda t: {
+        'price': 3.0, 'volume': 1, 'ts': time.time() - 3600, 'source': 'FALLBACK', 'status': 'WARN',
+    })
+    sdm.fallback_refresher.quotes.clear()
+    assert strat._compute_score('AAA') is None
+
+
 def test_executer_strategie_scalping(monkeypatch):
     strat = importlib.import_module(STRAT_PATH)
     _setup_indicators(monkeypatch)
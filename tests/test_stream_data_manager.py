@@ -1,5 +1,6 @@
 import importlib
-from datetime import datetime
+import json
+from datetime import datetime, timezone
 import types
 import pytest
 pd = pytest.importorskip("pandas")
@@ -20,10 +21,20 @@ def test_get_latest_data_fallback(monkeypatch):
         {"Close": [3.12], "Volume": [900000]},
         index=[pd.Timestamp("2024-01-01T00:00:00")],
     )
-    monkeypatch.setattr('yfinance.download', lambda *a, **k: df)
+    calls = []
+    monkeypatch.setattr('yfinance.download', lambda *a, **k: calls.append(a) or df)
     module = _reload_module(monkeypatch)
 
+    # nothing known yet: no blocking download, a refresh is queued instead
     res = module.get_latest_data('AAA')
+    assert res == {'status': 'ERR', 'pending': True}
+    assert calls == []
+    module.get_latest_data('AAA')
+    assert module.fallback_refresher.run_pending() == 1
+    assert calls == [(['AAA'],)]
+
+    res = module.get_latest_data('AAA')
+    assert res['stale'] is True
     assert res['price'] == 3.12
     assert res['volume'] == 900000
     assert res['source'] == 'FALLBACK'
@@ -32,22 +43,86 @@ def test_get_latest_data_fallback(monkeypatch):
 
 def test_get_latest_data_ws_cache(monkeypatch):
     module = _reload_module(monkeypatch)
-    module.latest_data['AAA'] = {
-        'price': 3.12,
-        'volume': 900000,
-        'timestamp': '2024-01-01T00:00:00',
-        'source': 'WS',
-        'status': 'OK',
-    }
-    monkeypatch.setattr(
-        module,
-        'datetime',
-        types.SimpleNamespace(
-            utcnow=lambda: datetime(2024, 1, 1, 0, 0, 9),
-            fromisoformat=module.datetime.fromisoformat,
-        ),
-    )
+    t0 = datetime(2024, 1, 1).replace(tzinfo=timezone.utc).timestamp()
+    module.latest_ticks.update('AAA', 3.12, 900000, t0)
+    monkeypatch.setattr(module, 'time', types.SimpleNamespace(time=lambda: t0 + 9))
     res = module.get_latest_data('AAA')
     assert res['source'] == 'WS'
     assert res['status'] == 'OK'
     assert res['price'] == 3.12
+    assert res['timestamp'] == '2024-01-01T00:00:00'
+
+
+def test_on_message_feeds_tick_rings(monkeypatch, tmp_path):
+    module = _reload_module(monkeypatch)
+    monkeypatch.setattr(module, 'candle_aggregator', types.SimpleNamespace(on_tick=lambda *a: None))
+    monkeypatch.setattr(module, 'INDICATOR_STATE_PATH', str(tmp_path / 'state.json'))
+    trades = [{"s": "AAA", "p": 1.0 + i / 100, "v": 10, "t": 1_704_067_200_000 + i * 1000} for i in range(5)]
+    module.on_message(None, json.dumps({"type": "trade", "data": trades}))
+
+    quote = module.latest_ticks.latest('AAA')
+    assert quote.price == 1.04
+    assert quote.ts == 1_704_067_204.0
+    ts, prices, volumes = module.latest_ticks.history('AAA')
+    assert prices.tolist() == [1.0, 1.01, 1.02, 1.03, 1.04]
+    assert ts[0] == 1_704_067_200.0
+    # the indicator state is saved by the background saver, not per message
+    assert not (tmp_path / 'state.json').exists()
+    module.save_indicators()
+    assert (tmp_path / 'state.json').exists()
+
+
+def test_get_latest_data_stale_ws_batches_refresh(monkeypatch):
+    module = _reload_module(monkeypatch)
+    calls = []
+
+    def fake_batch(tickers):
+        calls.append(list(tickers))
+        return {t: {'price': 2.0, 'volume': 5, 'ts': 1_000.0, 'timestamp': 'x', 'source': 'FALLBACK', 'status': 'WARN'} for t in tickers}
+
+    monkeypatch.setattr(module, 'fallback_batch', fake_batch)
+    monkeypatch.setattr(module, 'time', types.SimpleNamespace(time=lambda: 2_000.0, monotonic=lambda: 50.0, sleep=lambda s: None))
+    module.latest_ticks.update('AAA', 3.0, 10, 1_500.0)
+    module.latest_ticks.update('BBB', 4.0, 10, 500.0)
+
+    res = module.get_latest_data('AAA')
+    assert (res['price'], res['source'], res['status'], res['stale']) == (3.0, 'WS', 'WARN', True)
+    assert res['age'] == 500.0
+    for _ in range(3):
+        module.get_latest_data('BBB')
+    assert module.fallback_refresher.run_pending() == 2
+    assert calls == [['AAA', 'BBB']]
+
+    # the fallback is newer than BBB's last trade, older than AAA's
+    assert module.get_latest_data('BBB')['price'] == 2.0
+    assert module.get_latest_data('AAA')['price'] == 3.0
+    # refreshed recently: not queued again
+    assert module.fallback_refresher.run_pending() == 0
+
+
+def test_housekeeping_rolls_quiet_bars(monkeypatch, tmp_path):
+    module = _reload_module(monkeypatch)
+    from realtime.candle_builder import CandleAggregator
+
+    aggregator = CandleAggregator(intervals=(60,))
+    closed = []
+    aggregator.subscribe(lambda *bar: closed.append(bar))
+    monkeypatch.setattr(module, 'candle_aggregator', aggregator)
+    monkeypatch.setattr(module, 'INDICATOR_STATE_PATH', str(tmp_path / 'state.json'))
+    monkeypatch.setattr(module, 'BAR_ROLL_INTERVAL', 0.01)
+    monkeypatch.setattr(module, 'INDICATOR_SAVE_INTERVAL', 0.0)
+
+    # a ticker that traded once two minutes ago and then went quiet
+    aggregator.on_tick('AAA', 1.0, 10, module.time.time() - 120)
+    roll = aggregator.roll
+
+    def roll_once(now=None):
+        out = roll(now)
+        module._housekeeper_stop.set()
+        return out
+
+    monkeypatch.setattr(aggregator, 'roll', roll_once)
+    module._housekeeper_stop.clear()
+    module._housekeeping_loop()
+    assert [(t, i) for t, i, _ in closed] == [('AAA', 60)]
+    assert (tmp_path / 'state.json').exists()
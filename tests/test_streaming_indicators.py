@@ -0,0 +1,84 @@
+import pytest
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+from data.streaming_indicators import IncrementalIndicators, IndicatorBook
+
+
+def _closes(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return 10 + np.cumsum(rng.normal(0, 0.1, n))
+
+
+def _wilder(values, period):
+    out = None
+    for i, v in enumerate(values):
+        if i + 1 < period:
+            continue
+        out = np.mean(values[:period]) if i + 1 == period else (out * (period - 1) + v) / period
+    return out
+
+
+def test_bar_updates_match_batch_formulas():
+    closes = _closes()
+    state = IncrementalIndicators()
+    for c in closes:
+        state.update_bar(c, volume=100, high=c + 0.05, low=c - 0.05)
+    close = pd.Series(closes)
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    delta = np.diff(closes)
+    gain = _wilder(np.clip(delta, 0, None), 14)
+    loss = _wilder(-np.clip(delta, None, 0), 14)
+    values = state.values()
+    assert values["ema9"] == pytest.approx(close.ewm(span=9, adjust=False).mean().iloc[-1])
+    assert values["macd"] == pytest.approx(macd.iloc[-1])
+    assert values["macd_signal"] == pytest.approx(macd.ewm(span=9, adjust=False).mean().iloc[-1])
+    assert values["rsi"] == pytest.approx(100 - 100 / (1 + gain / loss))
+    assert values["vwap"] == pytest.approx(closes.mean())
+    assert values["volume_avg"] == 100
+
+
+def test_ticks_close_bars_and_snapshot_roundtrip(tmp_path):
+    book = IndicatorBook()
+    base = 1_704_200_000 - 1_704_200_000 % 60
+    book.on_tick("aaa", 10.0, 100, base + 1)
+    book.on_tick("AAA", 11.0, 100, base + 30)
+    values = book.get("AAA")
+    assert values["price"] == 11.0
+    assert values["vwap"] == pytest.approx(10.5)
+    assert values["ema9"] is None
+    book.on_tick("AAA", 12.0, 200, base + 61)
+    assert book.get("AAA")["ema9"] == 11.0
+
+    path = tmp_path / "state.json"
+    book.save(path)
+    restored = IndicatorBook()
+    assert restored.load(path) == 1
+    assert restored.get("AAA") == book.get("AAA")
+    restored.on_tick("AAA", 13.0, 100, base + 125)
+    book.on_tick("AAA", 13.0, 100, base + 125)
+    assert restored.get("AAA") == book.get("AAA")
+
+
+def test_vwap_session_follows_new_york_date():
+    ind = IncrementalIndicators()
+    # 15:30 and 20:30 New York on 2024-01-02; the second is already Jan 3 in UTC
+    ind.update_tick(10.0, 100, 1_704_245_400 - 5 * 3600)
+    ind.update_tick(12.0, 100, 1_704_245_400)
+    assert ind.values()["vwap"] == pytest.approx(11.0)
+    # 00:30 New York on Jan 3 starts a new session
+    ind.update_tick(20.0, 100, 1_704_245_400 + 4 * 3600)
+    assert ind.values()["vwap"] == pytest.approx(20.0)
+
+
+def test_ticks_without_volume_leave_volume_state_alone():
+    ind = IncrementalIndicators()
+    base = 1_704_200_000 - 1_704_200_000 % 60
+    for i in range(3):
+        ind.update_tick(10.0 + i, None, base + 60 * i)
+    values = ind.values()
+    assert values["price"] == 12.0
+    assert values["vwap"] is None
+    assert values["volume"] is None and values["volume_avg"] is None
+    assert ind.bars == 2
+    assert values["ema9"] is not None
@@ -0,0 +1,92 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import realtime.build_intraday_candles as candles_mod
+from realtime.tick_store import TickStore
+
+BASE = 1_714_564_800  # 2024-05-01 12:00:00 UTC
+
+
+def _ticks(n, start=BASE, step=10):
+    return [{"timestamp": start + i * step, "c": 1.0 + i, "v": 100} for i in range(n)]
+
+
+def test_append_and_read_range(tmp_path):
+    store = TickStore(tmp_path)
+    store.append("abc", _ticks(10))
+    store.append("ABC", _ticks(5, start=BASE + 100))
+
+    df = store.read("ABC", start=BASE + 50, end=BASE + 120)
+    assert list(df["timestamp"]) == list(pd.to_datetime([BASE + s for s in (50, 60, 70, 80, 90, 100, 110, 120)], unit="s"))
+    assert store.read("XYZ") is None
+    assert store.read("ABC", start=BASE + 10_000).empty
+    assert store.last_timestamp("ABC") == BASE + 140
+
+
+def test_partitions_by_day_and_compacts(tmp_path):
+    store = TickStore(tmp_path, compact_after=3)
+    store.append("ABC", _ticks(2, start=BASE - 86_400))
+    for i in range(3):
+        store.append("ABC", _ticks(2, start=BASE + i * 100))
+
+    assert store._days("ABC") == ["2024-04-30", "2024-05-01"]
+    assert len(store._parts("ABC", "2024-05-01")) == 1
+    day = store.read("ABC", start=BASE)
+    assert len(day) == 6
+    assert day["timestamp"].is_monotonic_increasing
+    assert len(store.read("ABC")) == 8
+
+
+def test_interrupted_compaction_keeps_ticks_once(tmp_path, monkeypatch):
+    store = TickStore(tmp_path, compact_after=100)
+    for i in range(3):
+        store.append("ABC", _ticks(2, start=BASE + i * 100))
+    folder = tmp_path / "ticker=ABC" / "date=2024-05-01"
+
+    def crash(self, missing_ok=False):
+        raise OSError("crash")
+
+    # crash after the merged file is in place, before the parts are deleted
+    monkeypatch.setattr(type(folder), "unlink", crash)
+    with pytest.raises(OSError):
+        store.compact("ABC", "2024-05-01")
+    monkeypatch.undo()
+    assert len(list(folder.glob("*.parquet"))) == 4
+    assert [p.name.split("-")[0] for p in store._parts("ABC", "2024-05-01")] == ["compact"]
+    assert len(store.read("ABC")) == 6
+
+    # the next compaction merges new parts and removes the leftovers
+    store.append("ABC", _ticks(2, start=BASE + 500))
+    store.compact("ABC", "2024-05-01")
+    assert len(list(folder.glob("*.parquet"))) == 1
+    assert len(store.read("ABC")) == 8
+    assert store.last_timestamp("ABC") == BASE + 510
+
+
+def test_load_ticks_reads_recent_window(tmp_path, monkeypatch):
+    pump_mod = pytest.importorskip("realtime.pump_detector")
+    store = TickStore(tmp_path)
+    store.append("ABC", _ticks(100, step=60))
+    monkeypatch.setattr(pump_mod, "get_tick_store", lambda: store)
+
+    df = pump_mod.load_ticks("ABC", minutes=6)
+    assert len(df) == 7
+    assert df["c"].iloc[-1] == 100.0
+    assert len(pump_mod.load_ticks("ABC")) == 100
+
+
+def test_build_candles_from_store(tmp_path, monkeypatch):
+    store = TickStore(tmp_path)
+    now = int(pd.Timestamp.now().floor("min").value // 10**9)
+    store.append("ABC", [
+        {"timestamp": now, "c": 1.0, "v": 10},
+        {"timestamp": now + 20, "c": 1.5, "v": 5},
+        {"timestamp": now + 40, "c": 0.9, "v": 5},
+    ])
+    monkeypatch.setattr(candles_mod, "get_tick_store", lambda: store)
+
+    candles = candles_mod.build_candles("ABC")
+    row = candles.iloc[-1]
+    assert (row["o"], row["h"], row["l"], row["c"], row["v"]) == (1.0, 1.5, 0.9, 0.9, 20)
@@ -0,0 +1,58 @@
+import sqlite3
+import time
+
+from realtime.tick_writer import TickWriter
+
+
+def _rows(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute("SELECT ticker, price, volume, timestamp FROM ticks ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_ticks_are_batched(tmp_path):
+    db_file = tmp_path / "ticks.db"
+    writer = TickWriter(db_file, batch_size=50, flush_interval=5.0)
+    for i in range(120):
+        writer.put("AAA", 1.0 + i, 10, i)
+    writer.flush()
+    stats = writer.stats()
+    writer.close()
+
+    rows = _rows(db_file)
+    assert len(rows) == 120
+    assert rows[0] == ("AAA", 1.0, 10.0, 0)
+    assert stats["written"] == 120
+    assert stats["flushes"] <= 4
+    assert stats["queue_depth"] == 0
+
+
+def test_partial_batch_flushed_by_interval(tmp_path):
+    db_file = tmp_path / "ticks.db"
+    writer = TickWriter(db_file, batch_size=1000, flush_interval=0.05)
+    writer.put("BBB", 2.0, 5, 1)
+    deadline = time.time() + 5
+    while writer.stats()["written"] < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert _rows(db_file) == [("BBB", 2.0, 5.0, 1)]
+    writer.close()
+
+
+def test_close_drains_queue(tmp_path):
+    db_file = tmp_path / "ticks.db"
+    writer = TickWriter(db_file, batch_size=1000, flush_interval=60)
+    for i in range(10):
+        writer.put("CCC", float(i), 0, i)
+    writer.close()
+    assert len(_rows(db_file)) == 10
+
+
+def test_full_queue_drops(tmp_path):
+    writer = TickWriter(tmp_path / "ticks.db", max_queue=1, put_timeout=0)
+    # do not start the thread so the queue cannot drain
+    writer.start = lambda: writer
+    assert writer.put("DDD", 1.0)
+    assert not writer.put("DDD", 1.0)
+    assert writer.stats()["dropped"] == 1
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from caching.ttl_cache import ttl_cache
+
+
+def test_lru_bound_and_counters():
+    calls = []
+
+    @ttl_cache(60, maxsize=2)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(1), square(2), square(1), square(3)] == [1, 4, 1, 9]
+    info = square.cache_info()
+    assert info["hits"] == 1 and info["misses"] == 3
+    assert info["evictions"] == 1 and info["size"] == 2
+    square(2)  # evicted as least recently used
+    assert calls == [1, 2, 3, 2]
+
+
+def test_list_arguments_expiry_and_invalidate():
+    calls = []
+
+    @ttl_cache(0.05)
+    def total(values, scale=1):
+        calls.append(list(values))
+        return sum(values) * scale
+
+    assert total([1, 2], scale=2) == 6
+    assert total([1, 2], scale=2) == 6
+    assert len(calls) == 1
+    assert total.invalidate([1, 2], scale=2)
+    total([1, 2], scale=2)
+    assert len(calls) == 2
+    time.sleep(0.06)
+    assert total.cache.sweep() == 1
+    total.clear()
+    assert total.cache_info()["size"] == 0
+
+
+def test_concurrent_misses_call_once():
+    calls = []
+    release = threading.Event()
+
+    @ttl_cache(60)
+    def slow(key):
+        calls.append(key)
+        release.wait(1)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow("a"))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+    assert calls == ["a"]
+    assert results == ["A"] * 6
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+import pytest
+
+sync_server = pytest.importorskip("websockets.sync.server")
+
+from data.ws_stream import StreamManager
+
+
+class FakeFinnhub:
+    """Local stand-in for the Finnhub feed recording (un)subscriptions."""
+
+    def __init__(self, drop_on_connect=False):
+        self.drop_on_connect = drop_on_connect
+        self.accepted = 0
+        self.connections = []
+        self.log = []
+        self._next = 0
+        self.lock = threading.Lock()
+        self.server = sync_server.serve(self._handler, "127.0.0.1", 0)
+        self.port = self.server.socket.getsockname()[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def _handler(self, ws):
+        with self.lock:
+            self.connections.append(ws)
+            self._next += 1
+            self.accepted += 1
+            conn_id = self._next
+        if self.drop_on_connect:
+            ws.close()
+            return
+        try:
+            for raw in ws:
+                msg = json.loads(raw)
+                with self.lock:
+                    self.log.append((conn_id, msg["type"], msg["symbol"]))
+        except Exception:
+            pass
+        finally:
+            with self.lock:
+                if ws in self.connections:
+                    self.connections.remove(ws)
+
+    def subscriptions(self):
+        subs = {}
+        with self.lock:
+            for conn, kind, symbol in self.log:
+                entry = subs.setdefault(conn, set())
+                (entry.add if kind == "subscribe" else entry.discard)(symbol)
+        return {c: s for c, s in subs.items() if s}
+
+    def broadcast(self, payload):
+        with self.lock:
+            conns = list(self.connections)
+        for ws in conns:
+            ws.send(json.dumps(payload))
+
+    def drop_all(self):
+        with self.lock:
+            conns = list(self.connections)
+        for ws in conns:
+            ws.close()
+
+    def close(self):
+        self.server.shutdown()
+
+
+def _wait(cond, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def server():
+    srv = FakeFinnhub()
+    yield srv
+    srv.close()
+
+
+def test_sharding_diffs_and_trades(server):
+    trades = []
+    manager = StreamManager(
+        f"ws://127.0.0.1:{server.port}", trades.extend, max_symbols=2, backoff_base=0.05
+    )
+    manager.set_symbols(["aaa", "BBB", "CCC"])
+    assert server.connections == []  # nothing before start()
+    manager.start()
+    try:
+        assert _wait(lambda: sorted(map(sorted, server.subscriptions().values())) == [["AAA", "BBB"], ["CCC"]])
+        assert manager.stats()["connections"] == 2
+
+        before = len(server.log)
+        manager.set_symbols(["AAA", "CCC", "DDD"])
+        assert _wait(lambda: len(server.log) == before + 2)
+        assert sorted((k, s) for _, k, s in server.log[before:]) == [("subscribe", "DDD"), ("unsubscribe", "BBB")]
+        assert set().union(*server.subscriptions().values()) == {"AAA", "CCC", "DDD"}
+
+        now_ms = int(time.time() * 1000)
+        server.broadcast({"type": "trade", "data": [{"s": "AAA", "p": 1.5, "v": 10, "t": now_ms}]})
+        server.broadcast({"type": "ping"})
+        assert _wait(lambda: len(trades) == 2 and manager.stats()["messages"] == 4)
+        stats = manager.stats()
+        assert stats["messages"] == 4 and stats["trades"] == 2
+        assert 0 <= stats["last_lag_s"] < 5
+    finally:
+        start = time.monotonic()
+        manager.stop()
+    assert time.monotonic() - start < 2
+    assert not manager.alive
+
+
+def test_reconnects_and_resubscribes(server):
+    manager = StreamManager(
+        f"ws://127.0.0.1:{server.port}", lambda t: None, max_symbols=10, backoff_base=0.05, backoff_max=0.1
+    )
+    manager.set_symbols(["AAA", "BBB"])
+    manager.start()
+    try:
+        assert _wait(lambda: len(server.subscriptions()) == 1)
+        first = next(iter(server.subscriptions()))
+        server.drop_all()
+        assert _wait(lambda: any(c != first and s == {"AAA", "BBB"} for c, s in server.subscriptions().items()))
+        assert manager.stats()["reconnects"] >= 1
+        assert _wait(lambda: manager.connected)
+    finally:
+        manager.stop()
+    assert not manager.alive
+    assert not manager.connected
+    assert manager.stats()["reconnects"] >= 1
+
+
+def test_backoff_grows_when_connections_drop_at_once():
+    server = FakeFinnhub(drop_on_connect=True)
+    manager = StreamManager(
+        f"ws://127.0.0.1:{server.port}", lambda t: None, backoff_base=0.05, backoff_max=5.0
+    )
+    manager.set_symbols(["AAA"])
+    manager.start()
+    try:
+        time.sleep(1.5)
+    finally:
+        manager.stop()
+        server.close()
+    # 0.05, 0.1, 0.2, 0.4, 0.8 s (at least half of each): a handful of
+    # attempts, not a tight reconnect loop
+    assert 2 <= server.accepted <= 7
+    assert manager.stats()["reconnects"] == server.accepted
+    assert not manager.alive
@@ -51,6 +51,9 @@ for path in (ROOT_DIR, SCRIPTS, ROOT_UI, UTILS, SIMULATION):
         sys.path.insert(0, path)
 
 from db.watchlist_utils import pick_date_column, ensure_schema_watchlist_scores
+from core.sqlite_pool import apply_pragmas
+from core.hot_queries import WATCHLIST_LATEST_SQL
+from core.latest_quote import ensure_latest_quote
 
 # ─── Configuration base de données ───
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -60,8 +63,7 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 def get_conn() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH.as_posix(), check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    return conn
+    return apply_pragmas(conn)
 
 from db.refactor_tasks import fetch_tasks as load_refactor_tasks
 from db.refactor_tasks import upsert_tasks as save_refactor_tasks
@@ -102,6 +104,9 @@ else:
 from notifications.proactive_voice import ProactiveVoiceNotifier
 from monitoring.watchdog_conditions import start_watchdog_thread
 from automation.codex_watcher import start_watchers
+from intelligence.model_registry import warm_up_models
+from data.stream_data_manager import start_ws
+from movers_detector import start_pump_monitor
 from fusion.module_import_checklist_txt import extraire_tickers_depuis_txt
 from intelligence.learning_loop import run_learning_loop
 
@@ -178,11 +183,11 @@ from utils_affichage_ticker import (
     afficher_ticker_panel,
     _ia_score,
     afficher_bloc_ticker,
-    calculer_indicateurs,
 )
+from data.indicator_engine import compute_indicators
 from utils.execution_reelle import executer_ordre_reel
 from execution.strategie_scalping import executer_strategie_scalping
-from intelligence.ai_scorer import compute_global_score
+from intelligence.ai_scorer import compute_global_score_batch
 from utils.progress_tracker import load_progress
 from formation_ai import formation_ai_page
 from ui.menu_strategie_personnelle import afficher_strategie_personnelle
@@ -375,6 +380,15 @@ if st.sidebar.button("🛡️ Activer surveillance IA"):
     start_watchdog_thread()
     st.sidebar.success("Surveillance IA activée")
 
+if not st.session_state.get("models_warm"):
+    warm_up_models()
+    st.session_state["models_warm"] = True
+
+if not st.session_state.get("ws_started"):
+    start_ws()
+    start_pump_monitor()
+    st.session_state["ws_started"] = True
+
 if st.sidebar.button("📡 Lancer Codex Watcher") and not st.session_state.get(
     "codex_observer"
 ):
@@ -642,47 +656,10 @@ def count_watchlist_tickers():
 @st.cache_data
 def load_watchlist():
     conn = get_conn()
-    df = pd.read_sql_query(
-        """
-        SELECT
-            w.ticker,
-            w.source,
-            w.date,
-            w.description,
-            COALESCE(w.has_fda, 0) AS has_fda,
-            w.float_shares AS float_shares,
-            COALESCE(w.score, 0) AS score,
-            COALESCE(ns.score, 0) AS score_gpt,
-            COALESCE(ns.sentiment, 'NA') AS sentiment,
-            i.price,
-            i.volume,
-            i.change_percent AS percent_gain
-        FROM watchlist w
-        LEFT JOIN news_score ns ON w.ticker = ns.symbol
-        LEFT JOIN (
-            SELECT s.ticker, s.price, s.volume, s.change_percent, s.timestamp
-            FROM intraday_smart s
-            JOIN (
-                SELECT ticker, MAX(timestamp) AS max_ts
-                FROM intraday_smart
-                GROUP BY ticker
-            ) m ON s.ticker = m.ticker AND s.timestamp = m.max_ts
-        ) i ON w.ticker = i.ticker
-        """,
-        conn,
-    )
+    ensure_latest_quote(conn)
+    df = pd.read_sql_query(WATCHLIST_LATEST_SQL, conn)
     conn.close()
-    df["global_score"] = df.apply(
-        lambda r: compute_global_score(
-            r.get("score"),
-            r.get("score_gpt"),
-            r.get("percent_gain"),
-            r.get("volume"),
-            r.get("float_shares"),
-            r.get("sentiment"),
-        ),
-        axis=1,
-    )
+    df["global_score"] = compute_global_score_batch(df)
     return df.to_dict(orient="records")
 
 
@@ -726,7 +703,7 @@ def load_watchlist_full():
 
 def update_green_indicators(watchlist):
     """Update indicators for tickers with positive change."""
-    updated = []
+    frames = {}
     for itm in watchlist:
         change = (
             itm.get("change")
@@ -739,10 +716,18 @@ def update_green_indicators(watchlist):
             if not ticker:
                 continue
             df = charger_intraday_intelligent(ticker)
-            ind = calculer_indicateurs(df)
-            if ind:
-                itm.update(ind)
-                updated.append(ticker)
+            if df is not None and not df.empty:
+                frames[ticker] = df.assign(ticker=ticker)
+    if not frames:
+        return []
+    indicators = compute_indicators(pd.concat(frames.values(), ignore_index=True))
+    indicators = indicators.drop(columns="atr")
+    updated = []
+    for itm in watchlist:
+        ticker = itm.get("ticker") or itm.get("symbol")
+        if ticker in frames and ticker in indicators.index:
+            itm.update(indicators.loc[ticker].to_dict())
+            updated.append(ticker)
     return updated
 
 
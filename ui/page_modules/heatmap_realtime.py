@@ -8,8 +8,9 @@ import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 from core.db import DB_PATH
 
-from data.stream_data_manager import set_watchlist, get_latest_data
-from intelligence.ai_scorer import compute_global_score
+from data.stream_data_manager import set_watchlist, get_latest_data, start_ws
+from movers_detector import start_pump_monitor
+from intelligence.ai_scorer import compute_global_score_batch
 
 st.set_page_config(page_title="Heatmap IA", layout="wide")
 st.title("🔥 Heatmap IA temps réel")
@@ -36,22 +37,16 @@ def load_scores() -> pd.DataFrame:
     return df
 
 def compute_scores(df: pd.DataFrame) -> pd.DataFrame:
-    df["global_score"] = df.apply(
-        lambda r: compute_global_score(
-            r["score_ai"],
-            r["score_gpt"],
-            0,
-            0,
-            r["float_shares"],
-            r["sentiment"],
-        ),
-        axis=1,
+    df["global_score"] = compute_global_score_batch(
+        df, score_ai_col="score_ai", pct_col=None, volume_col=None
     )
     return df[["ticker", "global_score"]]
 
 df = load_scores().drop_duplicates(subset="ticker")
 tickers: List[str] = df["ticker"].tolist()
 set_watchlist(tickers)
+start_ws()
+pump_monitor = start_pump_monitor()
 
 scores = compute_scores(df)
 heatmap_data = scores.set_index("ticker").T
@@ -64,12 +59,11 @@ fig = px.imshow(
 st.plotly_chart(fig, use_container_width=True)
 
 st.markdown("### Dernières variations > 1.5%")
-for tic in tickers:
-    data = get_latest_data(tic)
-    pct = data.get("pump_pct_60s", 0)
-    if pct > 1.5:
-        color = "🟢" if pct > 2.5 else "🟠"
-        st.write(f"{color} {tic} +{pct:.2f}% (60s)")
+# pump signals of the last 5 minutes, kept by the process-wide monitor
+recent = {t: p["pump_pct"] for t, p in pump_monitor.recent_signals(300).items()}
+for tic, pct in sorted(recent.items(), key=lambda kv: kv[1], reverse=True):
+    color = "🟢" if pct > 2.5 else "🟠"
+    st.write(f"{color} {tic} +{pct:.2f}% (60s)")
 
 st.markdown("### Dernières données")
 for tic in tickers:
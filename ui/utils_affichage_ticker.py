@@ -19,6 +19,7 @@ from utils_graph import (
     charger_intraday_intelligent,
 )
 from movers_detector import get_momentum
+from data.indicator_engine import indicators_for
 from utils.progress_tracker import get_latest_progress
 from utils.execution_reelle import executer_ordre_reel
 from utils_signaux import is_buy_signal
@@ -39,43 +40,11 @@ def calculer_indicateurs(df: pd.DataFrame) -> Optional[Dict[str, float]]:
 
     """Calcule quelques indicateurs techniques simples."""
 
-    if df is None or df.empty:
+    indicateurs = indicators_for(df)
+    if indicateurs is None:
         return None
-
-    df = df.copy()
-    close = df["close"].astype(float)
-
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(14, min_periods=14).mean()
-    avg_loss = loss.rolling(14, min_periods=14).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-
-    ema9 = close.ewm(span=9, adjust=False).mean()
-    ema21 = close.ewm(span=21, adjust=False).mean()
-
-    ema12 = close.ewm(span=12, adjust=False).mean()
-    ema26 = close.ewm(span=26, adjust=False).mean()
-    macd = ema12 - ema26
-    macd_signal = macd.ewm(span=9, adjust=False).mean()
-
-    vwap = (df["close"] * df["volume"]).cumsum() / df["volume"].cumsum()
-
-    volume_avg = df["volume"].rolling(50, min_periods=1).mean()
-
-    return {
-        "rsi": rsi.iloc[-1],
-        "ema9": ema9.iloc[-1],
-        "ema21": ema21.iloc[-1],
-        "macd": macd.iloc[-1],
-        "macd_signal": macd_signal.iloc[-1],
-        "vwap": vwap.iloc[-1],
-        "volume": df["volume"].iloc[-1],
-        "volume_avg": volume_avg.iloc[-1],
-        "price": close.iloc[-1],
-    }
+    indicateurs.pop("atr", None)
+    return indicateurs
 
 
 def calculer_score_indicateurs(data: dict) -> int:
@@ -2,6 +2,8 @@ import sqlite3
 from pathlib import Path
 import pandas as pd
 
+from core.sqlite_pool import connection
+
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "trades.db"
 
 
@@ -27,15 +29,12 @@ def load_historical(ticker: str, start_date: str, end_date: str) -> pd.DataFrame
     end_date : str
         Last date (inclusive) ``YYYY-MM-DD``.
     """
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         time_col = _time_column(conn)
         query = (
             f"SELECT * FROM historical_data WHERE ticker = ? AND {time_col} BETWEEN ? AND ? ORDER BY {time_col}"
         )
         df = pd.read_sql_query(query, conn, params=(ticker, start_date, end_date))
-    finally:
-        conn.close()
 
     if time_col != "timestamp" and "timestamp" not in df.columns and time_col in df.columns:
         df.rename(columns={time_col: "timestamp"}, inplace=True)
@@ -48,8 +47,7 @@ def insert_historical(ticker: str, df: pd.DataFrame) -> None:
     """Insert historical rows for ``ticker`` into the database."""
     if df is None or df.empty:
         return
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         cur = conn.execute("PRAGMA table_info(historical_data)")
         cols = [row[1] for row in cur.fetchall()]
         if "timestamp" in cols:
@@ -81,5 +79,3 @@ def insert_historical(ticker: str, df: pd.DataFrame) -> None:
             elif "Date" in df.columns:
                 df.rename(columns={"Date": "created_at"}, inplace=True)
         df.to_sql("historical_data", conn, if_exists="append", index=False)
-    finally:
-        conn.close()
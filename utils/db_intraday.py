@@ -1,30 +1,23 @@
 from __future__ import annotations
-import sqlite3
 from pathlib import Path
 import pandas as pd
 from typing import Optional
 
+from core.hot_queries import INTRADAY_LAST_TS_SQL, INTRADAY_SMART_LAST_TS_SQL, ensure_index
+from core.sqlite_pool import connection
+
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "trades.db"
 
 def load_last_timestamp(ticker: str) -> Optional[pd.Timestamp]:
     """Return the most recent timestamp stored for ``ticker`` in either
     ``intraday_data`` or ``intraday_smart`` tables."""
 
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        cur = conn.execute(
-            "SELECT MAX(timestamp) FROM intraday_data WHERE ticker = ?",
-            (ticker,),
-        )
+    with connection(DB_PATH) as conn:
+        cur = conn.execute(INTRADAY_LAST_TS_SQL, (ticker,))
         value = cur.fetchone()[0]
         if not value:
-            cur = conn.execute(
-                "SELECT MAX(timestamp) FROM intraday_smart WHERE ticker = ?",
-                (ticker,),
-            )
+            cur = conn.execute(INTRADAY_SMART_LAST_TS_SQL, (ticker,))
             value = cur.fetchone()[0]
-    finally:
-        conn.close()
 
     if value:
         try:
@@ -38,19 +31,16 @@ def insert_intraday(ticker: str, df: pd.DataFrame) -> None:
     """Append intraday rows for ``ticker`` to the database."""
     if df is None or df.empty:
         return
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         df = df.copy()
         df['ticker'] = ticker
         df.to_sql('intraday_data', conn, if_exists='append', index=False)
-    finally:
-        conn.close()
+        ensure_index(conn, 'intraday_data')
 
 
 def load_intraday(ticker: str, start: Optional[str] = None) -> pd.DataFrame:
     """Load intraday rows for ``ticker`` from the database."""
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         query = "SELECT * FROM intraday_data WHERE ticker = ?"
         params = [ticker]
         if start:
@@ -58,8 +48,6 @@ def load_intraday(ticker: str, start: Optional[str] = None) -> pd.DataFrame:
             params.append(start)
         query += " ORDER BY timestamp"
         df = pd.read_sql_query(query, conn, params=params)
-    finally:
-        conn.close()
     if not df.empty:
         df['timestamp'] = (
             pd.to_datetime(df['timestamp'], utc=True, errors='coerce')
@@ -71,8 +59,7 @@ def load_intraday(ticker: str, start: Optional[str] = None) -> pd.DataFrame:
 def load_intraday_smart(ticker: str, start: Optional[str] = None) -> pd.DataFrame:
     """Load intraday rows from the ``intraday_smart`` table."""
 
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with connection(DB_PATH) as conn:
         query = (
             "SELECT timestamp, price, high, low, volume FROM intraday_smart WHERE ticker = ?"
         )
@@ -82,8 +69,6 @@ def load_intraday_smart(ticker: str, start: Optional[str] = None) -> pd.DataFram
             params.append(start)
         query += " ORDER BY timestamp"
         df = pd.read_sql_query(query, conn, params=params)
-    finally:
-        conn.close()
 
     if not df.empty:
         df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 
 from core.db import DB_PATH
+from core.hot_queries import ensure_index
 
 
 def executer_ordre_reel(ticker: str, prix: float, quantite: int, action: str = "achat") -> dict:
@@ -43,6 +44,7 @@ def executer_ordre_reel(ticker: str, prix: float, quantite: int, action: str = "
             conn.execute(
                 "CREATE TABLE IF NOT EXISTS trades_reels (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, price REAL, qty INTEGER, side TEXT, timestamp TEXT, source TEXT)"
             )
+            ensure_index(conn, "trades_reels")
             conn.execute(
                 "INSERT INTO trades_reels (symbol, price, qty, side, timestamp, source) VALUES (?, ?, ?, ?, ?, ?)",
                 (ticker, prix, quantite, action, datetime.utcnow().isoformat(), "streamlit"),
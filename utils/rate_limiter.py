@@ -0,0 +1,159 @@
+"""Token-bucket rate limiting shared by every market-data provider.
+
+Each provider gets one process-wide :class:`TokenBucket` sized from its
+published quota.  Fetchers call :func:`acquire` (threads) or
+:func:`acquire_async` (coroutines) before each request, so bulk scans run at
+the highest rate the provider allows instead of relying on fixed sleeps.
+
+Fallback chains pass ``timeout`` (usually :data:`FALLBACK_MAX_WAIT`) and
+move on to the next provider when ``False`` comes back, instead of sleeping
+until an exhausted quota refills.
+
+Limits can be overridden with environment variables, e.g.
+``RATE_LIMIT_FINNHUB=300/60`` (300 calls per 60 seconds) and
+``RATE_BURST_FINNHUB=30`` (bucket capacity).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# provider -> (calls, per seconds, burst)
+DEFAULT_LIMITS: Dict[str, Tuple[float, float, float]] = {
+    "finnhub": (60, 60, 30),
+    "alphavantage": (5, 60, 1),
+    "fmp": (250, 86400, 5),
+    "polygon": (5, 60, 1),
+    "twelvedata": (8, 60, 2),
+    "yahoo": (2000, 3600, 10),
+}
+
+# Longest wait (seconds) for a token before a fallback chain tries the next
+# provider instead.
+FALLBACK_MAX_WAIT = float(os.getenv("RATE_LIMIT_FALLBACK_WAIT", "2"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket with reservation semantics.
+
+    A caller that finds the bucket empty reserves its token anyway and sleeps
+    until the reservation matures, so waiting callers are served in arrival
+    order and never spin.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """Reserve ``tokens`` and return the delay before using them.
+
+        Returns ``None`` without reserving anything when the delay would
+        exceed ``max_wait``.
+        """
+
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are available; ``False`` on timeout."""
+
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Asynchronous counterpart of :meth:`acquire`."""
+
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def backoff(self, seconds: float) -> None:
+        """Pause the bucket for ``seconds``, e.g. after an HTTP 429."""
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def _configured_limit(provider: str) -> Tuple[float, float]:
+    calls, per, burst = DEFAULT_LIMITS.get(provider, (60, 60, 1))
+    spec = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if spec:
+        try:
+            calls_s, per_s = spec.split("/", 1)
+            calls, per = float(calls_s), float(per_s)
+        except ValueError:
+            pass
+    burst = float(os.getenv(f"RATE_BURST_{provider.upper()}", burst))
+    return calls / per, burst
+
+
+def get_limiter(provider: str) -> TokenBucket:
+    """Return the shared bucket for ``provider`` (created on first use)."""
+
+    provider = provider.lower()
+    with _registry_lock:
+        bucket = _limiters.get(provider)
+        if bucket is None:
+            rate, burst = _configured_limit(provider)
+            bucket = _limiters[provider] = TokenBucket(rate, burst)
+        return bucket
+
+
+def acquire(provider: str, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+    """Wait for permission to send a request to ``provider``.
+
+    Returns ``False`` at once, without waiting or consuming a token, when
+    permission would take longer than ``timeout`` seconds.
+    """
+
+    return get_limiter(provider).acquire(tokens, timeout)
+
+
+async def acquire_async(provider: str, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+    """Await permission to send a request to ``provider`` (see :func:`acquire`)."""
+
+    return await get_limiter(provider).acquire_async(tokens, timeout)
+
+
+def reset() -> None:
+    """Forget every bucket so limits are re-read from the environment."""
+
+    with _registry_lock:
+        _limiters.clear()
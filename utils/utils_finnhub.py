@@ -1,13 +1,15 @@
+import math
 import os
 import time
-from typing import Any, List
+from typing import Any, Dict, List
 
 import pandas as pd
 import requests
 
 from api.http_async import fetch_many_sync
-from caching.ttl_cache import ttl_cache
+from caching.ttl_cache import TTLCache, ttl_cache
 from config.config_manager import _load_dotenv
+from utils.rate_limiter import FALLBACK_MAX_WAIT, acquire as rate_limit
 
 # API key is now read strictly from the environment
 _load_dotenv()
@@ -16,8 +18,18 @@ FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
 def _missing_key() -> bool:
     return not FINNHUB_API_KEY or "your_real_api_key_here" in FINNHUB_API_KEY
 
+
+class _RateLimited(Exception):
+    """No Finnhub token within ``FALLBACK_MAX_WAIT``; raised so it is not cached."""
+
+
+def _take_token() -> None:
+    if not rate_limit("finnhub", timeout=FALLBACK_MAX_WAIT):
+        raise _RateLimited()
+
+
 @ttl_cache(600)
-def fetch_finnhub_historical_data(ticker: str) -> pd.DataFrame:
+def _historical_data(ticker: str) -> pd.DataFrame:
     if _missing_key():
         print("[Finnhub ERROR] API key missing")
         return None
@@ -25,6 +37,7 @@ def fetch_finnhub_historical_data(ticker: str) -> pd.DataFrame:
     start = end - 60 * 60 * 24 * 180  # 6 mois
     url = f"https://finnhub.io/api/v1/stock/candle?symbol={ticker}&resolution=D&from={start}&to={end}&token={FINNHUB_API_KEY}"
 
+    _take_token()
     try:
         response = requests.get(url)
         response.raise_for_status()
@@ -49,7 +62,7 @@ def fetch_finnhub_historical_data(ticker: str) -> pd.DataFrame:
 
 
 @ttl_cache(600)
-def fetch_finnhub_intraday_data(ticker: str) -> pd.DataFrame:
+def _intraday_data(ticker: str) -> pd.DataFrame:
     if _missing_key():
         print("[Finnhub ERROR] API key missing")
         return None
@@ -57,6 +70,7 @@ def fetch_finnhub_intraday_data(ticker: str) -> pd.DataFrame:
     start = end - 60 * 60 * 6  # 6 heures
     url = f"https://finnhub.io/api/v1/stock/candle?symbol={ticker}&resolution=5&from={start}&to={end}&token={FINNHUB_API_KEY}"
 
+    _take_token()
     try:
         response = requests.get(url)
         response.raise_for_status()
@@ -80,16 +94,67 @@ def fetch_finnhub_intraday_data(ticker: str) -> pd.DataFrame:
         return None
 
 
-@ttl_cache(30)
-def fetch_quotes_batch(tickers: List[str]) -> List[Any]:
-    """Fetch quote data concurrently for multiple ``tickers``."""
+def fetch_finnhub_historical_data(ticker: str) -> pd.DataFrame:
+    try:
+        return _historical_data(ticker)
+    except _RateLimited:
+        print(f"[Finnhub] rate limit reached, {ticker} skipped")
+        return None
+
+
+def fetch_finnhub_intraday_data(ticker: str) -> pd.DataFrame:
+    try:
+        return _intraday_data(ticker)
+    except _RateLimited:
+        print(f"[Finnhub] rate limit reached, {ticker} skipped")
+        return None
+
+
+QUOTE_TTL = 30
+# Quotes are cached per symbol so adding one ticker to a universe only
+# fetches that ticker instead of re-downloading the whole list.
+_quote_cache = TTLCache(QUOTE_TTL, maxsize=10_000)
+# Fields of a Finnhub /quote answer, always present in fetch_quotes_batch()
+QUOTE_FIELDS = ("c", "d", "dp", "h", "l", "o", "pc", "t")
+
+
+def fetch_quotes_batch(tickers: List[str]) -> Dict[str, List[Any]]:
+    """Return quotes for ``tickers`` as columns ready for ``pd.DataFrame``.
+
+    Fresh quotes come from the per-symbol cache; only missing or stale
+    symbols are fetched, in one concurrent sweep.  The result always has a
+    ``symbol`` column in input order plus every :data:`QUOTE_FIELDS` column
+    (and any extra field returned), with ``NaN`` where a quote could not be
+    retrieved.  Without an API key the columns are empty.
+    """
+    symbols = [t.upper() for t in tickers]
     if _missing_key():
-        return []
-    urls = [
-        f"https://finnhub.io/api/v1/quote?symbol={t}&token={FINNHUB_API_KEY}"
-        for t in tickers
-    ]
-    # ``fetch_many_sync`` manages its own event loop, making it safe to call
-    # from synchronous contexts (e.g. Streamlit threads) without triggering the
-    # "no current event loop" RuntimeError.
-    return fetch_many_sync(urls)
+        return {"symbol": [], **{field: [] for field in QUOTE_FIELDS}}
+    quotes: Dict[str, Any] = {}
+    missing = []
+    for sym in dict.fromkeys(symbols):
+        quote = _quote_cache.get(sym)
+        if quote is None:
+            missing.append(sym)
+        else:
+            quotes[sym] = quote
+    if missing:
+        urls = [
+            f"https://finnhub.io/api/v1/quote?symbol={t}&token={FINNHUB_API_KEY}"
+            for t in missing
+        ]
+        # ``fetch_many_sync`` runs on the shared HTTP loop thread, making it safe
+        # to call from synchronous contexts (e.g. Streamlit threads) while reusing
+        # the warm connections of previous sweeps.
+        for sym, res in zip(missing, fetch_many_sync(urls, rate_limit="finnhub")):
+            if isinstance(res, dict):
+                _quote_cache.set(sym, res)
+                quotes[sym] = res
+
+    fields: Dict[str, None] = dict.fromkeys(QUOTE_FIELDS)
+    for quote in quotes.values():
+        fields.update(dict.fromkeys(quote))
+    columns: Dict[str, List[Any]] = {"symbol": symbols}
+    for field in fields:
+        columns[field] = [quotes.get(sym, {}).get(field, math.nan) for sym in symbols]
+    return columns
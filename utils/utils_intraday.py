@@ -2,14 +2,15 @@ import os
 import pandas as pd
 import requests
 import time
-import random
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
 import asyncio
+import functools
 import inspect
-from utils.async_utils import async_to_thread
+from concurrent.futures import ThreadPoolExecutor
+from utils.rate_limiter import FALLBACK_MAX_WAIT, acquire as rate_limit
 from config.config_manager import _load_dotenv, config_manager
 try:
     from .utils_finnhub import fetch_finnhub_intraday_data
@@ -36,12 +37,25 @@ if not intraday_logger.handlers:
     fh.setFormatter(formatter)
     intraday_logger.addHandler(fh)
 
+# Blocking provider calls run here rather than in the loop's default
+# executor: ``asyncio.run`` joins the default executor on exit, which would
+# make sync callers wait for the hedged requests that lost the race.
+_EXECUTOR = ThreadPoolExecutor(max_workers=12, thread_name_prefix="intraday")
+
+
+async def _run_blocking(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(func, *args))
+
 
 def fetch_from_yfinance(ticker: str) -> Optional[pd.DataFrame]:
     start = time.time()
     intraday_logger.info("Fetching %s from yfinance", ticker)
     try:
         import yfinance as yf
+        if not rate_limit("yahoo", timeout=FALLBACK_MAX_WAIT):
+            intraday_logger.warning("%s → yahoo rate limit reached, skipping", ticker)
+            return None
         df = yf.download(ticker, period="1d", interval="1m", progress=False)
         if df.empty:
             intraday_logger.warning("%s → empty DataFrame from yfinance", ticker)
@@ -71,7 +85,7 @@ def fetch_from_yfinance(ticker: str) -> Optional[pd.DataFrame]:
         return None
 
 async def fetch_from_yfinance_async(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_yfinance, ticker)
+    return await _run_blocking(fetch_from_yfinance, ticker)
 
 
 def fetch_from_finnhub(ticker: str) -> Optional[pd.DataFrame]:
@@ -93,7 +107,7 @@ def fetch_from_finnhub(ticker: str) -> Optional[pd.DataFrame]:
         return None
 
 async def fetch_from_finnhub_async(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_finnhub, ticker)
+    return await _run_blocking(fetch_from_finnhub, ticker)
 
 
 def fetch_from_alphavantage(ticker: str) -> Optional[pd.DataFrame]:
@@ -103,6 +117,9 @@ def fetch_from_alphavantage(ticker: str) -> Optional[pd.DataFrame]:
         url = (
             f"https://www.alphavantage.co/query?function=TIME_SERIES_INTRADAY&symbol={ticker}&interval=1min&apikey={ALPHA_VANTAGE_API_KEY}&outputsize=compact"
         )
+        if not rate_limit("alphavantage", timeout=FALLBACK_MAX_WAIT):
+            intraday_logger.warning("%s → alphavantage rate limit reached, skipping", ticker)
+            return None
         res = requests.get(url).json()
         data = res.get("Time Series (1min)", {})
         if not data:
@@ -134,7 +151,7 @@ def fetch_from_alphavantage(ticker: str) -> Optional[pd.DataFrame]:
         return None
 
 async def fetch_from_alphavantage_async(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_alphavantage, ticker)
+    return await _run_blocking(fetch_from_alphavantage, ticker)
 
 
 def fetch_from_fmp(ticker: str) -> Optional[pd.DataFrame]:
@@ -142,6 +159,9 @@ def fetch_from_fmp(ticker: str) -> Optional[pd.DataFrame]:
     intraday_logger.info("Fetching %s from fmp", ticker)
     try:
         url = f"https://financialmodelingprep.com/api/v3/historical-chart/1min/{ticker}?apikey={FMP_API_KEY}"
+        if not rate_limit("fmp", timeout=FALLBACK_MAX_WAIT):
+            intraday_logger.warning("%s → fmp rate limit reached, skipping", ticker)
+            return None
         res = requests.get(url).json()
         if not isinstance(res, list):
             intraday_logger.warning("%s → empty data from fmp", ticker)
@@ -161,7 +181,7 @@ def fetch_from_fmp(ticker: str) -> Optional[pd.DataFrame]:
         return None
 
 async def fetch_from_fmp_async(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_fmp, ticker)
+    return await _run_blocking(fetch_from_fmp, ticker)
 
 
 def fetch_from_polygon(ticker: str) -> Optional[pd.DataFrame]:
@@ -173,6 +193,9 @@ def fetch_from_polygon(ticker: str) -> Optional[pd.DataFrame]:
         url = (
             f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start}/{today}?adjusted=true&sort=asc&limit=5000&apiKey={POLYGON_API_KEY}"
         )
+        if not rate_limit("polygon", timeout=FALLBACK_MAX_WAIT):
+            intraday_logger.warning("%s → polygon rate limit reached, skipping", ticker)
+            return None
         res = requests.get(url).json()
         results = res.get("results", [])
         if not results:
@@ -193,7 +216,7 @@ def fetch_from_polygon(ticker: str) -> Optional[pd.DataFrame]:
         return None
 
 async def fetch_from_polygon_async(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_polygon, ticker)
+    return await _run_blocking(fetch_from_polygon, ticker)
 
 
 def fetch_from_twelvedata(
@@ -220,6 +243,9 @@ def fetch_from_twelvedata(
             params["end_date"] = datetime.utcfromtimestamp(to).strftime(
                 "%Y-%m-%d %H:%M:%S"
             )
+        if not rate_limit("twelvedata", timeout=FALLBACK_MAX_WAIT):
+            intraday_logger.warning("%s → twelvedata rate limit reached, skipping", ticker)
+            return None
         res = requests.get("https://api.twelvedata.com/time_series", params=params)
         data = res.json().get("values")
         if not data:
@@ -249,7 +275,7 @@ def fetch_from_twelvedata(
 async def fetch_from_twelvedata_async(
     ticker: str, _from: Optional[int] = None, to: Optional[int] = None
 ) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_twelvedata, ticker, _from, to)
+    return await _run_blocking(fetch_from_twelvedata, ticker, _from, to)
 
 
 API_KEYS = {
@@ -260,6 +286,15 @@ API_KEYS = {
     fetch_from_twelvedata: TWELVEDATA_API_KEY,
 }
 
+# Same keys by provider name, for the async sources (keyless providers absent)
+PROVIDER_KEYS = {
+    "Finnhub": FINNHUB_API_KEY,
+    "Alpha Vantage": ALPHA_VANTAGE_API_KEY,
+    "FMP": FMP_API_KEY,
+    "Polygon": POLYGON_API_KEY,
+    "Twelve Data": TWELVEDATA_API_KEY,
+}
+
 
 def get_candle_data(
     ticker: str, _from: Optional[int] = None, to: Optional[int] = None
@@ -306,35 +341,156 @@ ASYNC_SOURCES = [
 ]
 
 
-def fetch_intraday_data(ticker: str) -> Optional[pd.DataFrame]:
+# Delay before the next provider is started while the current ones are still
+# pending.  ``0`` races every provider at once and spends every quota; the
+# default hedges the primary and only calls a backup when it is slow.
+HEDGE_DELAY = float(os.getenv("INTRADAY_HEDGE_DELAY", "1.5"))
+# Samples a provider needs before its statistics may reorder the sources.
+STATS_MIN_SAMPLES = 3
+# Seconds of latency a failed request is considered to cost when ranking.
+ERROR_PENALTY = 2.0
+# Measured providers failing more often than this rank after untried ones.
+UNHEALTHY_ERROR_RATE = 0.5
+
+
+class ProviderStats:
+    """Rolling latency and error statistics for one intraday provider."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        if self.latency is None:
+            self.latency = latency
+            self.error_rate = 0.0 if ok else 1.0
+        else:
+            self.latency += self.alpha * (latency - self.latency)
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        self.samples += 1
+
+    @property
+    def measured(self) -> bool:
+        return self.samples >= STATS_MIN_SAMPLES and self.latency is not None
+
+    def score(self) -> float:
+        """Expected cost of asking this provider; lower is better."""
+        if not self.measured:
+            return 0.0
+        return self.latency + ERROR_PENALTY * self.error_rate
+
+    def rank(self) -> tuple:
+        """Sort key: healthy measured providers, then untried, then failing ones.
+
+        Hedge losers are cancelled without a sample, so untried providers
+        (often quota-limited backups) must not jump ahead of a healthy primary.
+        """
+        if not self.measured:
+            return (1, 0.0)
+        if self.error_rate > UNHEALTHY_ERROR_RATE:
+            return (2, self.score())
+        return (0, self.score())
+
+
+_provider_stats: dict = {}
+
+
+def provider_stats() -> dict:
+    """Return a snapshot of the per-provider latency/error statistics."""
+    return {
+        name: {"latency": st.latency, "error_rate": st.error_rate, "samples": st.samples}
+        for name, st in _provider_stats.items()
+    }
+
+
+def _ordered_sources() -> list:
+    """``ASYNC_SOURCES`` with an API key, ordered by :meth:`ProviderStats.rank`.
+
+    Untried providers keep their configured order after the healthy measured
+    ones.
+    """
+    sources = []
+    for name, func in ASYNC_SOURCES:
+        if name in PROVIDER_KEYS and not PROVIDER_KEYS[name]:
+            intraday_logger.info("Skipping %s - missing API key", name)
+            continue
+        sources.append((name, func))
+    return sorted(
+        sources,
+        key=lambda src: _provider_stats.get(src[0], ProviderStats()).rank(),
+    )
+
+
+def _start_source(func, ticker: str):
+    try:
+        params = inspect.signature(func).parameters
+        if len(params) > 1:
+            return func(ticker, None)
+    except (TypeError, ValueError):
+        pass
+    return func(ticker)
+
+
+def fetch_intraday_data(
+    ticker: str, hedge_delay: Optional[float] = None
+) -> Optional[pd.DataFrame]:
     """Try multiple sources for intraday data using asyncio."""
-    return asyncio.run(fetch_intraday_data_async(ticker))
+    return asyncio.run(fetch_intraday_data_async(ticker, hedge_delay))
 
 
-async def fetch_intraday_data_async(ticker: str) -> Optional[pd.DataFrame]:
-    tasks = {}
-    for name, func in ASYNC_SOURCES:
-        try:
-            params = inspect.signature(func).parameters
-            if len(params) > 1:
-                task = asyncio.create_task(func(ticker, None))
-            else:
-                task = asyncio.create_task(func(ticker))
-            tasks[name] = task
-        except Exception:
-            tasks[name] = asyncio.create_task(func(ticker))
-    results = {}
-    for name, task in tasks.items():
-        try:
-            results[name] = await task
-        except Exception as e:  # pragma: no cover - best effort log only
-            print(f"[{name} async ERROR] {e}")
-            results[name] = None
-    for name, _ in ASYNC_SOURCES:
-        df = results.get(name)
-        if df is not None and not df.empty:
-            print(f"✅ Success with {name}, {len(df)} records for {ticker}")
-            return df
+async def fetch_intraday_data_async(
+    ticker: str, hedge_delay: Optional[float] = None
+) -> Optional[pd.DataFrame]:
+    """Race the intraday providers and return the first valid frame.
+
+    Providers are started in the order given by :func:`_ordered_sources`.  The
+    next one is launched when the running ones fail or after ``hedge_delay``
+    seconds without an answer (defaults to :data:`HEDGE_DELAY`).  Remaining
+    requests are cancelled as soon as one provider returns data.
+    """
+    delay = HEDGE_DELAY if hedge_delay is None else hedge_delay
+    pending_sources = list(_ordered_sources())
+    running = {}
+    loop = asyncio.get_running_loop()
+
+    def launch() -> None:
+        name, func = pending_sources.pop(0)
+        task = asyncio.ensure_future(_start_source(func, ticker))
+        running[task] = (name, loop.time())
+
+    try:
+        while pending_sources or running:
+            if pending_sources and (not running or delay <= 0):
+                launch()
+                if pending_sources and delay <= 0:
+                    continue
+            done, _ = await asyncio.wait(
+                running,
+                timeout=delay if pending_sources else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                launch()
+                continue
+            for task in done:
+                name, started = running.pop(task)
+                try:
+                    df = task.result()
+                except Exception as e:  # pragma: no cover - best effort log only
+                    print(f"[{name} async ERROR] {e}")
+                    df = None
+                ok = df is not None and not df.empty
+                _provider_stats.setdefault(name, ProviderStats()).record(
+                    loop.time() - started, ok
+                )
+                if ok:
+                    print(f"✅ Success with {name}, {len(df)} records for {ticker}")
+                    return df
+    finally:
+        for task in running:
+            task.cancel()
     print(f"❌ All intraday sources failed for {ticker}")
     return None
 
@@ -349,23 +505,23 @@ def fetch_intraday_with_fallback(ticker: str) -> Optional[pd.DataFrame]:
 # ---------------------------------------------------------------------------
 
 async def async_fetch_from_yfinance(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_yfinance, ticker)
+    return await _run_blocking(fetch_from_yfinance, ticker)
 
 
 async def async_fetch_from_finnhub(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_finnhub, ticker)
+    return await _run_blocking(fetch_from_finnhub, ticker)
 
 
 async def async_fetch_from_alphavantage(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_alphavantage, ticker)
+    return await _run_blocking(fetch_from_alphavantage, ticker)
 
 
 async def async_fetch_from_fmp(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_fmp, ticker)
+    return await _run_blocking(fetch_from_fmp, ticker)
 
 
 async def async_fetch_from_polygon(ticker: str) -> Optional[pd.DataFrame]:
-    return await async_to_thread(fetch_from_polygon, ticker)
+    return await _run_blocking(fetch_from_polygon, ticker)
 
 
 ASYNC_SOURCES = [
@@ -386,7 +542,6 @@ async def async_fetch_intraday_data(ticker: str) -> Optional[pd.DataFrame]:
         if df is not None and not df.empty:
             print(f"✅ Success with {name}, {len(df)} records for {ticker}")
             return df
-        await asyncio.sleep(1.5 + random.uniform(0, 1.5))
     print(f"❌ All intraday sources failed for {ticker}")
     return None
 
@@ -1,12 +1,11 @@
 import pandas as pd
 import requests
-import time
-import random
 from datetime import datetime
 from typing import Optional
 import os
 import asyncio
 from utils.async_utils import async_to_thread
+from utils.rate_limiter import FALLBACK_MAX_WAIT, acquire as rate_limit
 from config.config_manager import _load_dotenv, config_manager
 
 try:
@@ -25,6 +24,9 @@ def fetch_from_yfinance(ticker: str) -> Optional[pd.DataFrame]:
     """Retrieve daily prices via Yahoo Finance."""
     try:
         import yfinance as yf
+        if not rate_limit("yahoo", timeout=FALLBACK_MAX_WAIT):
+            print(f"[yahoo RATE LIMIT] {ticker} skipped")
+            return None
         df = yf.download(ticker, period="6mo", interval="1d", progress=False)
         if df.empty:
             return None
@@ -65,6 +67,9 @@ def fetch_from_alphavantage(ticker: str) -> Optional[pd.DataFrame]:
         url = (
             f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={ticker}&apikey={ALPHA_VANTAGE_API_KEY}&outputsize=compact"
         )
+        if not rate_limit("alphavantage", timeout=FALLBACK_MAX_WAIT):
+            print(f"[alphavantage RATE LIMIT] {ticker} skipped")
+            return None
         res = requests.get(url).json()
         data = res.get("Time Series (Daily)", {})
         if not data:
@@ -93,6 +98,9 @@ def fetch_from_fmp(ticker: str) -> Optional[pd.DataFrame]:
     """Retrieve daily close prices via Financial Modeling Prep."""
     try:
         url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{ticker}?apikey={FMP_API_KEY}&serietype=line"
+        if not rate_limit("fmp", timeout=FALLBACK_MAX_WAIT):
+            print(f"[fmp RATE LIMIT] {ticker} skipped")
+            return None
         res = requests.get(url).json()
         historical = res.get("historical", [])
         if not historical:
@@ -114,6 +122,9 @@ def fetch_from_polygon(ticker: str) -> Optional[pd.DataFrame]:
         url = (
             f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/2024-12-01/{today}?adjusted=true&sort=asc&limit=120&apiKey={POLYGON_API_KEY}"
         )
+        if not rate_limit("polygon", timeout=FALLBACK_MAX_WAIT):
+            print(f"[polygon RATE LIMIT] {ticker} skipped")
+            return None
         res = requests.get(url).json()
         results = res.get("results", [])
         if not results:
@@ -148,7 +159,6 @@ def fetch_historical_data(ticker: str) -> Optional[pd.DataFrame]:
         if df is not None and not df.empty:
             print(f"✅ Success with {name}, {len(df)} records for {ticker}")
             return df
-        time.sleep(1.5 + random.uniform(0, 1.5))
     print(f"❌ All sources failed for {ticker}")
     return None
 
@@ -214,7 +224,6 @@ async def async_fetch_historical_data(ticker: str) -> Optional[pd.DataFrame]:
         if df is not None and not df.empty:
             print(f"✅ Success with {name}, {len(df)} records for {ticker}")
             return df
-        await asyncio.sleep(1.5 + random.uniform(0, 1.5))
     print(f"❌ All sources failed for {ticker}")
     return None
 
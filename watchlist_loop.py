@@ -10,19 +10,21 @@ import pandas as pd
 from db.bulk_upsert import bulk_upsert_scores
 from intelligence.ai_scorer import score_batch
 from observability.perf import step
-from prescreen import screen_ticker, prefilter_quotes
+from prescreen import screen_tickers, prefilter_quotes
 from utils.utils_finnhub import fetch_quotes_batch
 
 
 def run_scan(universe: str, limit: int = 500) -> None:
     tickers = json.loads(Path(universe).read_text())[:limit]
-    tickers = [t for t in tickers if screen_ticker(t)]
+    with step("prescreen"):
+        mask = screen_tickers(tickers)
+    tickers = [t for t in tickers if mask.get(t.upper(), False)]
 
     with step("fetch_batch"):
         quotes = fetch_quotes_batch(tickers)
 
     df = pd.DataFrame(quotes)
-    df["symbol"] = pd.Series(tickers, dtype="category")
+    df["symbol"] = df["symbol"].astype("category")
     df = prefilter_quotes(df)
 
     with step("score"):